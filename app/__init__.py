@@ -6,21 +6,29 @@ Nesse modulo inicial é onde é criado o app FastAPI,
 - Para acessar as informações de configuração,
 basta importar o módulo `config` e acessar o atributo `settings`.
 - As rotas estão disponiveis no módulo `routes`.
+- As métricas (`/metrics`) estão disponiveis no módulo `metrics`.
+- Os tempos de cada requisição (cabeçalho `Server-Timing`) estão no módulo `timing`.
+- O log (fila, formato JSON e id da requisição) é configurado pelo módulo `log`.
 """
 
 
 import logging
-import logging.config
 
 from fastapi import FastAPI
-from sqlmodel import SQLModel
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.cors import CORSMiddleware
 
+from app.auth import token_cache
 from app.config import settings
-from app.db.model import engine
+from app.db.model import async_engine, engine, init_db
+from app.db.repository import get_count_cache, get_record_cache
+from app.log import RequestIdMiddleware, configure_logging
+from app.metrics import MetricsMiddleware, get_metrics, mark_process_dead
 from app.routes import api_router_v1
+from app.timing import RequestTimingMiddleware
+from app.views import router_metrics
 
-logging.config.fileConfig("logging.conf", disable_existing_loggers=False)
+configure_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +37,20 @@ def create_app() -> FastAPI:
     """
     Cria o app FastAPI e adiciona os middlewares e rotas.
 
+    As respostas JSON usam `ORJSONResponse` por padrão, mais rápida que a `JSONResponse`.
+
+    As tabelas são criadas apenas se `settings.db_create_all` estiver habilitado; o launcher
+    `app.server` já as cria antes de iniciar os workers.
     """
     app = FastAPI(
-        title=settings.service_name, docs_url="/api/docs", redoc_url="/api/redoc"
+        title=settings.service_name,
+        docs_url="/api/docs",
+        redoc_url="/api/redoc",
+        default_response_class=ORJSONResponse,
     )
 
-    SQLModel.metadata.create_all(engine)
+    if settings.db_create_all:
+        init_db()
 
     app.add_middleware(
         CORSMiddleware,
@@ -42,10 +58,50 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[
+            "X-Total-Count",
+            "X-Total-Pages",
+            "X-Page",
+            "Server-Timing",
+            "X-Request-ID",
+            "ETag",
+            "X-Search-Truncated",
+        ],
     )
 
+    if settings.request_timing_enabled:
+        app.add_middleware(RequestTimingMiddleware)
+
     app.include_router(api_router_v1, prefix="/api")
+    setup_metrics(app)
+    app.add_middleware(RequestIdMiddleware)
 
-    logger.info(f"starting app {settings.service_name}")
+    logger.info("starting app %s", settings.service_name)
 
     return app
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """
+    Adiciona o middleware de métricas e a rota `/metrics`, se as métricas estiverem disponíveis.
+
+    Os caches e os pools dos engines são registrados como fontes das métricas de uso.
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        return
+
+    metrics.caches.update(
+        token=lambda: token_cache,
+        record=get_record_cache,
+        count=get_count_cache,
+    )
+    metrics.pools.update(
+        {
+            "sync": lambda: engine.pool,
+            "async": lambda: async_engine.sync_engine.pool if async_engine else None,
+        }
+    )
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    app.include_router(router_metrics)
+    app.add_event_handler("shutdown", mark_process_dead)
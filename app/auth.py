@@ -4,6 +4,9 @@ Nesse Módulo é onde é definido as funções de autenticação e autorização
 Esse modulo foi construido em separa, para facilitar a reutilização
  em outras partes do projetos,
 alem de ficar mais organizado e visivel, facilitando a manutenção.
+
+Tokens já verificados ficam em um cache LRU (`token_cache`) até o seu `exp`, evitando
+repetir a verificação HMAC e o parse do JSON a cada requisição com o mesmo token.
 """
 import logging
 from datetime import datetime, timedelta
@@ -12,10 +15,14 @@ from fastapi import Header, HTTPException, status
 from jose import ExpiredSignatureError, JWTError, jwt
 from pydantic import BaseModel
 
+from app.cache import LRUCache
 from app.config import settings
+from app.timing import timed
 
 logger = logging.getLogger(__name__)
 
+token_cache = LRUCache(maxsize=settings.token_cache_size, ttl=settings.token_cache_ttl)
+
 
 class Token(BaseModel):
     access_token: str
@@ -74,6 +81,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     return encoded_jwt
 
 
+@timed("auth")
 def check_token(token: str = Header()):
     """
     Verifica a validade de um token de acesso.
@@ -97,6 +105,10 @@ def check_token(token: str = Header()):
         except TokenInvalido:
             print("Token inválido ou ausente")
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     payload: dict = {}
     try:
         payload = jwt.decode(
@@ -111,4 +123,24 @@ def check_token(token: str = Header()):
     if username is None or {}:
         raise_exception()
 
+    token_cache.set(token, username, expires_at=token_expires_at(payload))
     return username
+
+
+def token_expires_at(payload: dict) -> float | None:
+    """
+    Calcula até quando um token verificado pode ser servido pelo cache.
+
+    O `jose` rejeita o token quando `exp` é menor que o segundo atual, então ele continua
+    válido durante todo o segundo `exp`; o item do cache expira no início do segundo seguinte.
+
+    Args:
+        payload (dict): O payload decodificado do token.
+
+    Returns:
+        value (float | None): O instante (timestamp) de expiração, ou None se o token não tiver `exp`.
+    """
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        return int(exp) + 1
+    return None
@@ -0,0 +1,198 @@
+"""
+## Módulo de Classificação de Bandeiras.
+Identifica a bandeira de um cartão a partir do seu BIN/IIN (os primeiros dígitos do número).
+
+As faixas de BIN ficam em um arquivo JSON (`settings.brand_table_path`, por padrão
+`app/data/brands.json`) e são carregadas em uma árvore de prefixos (trie): a consulta percorre
+no máximo um nó por dígito e retorna a bandeira do prefixo mais longo encontrado, então faixas
+mais específicas (por exemplo Elo `401178`) têm prioridade sobre as gerais (Visa `4`).
+
+O arquivo é relido automaticamente quando modificado (verificado a cada
+`settings.brand_table_reload_interval` segundos), permitindo atualizar as faixas sem novo deploy.
+
+Formato do arquivo:
+
+    {"brands": [{"brand": "visa", "prefixes": ["4"]}, {"brand": "master", "prefixes": ["51-55"]}]}
+
+Cada prefixo é um número (`"4011"`) ou uma faixa inclusiva com o mesmo número de dígitos (`"51-55"`).
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BRAND_TABLE = os.path.join(os.path.dirname(__file__), "data", "brands.json")
+
+_NON_DIGITS = re.compile(r"\D")
+
+
+class _Node:
+    """Nó da árvore de prefixos: os filhos por dígito e a bandeira do prefixo, se houver."""
+
+    __slots__ = ("children", "brand")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.brand: Optional[str] = None
+
+
+def expand_prefix(prefix: str) -> List[str]:
+    """
+    Expande um prefixo ou uma faixa de prefixos nos prefixos que a compõem.
+
+    Args:
+        prefix (str): Um prefixo (`"4011"`) ou uma faixa inclusiva (`"51-55"`).
+
+    Returns:
+        value (List[str]): Os prefixos, por exemplo `["51", "52", "53", "54", "55"]`.
+
+    Raises:
+        ValueError: Se o prefixo não for numérico ou se a faixa for inválida.
+    """
+    start, sep, end = prefix.partition("-")
+    if not sep:
+        end = start
+    if not (start.isdigit() and end.isdigit()) or len(start) != len(end) or start > end:
+        raise ValueError(f"Invalid BIN prefix: {prefix}")
+    return [str(value).zfill(len(start)) for value in range(int(start), int(end) + 1)]
+
+
+def build_trie(table: Dict[str, Any]) -> _Node:
+    """
+    Monta a árvore de prefixos a partir do conteúdo do arquivo de faixas.
+
+    Args:
+        table (Dict[str, Any]): O conteúdo do arquivo, no formato `{"brands": [...]}`.
+
+    Returns:
+        value (_Node): A raiz da árvore.
+
+    Raises:
+        ValueError: Se alguma entrada for inválida.
+    """
+    root = _Node()
+    for entry in table["brands"]:
+        brand = entry["brand"]
+        for prefix in entry["prefixes"]:
+            for digits in expand_prefix(prefix):
+                node = root
+                for digit in digits:
+                    node = node.children.setdefault(digit, _Node())
+                node.brand = brand
+    return root
+
+
+class BrandClassifier:
+    """
+    Classificador de bandeiras por prefixo mais longo, recarregado quando o arquivo muda.
+
+    **Atributos**
+
+    * `path` (str): O caminho do arquivo JSON com as faixas de BIN.
+    * `reload_interval` (float): Intervalo mínimo, em segundos, entre verificações do arquivo.
+
+    **Métodos**
+
+    * `classify(number: str) -> Optional[str]`: Retorna a bandeira do número ou BIN, ou None.
+    * `reload(force: bool = False) -> bool`: Relê o arquivo se ele tiver sido modificado.
+
+    Example:
+        classifier = BrandClassifier(DEFAULT_BRAND_TABLE)
+        classifier.classify("401178")  # "elo"
+        classifier.classify("4539578763621486")  # "visa"
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reload_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self._root = _Node()
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.reload(force=True)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Relê o arquivo de faixas se ele tiver sido modificado desde a última carga.
+
+        Se o arquivo novo for inválido, as faixas atuais são mantidas e o erro é registrado.
+
+        Args:
+            force (bool, optional): Relê o arquivo mesmo sem modificação.
+
+        Returns:
+            value (bool): True se as faixas foram recarregadas.
+        """
+        with self._lock:
+            self._checked_at = self.clock()
+            mtime = os.stat(self.path).st_mtime
+            if not force and mtime == self._mtime:
+                return False
+            try:
+                with open(self.path, encoding="utf-8") as file:
+                    root = build_trie(json.load(file))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if force:
+                    raise
+                logger.error(
+                    "invalid brand table %s, keeping current: %s", self.path, e
+                )
+                return False
+            self._root = root
+            self._mtime = mtime
+            logger.info("brand table loaded from %s", self.path)
+            return True
+
+    def classify(self, number: str) -> Optional[str]:
+        """
+        Retorna a bandeira do número do cartão ou do BIN informado.
+
+        Caracteres que não são dígitos (espaços, hífens) são ignorados.
+
+        Args:
+            number (str): O número completo ou apenas os primeiros dígitos.
+
+        Returns:
+            value (Optional[str]): A bandeira do prefixo mais longo encontrado, ou None.
+        """
+        if self.clock() - self._checked_at >= self.reload_interval:
+            self._reload_quietly()
+
+        node = self._root
+        brand = None
+        for digit in _NON_DIGITS.sub("", number):
+            child = node.children.get(digit)
+            if child is None:
+                break
+            node = child
+            if node.brand is not None:
+                brand = node.brand
+        return brand
+
+    def _reload_quietly(self) -> None:
+        """Verifica o arquivo sem deixar um erro de leitura interromper a classificação."""
+        try:
+            self.reload()
+        except OSError as e:
+            logger.error(
+                "brand table %s not readable, keeping current: %s", self.path, e
+            )
+
+
+brand_classifier = BrandClassifier(
+    settings.brand_table_path or DEFAULT_BRAND_TABLE,
+    reload_interval=settings.brand_table_reload_interval,
+)
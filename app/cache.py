@@ -0,0 +1,301 @@
+"""
+## Módulo de Cache.
+Caches usados para evitar repetir trabalho caro no caminho das requisições,
+como a verificação de tokens JWT e a leitura de registros por ID.
+
+Classes:
+    LRUCache: Cache LRU em memória, thread-safe, com expiração por item e contadores de acerto/erro.
+    Cada processo (worker) tem o seu, então não deve guardar dados alterados por outros workers.
+    RedisCache: Cache compartilhado entre processos, com a mesma interface, usando um servidor Redis.
+
+Functions:
+    build_cache: Cria o backend de cache configurado (`memory`, `redis` ou `none`).
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Cache LRU limitado, com expiração por item e contadores de acerto/erro.
+
+    Quando o cache atinge `maxsize`, o item usado há mais tempo é descartado. Cada item pode
+    ter um instante absoluto de expiração (`expires_at`, no relógio `clock`); um item expirado
+    nunca é retornado e é removido na primeira leitura.
+
+    **Atributos**
+
+    * `maxsize` (int): Quantidade máxima de itens; 0 desabilita o cache.
+    * `ttl` (Optional[float]): Tempo de vida máximo, em segundos, aplicado a todos os itens.
+    * `hits` (int): Quantidade de leituras encontradas no cache.
+    * `misses` (int): Quantidade de leituras não encontradas (ou expiradas).
+
+    Example:
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.get("a")  # 1
+        cache.stats()  # {"size": 1, "maxsize": 2, "hits": 1, "misses": 0, "hit_ratio": 1.0}
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor associado à chave, ou `default` se ausente ou expirado."""
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and self.clock() >= expires_at:
+                del self._data[key]
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """
+        Armazena um valor, descartando o item menos usado se o cache estiver cheio.
+
+        Args:
+            key (Hashable): A chave do item.
+            value (Any): O valor do item.
+            expires_at (Optional[float], optional): Instante absoluto de expiração. O menor entre
+            ele e `ttl` é usado.
+        """
+        if self.maxsize <= 0:
+            return
+
+        if self.ttl is not None:
+            ttl_expires_at = self.clock() + self.ttl
+            if expires_at is None or ttl_expires_at < expires_at:
+                expires_at = ttl_expires_at
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def set_if(
+        self, key: Hashable, value: Any, condition: Callable[[Any], bool]
+    ) -> bool:
+        """
+        Armazena um valor apenas se `condition(atual)` for verdadeira, de forma atômica.
+
+        Args:
+            key (Hashable): A chave do item.
+            value (Any): O valor do item.
+            condition (Callable[[Any], bool]): Recebe o valor atual (None se ausente ou
+            expirado) e indica se ele pode ser substituído.
+
+        Returns:
+            value (bool): True se o valor foi armazenado.
+        """
+        if self.maxsize <= 0:
+            return False
+
+        expires_at = self.clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            entry = self._data.get(key)
+            current = None
+            if entry is not None and (entry[1] is None or self.clock() < entry[1]):
+                current = entry[0]
+            if not condition(current):
+                return False
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, *keys: Hashable) -> None:
+        """Remove os itens associados às chaves, se existirem."""
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove todos os itens e zera os contadores."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna o tamanho atual, o limite e os contadores de acerto/erro do cache."""
+        return _stats(len(self._data), self.maxsize, self.hits, self.misses)
+
+
+class RedisCache:
+    """
+    Cache compartilhado entre processos e nós, usando um servidor Redis.
+
+    Possui a mesma interface da `LRUCache`; os valores são serializados em JSON, então devem
+    ser tipos simples (dicionários, listas, strings, números e datas, que voltam como texto).
+    O pacote `redis` é uma dependência opcional, importada apenas quando este backend é usado.
+
+    **Atributos**
+
+    * `url` (str): A url do servidor Redis, por exemplo `redis://localhost:6379/0`.
+    * `ttl` (Optional[float]): Tempo de vida máximo, em segundos, aplicado a todos os itens.
+    * `prefix` (str): Prefixo aplicado às chaves, para isolar os itens deste serviço.
+    """
+
+    def __init__(
+        self, url: str, ttl: Optional[float] = None, prefix: str = "maistodos:"
+    ):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor associado à chave, ou `default` se ausente ou expirado."""
+        raw = self.client.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return json.loads(raw)
+
+    def _px(self, expires_at: Optional[float]) -> Optional[int]:
+        """Retorna a expiração em milissegundos, o menor entre `expires_at` e `ttl`."""
+        ttl = self.ttl
+        if expires_at is not None:
+            remaining = expires_at - time.time()
+            ttl = remaining if ttl is None else min(ttl, remaining)
+        if ttl is None:
+            return None
+        return max(int(ttl * 1000), 0)
+
+    def set(
+        self, key: Hashable, value: Any, expires_at: Optional[float] = None
+    ) -> None:
+        """Armazena um valor, expirando no menor entre `expires_at` e `ttl`."""
+        px = self._px(expires_at)
+        if px == 0:
+            return
+        self.client.set(self._key(key), json.dumps(value, default=str), px=px)
+
+    def set_if(
+        self, key: Hashable, value: Any, condition: Callable[[Any], bool]
+    ) -> bool:
+        """
+        Armazena um valor apenas se `condition(atual)` for verdadeira.
+
+        A leitura e a escrita são feitas em uma transação com `WATCH`; se outro processo
+        alterar a chave no meio, a transação é refeita com o novo valor atual.
+        """
+        name = self._key(key)
+        payload = json.dumps(value, default=str)
+        px = self._px(None)
+        if px == 0:
+            return False
+
+        def attempt(pipe: Any) -> bool:
+            raw = pipe.get(name)
+            if not condition(json.loads(raw) if raw is not None else None):
+                return False
+            pipe.multi()
+            pipe.set(name, payload, px=px)
+            return True
+
+        return self.client.transaction(attempt, name, value_from_callable=True)
+
+    def delete(self, *keys: Hashable) -> None:
+        """Remove os itens associados às chaves, se existirem."""
+        if keys:
+            self.client.delete(*(self._key(key) for key in keys))
+
+    def clear(self) -> None:
+        """Remove todos os itens com o prefixo deste cache e zera os contadores."""
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Retorna os contadores de acerto/erro deste processo."""
+        return _stats(None, None, self.hits, self.misses)
+
+
+CacheBackend = Union[LRUCache, RedisCache]
+
+
+def _stats(
+    size: Optional[int], maxsize: Optional[int], hits: int, misses: int
+) -> Dict[str, Any]:
+    """Monta o dicionário de estatísticas comum aos backends de cache."""
+    total = hits + misses
+    return {
+        "size": size,
+        "maxsize": maxsize,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
+
+
+def build_cache(
+    backend: str, *, maxsize: int, ttl: Optional[float], url: str = ""
+) -> Optional[CacheBackend]:
+    """
+    Cria o backend de cache configurado.
+
+    Args:
+        backend (str): `memory` (LRU em processo), `redis` (compartilhado) ou `none` (desabilitado).
+        maxsize (int): Quantidade máxima de itens do cache em memória.
+        ttl (Optional[float]): Tempo de vida máximo, em segundos, dos itens.
+        url (str, optional): A url do servidor Redis, usada apenas pelo backend `redis`.
+
+    Returns:
+        value (Optional[CacheBackend]): O cache, ou None se desabilitado.
+
+    Raises:
+        ValueError: Se o backend informado não existir.
+    """
+    backend = backend.lower()
+    if backend == "none" or (backend == "memory" and maxsize <= 0):
+        return None
+    if backend == "memory":
+        return LRUCache(maxsize=maxsize, ttl=ttl)
+    if backend == "redis":
+        return RedisCache(url, ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
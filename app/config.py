@@ -6,6 +6,10 @@ Attributes:
     environment: Ambiente de execução, podendo ser (dev, prod, test, hml).
     service_name: Define o nome do serviço, por padrão é @maistodos/api.
     log_level: Define o nível de log, por padrão é INFO.
+    log_format: Formato do log, podendo ser (text, json), por padrão é text.
+    log_queue: Define se os registros são escritos por uma thread a partir de uma fila (`app.log`),
+    sem bloquear o event loop, por padrão é True.
+    log_debug_sample_rate: Fração dos registros DEBUG mantida em cada ponto de chamada, por padrão é 1.
     is_sqlite: Define se o banco de dados é sqlite, por padrão é True.
 
     database_url: Define a url do banco de dados,
@@ -14,6 +18,65 @@ Attributes:
     secret_key: Define a chave secreta para geração do token, por padrão é secret.
     algorithm: Define o algoritmo de geração do token, por padrão é HS256.
     token_expire: Define o tempo de expiração do token, por padrão é 30 minutos.
+    token_cache_size: Quantidade de tokens verificados mantidos em cache (0 desabilita), por padrão é 10000.
+    token_cache_ttl: Tempo máximo, em segundos, de um token no cache, por padrão é 300.
+
+    record_cache_backend: Cache das leituras por ID, podendo ser (memory, redis, none), por padrão é memory.
+    Também define o cache de totais; o launcher `app.server` troca `memory` por `none` com mais de um worker.
+    record_cache_size: Quantidade de registros mantidos no cache em memória, por padrão é 10000.
+    record_cache_ttl: Tempo máximo, em segundos, de um registro no cache, por padrão é 60.
+    count_cache_size: Quantidade de totais (por combinação de filtros) mantidos no cache, por padrão é 1000.
+    count_cache_ttl: Tempo máximo, em segundos, de um total no cache, por padrão é 30.
+    redis_url: Define a url do Redis usado pelo backend `redis`, por padrão é redis://localhost:6379/0.
+
+    async_database: Define se as views usam o engine assíncrono, por padrão é False.
+    async_database_url: Define a url do banco de dados assíncrono,
+    por padrão é derivada de `database_url` (aiosqlite/asyncpg).
+
+    db_echo: Define se as instruções SQL são registradas no log, por padrão é False.
+    db_pool_size: Quantidade de conexões mantidas no pool, por padrão é 5.
+    db_max_overflow: Conexões extras permitidas além do pool, por padrão é 10.
+    db_pool_timeout: Segundos aguardando uma conexão livre no pool, por padrão é 30.
+    db_pool_recycle: Segundos até uma conexão ser reciclada (-1 desabilita), por padrão é 1800.
+    db_pool_pre_ping: Define se a conexão é testada antes do uso, por padrão é True.
+
+    sqlite_journal_mode: PRAGMA journal_mode aplicado ao conectar, por padrão é WAL.
+    sqlite_synchronous: PRAGMA synchronous aplicado ao conectar, por padrão é NORMAL.
+    sqlite_mmap_size: PRAGMA mmap_size em bytes, por padrão é 268435456 (256 MiB).
+    sqlite_cache_size: PRAGMA cache_size (negativo em KiB), por padrão é -64000 (~64 MiB).
+
+    export_chunk_size: Quantidade de registros lidos por vez na exportação, por padrão é 1000.
+    bulk_chunk_size: Quantidade de cartões inseridos por transação na carga em lote, por padrão é 500.
+    bulk_max_items: Quantidade máxima de cartões por requisição de carga em lote, por padrão é 10000.
+
+    fingerprint_algorithm: Algoritmo da impressão digital do número do cartão,
+    podendo ser (sha256, hmac-sha256, blake2b), por padrão é sha256.
+    fingerprint_keys: Chaves hexadecimais separadas por vírgula, a primeira é a atual
+    e as demais são aceitas nas consultas (rotação), por padrão é vazio.
+
+    brand_table_path: Arquivo JSON com as faixas de BIN por bandeira, por padrão é app/data/brands.json.
+    brand_table_reload_interval: Segundos entre verificações de alteração do arquivo de faixas, por padrão é 5.
+
+    db_create_all: Define se `create_app` cria as tabelas ao iniciar, por padrão é True.
+    O launcher `app.server` cria as tabelas uma única vez e desabilita essa opção nos workers.
+
+    server_backend: Gerenciador de processos do launcher, podendo ser (uvicorn, gunicorn), por padrão é uvicorn.
+    web_host: Endereço em que o servidor escuta, por padrão é 0.0.0.0.
+    web_port: Porta em que o servidor escuta, por padrão é 8001.
+    web_concurrency: Quantidade de workers (0 usa a quantidade de CPUs), por padrão é 0.
+    web_keepalive: Segundos mantendo conexões keep-alive ociosas, por padrão é 5.
+    web_timeout: Segundos sem resposta até o gunicorn reiniciar o worker, por padrão é 60.
+    web_graceful_timeout: Segundos para os workers concluírem as requisições ao reiniciar, por padrão é 30.
+    web_max_requests: Requisições até o gunicorn reciclar o worker (0 desabilita), por padrão é 0.
+    web_backlog: Tamanho da fila de conexões pendentes do socket, por padrão é 2048.
+
+    request_timing_enabled: Define se as respostas recebem o cabeçalho `Server-Timing` com os tempos
+    da requisição (`app.timing`), por padrão é True.
+    db_query_warning: Quantidade de instruções SQL por requisição acima da qual um aviso é registrado
+    (0 desabilita), por padrão é 20.
+
+    metrics_enabled: Define se `/metrics` e o middleware de métricas são habilitados (requer o extra
+    `metrics`), por padrão é True.
 
 """
 import logging
@@ -38,6 +101,9 @@ class APISettings(BaseSettings):
     environment: str = os.environ.get("ENVIRONMENT", "dev")
     service_name: str = "@maistodos/api"
     log_level: str = os.environ.get("LOG_LEVEL", "INFO")
+    log_format: str = os.environ.get("LOG_FORMAT", "text")
+    log_queue: bool = os.environ.get("LOG_QUEUE", "true").lower() == "true"
+    log_debug_sample_rate: float = float(os.environ.get("LOG_DEBUG_SAMPLE_RATE", 1))
     is_sqlite: bool = bool(os.environ.get("IS_SQLITE", True))
 
     database_url: str = (
@@ -46,6 +112,63 @@ class APISettings(BaseSettings):
     secret_key: str = os.environ.get("SECRET_KEY", "secret")
     algorithm: str = os.environ.get("ALGORITHM", "HS256")
     token_expire: int = int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+    token_cache_size: int = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+    token_cache_ttl: int = int(os.environ.get("TOKEN_CACHE_TTL", 300))
+
+    record_cache_backend: str = os.environ.get("RECORD_CACHE_BACKEND", "memory")
+    record_cache_size: int = int(os.environ.get("RECORD_CACHE_SIZE", 10000))
+    record_cache_ttl: int = int(os.environ.get("RECORD_CACHE_TTL", 60))
+    count_cache_size: int = int(os.environ.get("COUNT_CACHE_SIZE", 1000))
+    count_cache_ttl: int = int(os.environ.get("COUNT_CACHE_TTL", 30))
+    redis_url: str = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+
+    async_database: bool = os.environ.get("ASYNC_DATABASE", "false").lower() == "true"
+    async_database_url: str = os.environ.get("ASYNC_DATABASE_URL", "")
+
+    db_echo: bool = os.environ.get("DB_ECHO", "false").lower() == "true"
+    db_pool_size: int = int(os.environ.get("DB_POOL_SIZE", 5))
+    db_max_overflow: int = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    db_pool_timeout: float = float(os.environ.get("DB_POOL_TIMEOUT", 30))
+    db_pool_recycle: int = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    db_pool_pre_ping: bool = (
+        os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    )
+
+    sqlite_journal_mode: str = os.environ.get("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_mmap_size: int = int(os.environ.get("SQLITE_MMAP_SIZE", 268435456))
+    sqlite_cache_size: int = int(os.environ.get("SQLITE_CACHE_SIZE", -64000))
+
+    export_chunk_size: int = int(os.environ.get("EXPORT_CHUNK_SIZE", 1000))
+    bulk_chunk_size: int = int(os.environ.get("BULK_CHUNK_SIZE", 500))
+    bulk_max_items: int = int(os.environ.get("BULK_MAX_ITEMS", 10000))
+
+    fingerprint_algorithm: str = os.environ.get("FINGERPRINT_ALGORITHM", "sha256")
+    fingerprint_keys: str = os.environ.get("FINGERPRINT_KEYS", "")
+
+    brand_table_path: str = os.environ.get("BRAND_TABLE_PATH", "")
+    brand_table_reload_interval: float = float(
+        os.environ.get("BRAND_TABLE_RELOAD_INTERVAL", 5)
+    )
+
+    db_create_all: bool = os.environ.get("DB_CREATE_ALL", "true").lower() == "true"
+
+    server_backend: str = os.environ.get("SERVER_BACKEND", "uvicorn")
+    web_host: str = os.environ.get("WEB_HOST", "0.0.0.0")
+    web_port: int = int(os.environ.get("WEB_PORT", 8001))
+    web_concurrency: int = int(os.environ.get("WEB_CONCURRENCY", 0))
+    web_keepalive: int = int(os.environ.get("WEB_KEEPALIVE", 5))
+    web_timeout: int = int(os.environ.get("WEB_TIMEOUT", 60))
+    web_graceful_timeout: int = int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30))
+    web_max_requests: int = int(os.environ.get("WEB_MAX_REQUESTS", 0))
+    web_backlog: int = int(os.environ.get("WEB_BACKLOG", 2048))
+
+    request_timing_enabled: bool = (
+        os.environ.get("REQUEST_TIMING_ENABLED", "true").lower() == "true"
+    )
+    db_query_warning: int = int(os.environ.get("DB_QUERY_WARNING", 20))
+
+    metrics_enabled: bool = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
 
     class Config:
         validate_assignment = True
@@ -0,0 +1,126 @@
+"""
+## Módulo de Migração das Impressões Digitais dos Cartões.
+Converte a coluna `creditcard.number` de bancos criados antes do tipo `Fingerprint`
+(`app.db.model`), em que o número era gravado como texto, para a impressão digital binária
+de 32 bytes. Sem a migração, a leitura desses registros falha no `Fingerprint`.
+
+Cada valor de texto é tratado conforme o seu conteúdo:
+
+- 64 caracteres hexadecimais: o SHA-256 gravado pelo antigo `app.utils.hashable`, convertido
+para os 32 bytes equivalentes. Com um algoritmo com chave (`settings.fingerprint_algorithm`)
+não é possível recalcular a impressão digital sem o número, e esses registros continuam
+encontrados apenas com o algoritmo `sha256`; a quantidade é registrada no log.
+- Apenas dígitos: o número em texto puro, substituído por `card_fingerprint(number)`.
+- Valores já binários (32 bytes) não são alterados; outros valores são contados como inválidos.
+
+No PostgreSQL a coluna precisa ser convertida para `bytea` antes, mantendo o texto:
+`ALTER TABLE creditcard ALTER COLUMN number TYPE bytea USING convert_to(number, 'UTF8')`;
+o SQLite não exige a alteração. A migração pode ser executada novamente sem efeito nos registros
+já convertidos. Os registros são lidos e atualizados em lotes de `settings.bulk_chunk_size`,
+um commit por lote.
+
+Example:
+    python -m app.db.backfill
+    DATABASE_URL=postgresql://... FINGERPRINT_ALGORITHM=hmac-sha256 python -m app.db.backfill
+"""
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.db.model import engine
+from app.fingerprint import DIGEST_SIZE, card_fingerprint
+from app.log import configure_logging
+
+logger = logging.getLogger(__name__)
+
+_HEX_DIGEST = re.compile(rf"[0-9a-fA-F]{{{DIGEST_SIZE * 2}}}")
+
+_CARD_NUMBER = re.compile(r"[0-9]{12,19}")
+
+_SELECT = text(
+    "SELECT id, number FROM creditcard WHERE id > :after_id ORDER BY id LIMIT :limit"
+)
+
+_UPDATE = text("UPDATE creditcard SET number = :number WHERE id = :id")
+
+
+def classify_number(value: Any) -> Tuple[str, Optional[bytes]]:
+    """
+    Calcula o valor binário da coluna `number` a partir do valor gravado.
+
+    Args:
+        value (Any): O valor lido do banco, texto (`str`) ou binário (`bytes`).
+
+    Returns:
+        value (Tuple[str, Optional[bytes]]): O tipo do valor gravado (`unchanged`, `converted`,
+        `hashed` ou `invalid`) e a impressão digital de 32 bytes, None se inválido.
+    """
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        if len(value) == DIGEST_SIZE:
+            return "unchanged", value
+        value = value.decode("utf-8", errors="replace")
+    if not isinstance(value, str):
+        return "invalid", None
+    if _HEX_DIGEST.fullmatch(value):
+        return "converted", bytes.fromhex(value)
+    if _CARD_NUMBER.fullmatch(value):
+        return "hashed", bytes.fromhex(card_fingerprint(value))
+    return "invalid", None
+
+
+def backfill_fingerprints(
+    db_engine: Optional[Engine] = None, chunk_size: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Converte os números de cartão gravados como texto para a impressão digital binária.
+
+    Args:
+        db_engine (Optional[Engine], optional): O engine usado, por padrão o `engine` do serviço.
+        chunk_size (Optional[int], optional): Registros por lote, por padrão
+        `settings.bulk_chunk_size`.
+
+    Returns:
+        value (Dict[str, int]): A quantidade de registros `hashed` (texto puro), `converted`
+        (SHA-256 em hexadecimal), `unchanged` (já binários) e `invalid`.
+    """
+    db_engine = db_engine or engine
+    chunk_size = chunk_size or settings.bulk_chunk_size
+    counts = {"hashed": 0, "converted": 0, "unchanged": 0, "invalid": 0}
+    after_id = 0
+    while True:
+        with db_engine.begin() as connection:
+            rows = connection.execute(
+                _SELECT, {"after_id": after_id, "limit": chunk_size}
+            ).all()
+            updates: List[Dict[str, Any]] = []
+            for row_id, value in rows:
+                kind, number = classify_number(value)
+                counts[kind] += 1
+                if kind == "invalid":
+                    logger.error("creditcard %s has an invalid number", row_id)
+                elif kind != "unchanged":
+                    updates.append({"id": row_id, "number": number})
+            if updates:
+                connection.execute(_UPDATE, updates)
+        if len(rows) < chunk_size:
+            break
+        after_id = rows[-1][0]
+
+    if counts["converted"] and settings.fingerprint_algorithm.lower() != "sha256":
+        logger.warning(
+            "%d legacy sha256 fingerprints kept, they are not found with %s",
+            counts["converted"],
+            settings.fingerprint_algorithm,
+        )
+    logger.info("card fingerprints backfilled: %s", counts)
+    return counts
+
+
+if __name__ == "__main__":
+    configure_logging()
+    backfill_fingerprints()
@@ -8,17 +8,51 @@ Attributes:
     UPDATE: Método de atualização de dados.
     REMOVE: Método de remoção de dados.
 
+A classe `CRUDBase` trabalha com a `Session` síncrona e a `AsyncCRUDBase`
+com a `AsyncSession`, mantendo a mesma interface e as mesmas exceções.
+
+Ambas aceitam um cache opcional (`app.cache`) para as leituras por ID: `get` consulta o
+cache antes do banco, e `create`, `update` e `remove` invalidam o item após o commit.
+Cada item guarda a versão da linha (`updated_at`); `update` e `remove` deixam no lugar uma marca
+com a versão gravada (ou removida), e uma leitura concorrente que leu a linha antiga antes do
+commit não a guarda de volta no cache.
+
+Quando o modelo possui uma coluna única, `create` consulta o índice dessa coluna antes de
+inserir: duplicados são rejeitados sem abrir uma transação de escrita, e o `IntegrityError`
+fica apenas para o caso de duas requisições concorrentes com o mesmo valor.
 """
 
 
 import logging
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import math
+import uuid
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import func, insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Select
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.cache import CacheBackend, LRUCache
 from app.db.model import Base
 from app.exceptions.crud_error import (
     CRUDCreateError,
@@ -26,15 +60,413 @@ from app.exceptions.crud_error import (
     CRUDSelectError,
     CRUDUpdateError,
 )
+from app.exceptions.query_error import InvalidFieldsError
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+
+class StatementFilter(Protocol):
+    """Filtro de listagem: adiciona condições e ordenação a uma consulta (ver `app.db.filters`)."""
+
+    def apply(self, statement: Select) -> Select:
+        ...
+
+    def where(self, statement: Select) -> Select:
+        ...
+
+    def cache_key(self) -> str:
+        ...
+
+
+class SearchIndex(Protocol):
+    """Índice de busca textual de uma coluna (ver `app.db.search`)."""
+
+    column: str
+
+    def maintained(self, dialect: str) -> bool:
+        ...
+
+    def delete_statement(self, ids: Sequence[int]) -> Any:
+        ...
+
+    def insert_statement(self) -> Any:
+        ...
+
+    def rows(self, pairs: Sequence[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+        ...
+
+    def search_statement(
+        self, model: Any, query: str, limit: int, dialect: str
+    ) -> Select:
+        ...
+
+    def truncated_statement(self, query: str, dialect: str) -> Optional[Select]:
+        ...
+
+
 logger = logging.getLogger(__name__)
 
 
-class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+class _CRUDCommon(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """Estado e utilitários compartilhados entre `CRUDBase` e `AsyncCRUDBase`."""
+
+    def __init__(
+        self,
+        model: Type[ModelType],
+        cache: Optional[CacheBackend] = None,
+        username: Optional[str] = None,
+        search_index: Optional[SearchIndex] = None,
+        count_cache: Optional[CacheBackend] = None,
+    ):
+        self.model = model
+        self.cache = cache
+        self.username = username
+        self.search_index = search_index
+        self.count_cache = count_cache
+
+    def _cache_key(self, id: Any) -> str:
+        """Monta a chave do cache de leitura a partir da tabela do modelo e do ID."""
+        return f"{self.model.__tablename__}:{id}"
+
+    @staticmethod
+    def _cache_version(db_obj: ModelType) -> float:
+        """Retorna a versão da instância no cache de leitura, o seu `updated_at`."""
+        updated_at = getattr(db_obj, "updated_at", None)
+        return updated_at.timestamp() if updated_at is not None else 0.0
+
+    def _cache_get(self, id: Any) -> Optional[ModelType]:
+        """Retorna a instância guardada no cache de leitura, se houver."""
+        if self.cache is None:
+            return None
+        entry = self.cache.get(self._cache_key(id))
+        if entry is None or "row" not in entry:
+            return None
+        return self.model.validate(entry["row"])
+
+    def _cache_put(self, id: Any, entry: Dict[str, Any]) -> None:
+        """Guarda o item, a menos que o cache já tenha uma versão mais nova da instância."""
+        version = entry["version"]
+        self.cache.set_if(
+            self._cache_key(id),
+            entry,
+            lambda current: current is None or current["version"] <= version,
+        )
+
+    def _cache_set(self, db_obj: ModelType) -> None:
+        """Guarda a instância lida do banco no cache de leitura."""
+        if self.cache is not None:
+            entry = {"version": self._cache_version(db_obj), "row": db_obj.dict()}
+            self._cache_put(db_obj.id, entry)
+
+    def _cache_mark(self, id: Any, version: float = math.inf) -> None:
+        """
+        Substitui a instância no cache de leitura pela marca da versão gravada.
+
+        A versão padrão (infinita) marca uma instância removida.
+        """
+        if self.cache is not None:
+            self._cache_put(id, {"version": version})
+
+    def _cache_invalidate(self, *ids: Any) -> None:
+        """Remove do cache de leitura as instâncias com os IDs informados."""
+        if self.cache is not None and ids:
+            self.cache.delete(*(self._cache_key(id) for id in ids))
+
+    def _count_generation_key(self) -> str:
+        """Monta a chave da geração dos totais da tabela no cache de totais."""
+        return f"{self.model.__tablename__}:count:generation"
+
+    def _count_generation(self) -> str:
+        """
+        Retorna a geração atual dos totais da tabela, parte da chave de cada total.
+
+        Sem geração guardada (primeiro uso, expirada ou descartada), uma nova é criada; uma
+        geração nunca é reaproveitada, então totais antigos não voltam a ser lidos.
+        """
+        generation = self.count_cache.get(self._count_generation_key())
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.count_cache.set(self._count_generation_key(), generation)
+        return generation
+
+    def _count_key(self, filters: Optional[StatementFilter]) -> str:
+        """Monta a chave do cache de totais a partir da tabela, da geração e dos filtros."""
+        suffix = filters.cache_key() if filters is not None else "*"
+        return f"{self.model.__tablename__}:count:{self._count_generation()}:{suffix}"
+
+    def _count_get(
+        self, filters: Optional[StatementFilter]
+    ) -> Tuple[Optional[int], Optional[str]]:
+        """Retorna o total guardado no cache, se houver, e a chave usada para guardá-lo."""
+        if self.count_cache is None:
+            return None, None
+        key = self._count_key(filters)
+        return self.count_cache.get(key), key
+
+    def _count_set(self, key: Optional[str], total: int) -> None:
+        """Guarda o total no cache, na chave retornada por `_count_get`."""
+        if self.count_cache is not None and key is not None:
+            self.count_cache.set(key, total)
+
+    def _count_invalidate(self) -> None:
+        """
+        Descarta os totais de todas as combinações de filtros, trocando a geração da tabela.
+
+        Chamado após inserções, atualizações e remoções, que podem alterar qualquer total filtrado.
+        """
+        if self.count_cache is not None:
+            self.count_cache.set(self._count_generation_key(), uuid.uuid4().hex)
+
+    def _count_statement(self, filters: Optional[StatementFilter]):
+        """Monta o `COUNT(*)` da tabela, restrito pelos filtros, se houver."""
+        statement = select(func.count()).select_from(self.model)
+        if filters is not None:
+            statement = filters.where(statement)
+        return statement
+
+    def _search_statements(
+        self,
+        session: Union[Session, AsyncSession],
+        removed: Sequence[int] = (),
+        added: Sequence[ModelType] = (),
+    ) -> List[Tuple[Any, Optional[List[Dict[str, Any]]]]]:
+        """
+        Monta as escritas que mantêm o índice de busca igual à tabela, na mesma transação.
+
+        Retorna uma lista vazia quando não há índice ou quando o banco o mantém sozinho.
+        """
+        index = self.search_index
+        if index is None or not index.maintained(session.get_bind().dialect.name):
+            return []
+        statements: List[Tuple[Any, Optional[List[Dict[str, Any]]]]] = []
+        if removed:
+            statements.append((index.delete_statement(removed), None))
+        if added:
+            pairs = [(obj.id, getattr(obj, index.column)) for obj in added]
+            statements.append((index.insert_statement(), index.rows(pairs)))
+        return statements
+
+    def _search_touched(self, update_data: Dict[str, Any]) -> bool:
+        """Indica se a atualização altera a coluna do índice de busca."""
+        return self.search_index is not None and self.search_index.column in update_data
+
+    def _search_statement(
+        self, session: Union[Session, AsyncSession], query: str, limit: int
+    ):
+        """
+        Monta a busca textual pelo índice do repositório.
+
+        Raises:
+            ValueError: Se o repositório não tiver um índice de busca.
+        """
+        if self.search_index is None:
+            raise ValueError(f"{self.model.__tablename__} has no search index")
+        dialect = session.get_bind().dialect.name
+        return self.search_index.search_statement(self.model, query, limit, dialect)
+
+    def _truncated_statement(
+        self, session: Union[Session, AsyncSession], query: str
+    ) -> Optional[Select]:
+        """
+        Monta a verificação de ocorrências além dos candidatos ordenados pela busca textual.
+
+        Raises:
+            ValueError: Se o repositório não tiver um índice de busca.
+        """
+        if self.search_index is None:
+            raise ValueError(f"{self.model.__tablename__} has no search index")
+        dialect = session.get_bind().dialect.name
+        return self.search_index.truncated_statement(query, dialect)
+
+    def _version_statement(self, id: int):
+        """Monta a leitura do `updated_at` de uma instância, pela chave primária."""
+        return select(self.model.updated_at).where(self.model.id == id)
+
+    def _touch(self, db_obj: ModelType, update_data: Dict[str, Any]) -> None:
+        """Renova o `updated_at` da instância atualizada, se o modelo possuir a coluna."""
+        if "updated_at" in self.model.__fields__ and "updated_at" not in update_data:
+            db_obj.updated_at = datetime.utcnow()
+
+    def convert_any_to_dict(
+        self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Converte qualquer objeto do tipo UpdateSchemaType em um dicionário.
+
+        Usa o `.dict()` do schema, já validado, ao invés do `jsonable_encoder`, que
+        percorreria e converteria cada valor novamente.
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.dict()
+        return update_data
+
+    def _multi_statement(
+        self,
+        skip: int,
+        limit: int,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[StatementFilter] = None,
+    ):
+        """
+        Monta a consulta paginada por `OFFSET`, com todas as colunas ou apenas as informadas,
+        aplicando os filtros e a ordenação de `filters`, se houver.
+
+        Raises:
+            InvalidFieldsError: Se algum campo não for uma coluna do modelo.
+        """
+        if fields is None:
+            statement = select(self.model)
+        else:
+            columns = self.model.__table__.columns
+            unknown = [field for field in fields if field not in columns]
+            if unknown or not fields:
+                raise InvalidFieldsError(self.username, fields=unknown)
+            statement = select(*(getattr(self.model, field) for field in fields))
+
+        if filters is not None:
+            statement = filters.apply(statement)
+        return statement.offset(skip).limit(limit)
+
+    @staticmethod
+    def _project_rows(
+        rows: Sequence[Any], fields: Sequence[str]
+    ) -> List[Dict[str, Any]]:
+        """Converte as linhas de uma consulta projetada em dicionários com os campos pedidos."""
+        return [dict(zip(fields, row)) for row in rows]
+
+    def _page_statement(self, after_id: Optional[int], limit: int):
+        """
+        Monta a consulta de paginação por cursor (keyset) ordenada pelo ID.
+
+        Busca um registro além do limite para saber se existe uma próxima página,
+        sem precisar de um `COUNT` ou de um `OFFSET`.
+        """
+        statement = select(self.model).order_by(self.model.id).limit(limit + 1)
+        if after_id is not None:
+            statement = statement.where(self.model.id > after_id)
+        return statement
+
+    def _stream_statement(self, chunk_size: int):
+        """Monta a consulta de leitura completa da tabela em lotes, via cursor do servidor."""
+        return (
+            select(self.model)
+            .order_by(self.model.id)
+            .execution_options(yield_per=chunk_size, stream_results=True)
+        )
+
+    def _unique_column(self) -> Optional[str]:
+        """Retorna o nome da primeira coluna única do modelo (além da chave primária), se houver."""
+        for column in self.model.__table__.columns:
+            if column.unique:
+                return column.name
+        return None
+
+    def _exists_statement(self, filters: Dict[str, Any]):
+        """
+        Monta a consulta de existência, que lê no máximo um ID pelos índices das colunas.
+
+        Valores em lista, tupla ou conjunto são comparados com `IN`.
+        """
+        statement = select(self.model.id)
+        for key, value in filters.items():
+            column = getattr(self.model, key)
+            if isinstance(value, (list, tuple, set)):
+                statement = statement.where(column.in_(value))
+            else:
+                statement = statement.where(column == value)
+        return statement.limit(1)
+
+    def _unique_values(self, obj_in: Any, value: Any) -> List[Any]:
+        """
+        Retorna os valores da coluna única que representam o mesmo registro que `obj_in`.
+
+        Por padrão, apenas o próprio valor; os repositórios sobrescrevem quando o mesmo dado
+        pode ter sido gravado de outra forma (por exemplo, com uma chave anterior).
+        """
+        return [value]
+
+    def _duplicate_filter(
+        self, obj_in: Any, db_obj: ModelType
+    ) -> Optional[Dict[str, Any]]:
+        """Retorna o filtro pela coluna única do modelo, usado na checagem antes de inserir."""
+        key = self._unique_column()
+        if key is None:
+            return None
+        return {key: self._unique_values(obj_in, getattr(db_obj, key))}
+
+    def _unique_aliases(
+        self, objs_in: Sequence[Any], values: List[Any]
+    ) -> Dict[Any, Any]:
+        """
+        Mapeia cada valor a consultar na coluna única (`_unique_values`) ao valor da linha do lote.
+
+        Um valor gravado de outra forma e encontrado no banco conta como o valor da linha.
+        """
+        return {
+            alias: value
+            for obj_in, value in zip(objs_in, values)
+            for alias in self._unique_values(obj_in, value)
+        }
+
+    def _duplicate_error(self, filters: Dict[str, Any]) -> CRUDCreateError:
+        """Monta o erro de conflito para um valor único já existente."""
+        column = ", ".join(f"{self.model.__tablename__}.{key}" for key in filters)
+        return CRUDCreateError(self.username, obj_error=f"{column} already exists")
+
+    @staticmethod
+    def _pending_inserts(values: List[Any], existing: Set[Any]) -> Dict[Any, int]:
+        """
+        Seleciona quais linhas do lote devem ser inseridas.
+
+        Valores que já existem no banco, ou repetidos dentro do próprio lote, são descartados;
+        o retorno mapeia cada valor único à posição da primeira linha que o contém.
+        """
+        pending: Dict[Any, int] = {}
+        for index, value in enumerate(values):
+            if value not in existing and value not in pending:
+                pending[value] = index
+        return pending
+
+    @staticmethod
+    def _map_ids(
+        size: int, pending: Dict[Any, int], created: List[Tuple[int, Any]]
+    ) -> List[Optional[int]]:
+        """Posiciona os IDs inseridos na ordem original do lote, com None para os conflitos."""
+        ids: List[Optional[int]] = [None] * size
+        for obj_id, value in created:
+            ids[pending[value]] = obj_id
+        return ids
+
+    def _created_rows(
+        self, rows: List[ModelType], ids: List[Optional[int]]
+    ) -> List[ModelType]:
+        """Retorna as linhas do lote que foram inseridas, já com o ID gerado."""
+        if self.search_index is None:
+            return []
+        created = []
+        for row, obj_id in zip(rows, ids):
+            if obj_id is not None:
+                row.id = obj_id
+                created.append(row)
+        return created
+
+    def _split_page(
+        self, rows: List[ModelType], limit: int
+    ) -> Tuple[List[ModelType], Optional[int]]:
+        """Separa os itens da página e o ID usado como cursor da próxima página."""
+        if limit <= 0:
+            return [], None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, rows[-1].id
+        return rows, None
+
+
+class CRUDBase(_CRUDCommon[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Classe base para operações CRUD (Create, Read, Update, Delete) em um modelo.
 
@@ -44,8 +476,13 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     **Parâmetros**
 
     * `model`: Uma classe modelo SQLModel.
+    * `cache`: Um cache opcional (`LRUCache` ou `RedisCache`) para as leituras por ID.
+    * `search_index`: Um índice de busca textual opcional (`app.db.search`), atualizado na mesma
+    transação de cada escrita.
+    * `count_cache`: Um cache opcional dos totais de `count`, por combinação de filtros.
     * `schema`: Uma classe modelo Pydantic (schema).
-    * `username`: O nome de usuário do usuário que está realizando a operação.
+    * `username`: O nome de usuário do usuário que está realizando a operação (opcional),
+    usado nos cabeçalhos `X-Username-Error` das exceções.
 
     **Atributos**
 
@@ -54,33 +491,44 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     **Métodos**
 
     * `get(session: Session, id: int) -> Optional[ModelType]`: Retorna uma instância do modelo com o ID correspondente.
-    * `get_multi(session: Session, *, skip: int = 0, limit: int = 100) -> List[ModelType]`: Retorna uma lista paginada de instâncias do modelo.
+    * `get_version(session: Session, id: int) -> datetime`: Retorna apenas o `updated_at` da instância, usado nas
+    requisições condicionais.
+    * `get_multi(session: Session, *, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None,
+    filters: Optional[StatementFilter] = None)
+    -> Union[List[ModelType], List[Dict[str, Any]]]`: Retorna uma lista paginada de instâncias do modelo, ou apenas das colunas pedidas,
+    filtrada e ordenada por `filters`.
+    * `get_page(session: Session, *, after_id: Optional[int] = None, limit: int = 100) -> Tuple[List[ModelType], Optional[int]]`:
+    Retorna uma página por cursor (keyset) e o ID de início da próxima página.
+    * `iter_chunks(session: Session, *, chunk_size: int = 1000) -> Iterator[List[ModelType]]`: Percorre toda a tabela em lotes.
+    * `exists(session: Session, **filters: Any) -> bool`: Indica se existe alguma instância com os valores informados.
+    * `search(session: Session, *, query: str, limit: int = 20) -> List[ModelType]`: Busca pelo índice textual,
+    da instância mais à menos relevante.
+    * `count(session: Session, *, filters: Optional[StatementFilter] = None) -> int`: Retorna o total de instâncias,
+    usando o cache de totais.
     * `create(session: Session, *, obj_in: CreateSchemaType) -> ModelType`: Cria uma nova instância do modelo com os dados fornecidos.
+    * `create_many(session: Session, *, objs_in: Sequence[CreateSchemaType]) -> List[Optional[int]]`: Cria várias instâncias
+    em uma única transação, sem abortar o lote em caso de conflito.
     * `update(session: Session, *, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType`: Atualiza
     uma instância do modelo com os dados fornecidos.
     * `remove(session: Session, *, id: int) -> ModelType`: Remove uma instância do modelo com o ID correspondente.
     """
 
-    username: Optional[str] = None
-
-    def __init__(self, model: Type[ModelType]):
-        self.model = model
+    def _commit_and_refresh(
+        self, session: Session, db_obj: ModelType, *, mark: bool = False
+    ) -> ModelType:
+        """
+        Realiza o commit e o refresh da sessão do banco de dados, invalidando o cache.
 
-    def _commit_and_refresh(self, session: Session, db_obj: ModelType) -> ModelType:
-        """Realiza o commit e o refresh da sessão do banco de dados."""
+        Com `mark`, a entrada é substituída pelo marcador da nova versão em vez de removida,
+        para que uma leitura anterior à alteração não volte a ser guardada.
+        """
         session.commit()
         session.refresh(db_obj)
-        return db_obj
-
-    def convert_any_to_dict(
-        self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
-    ) -> Dict[str, Any]:
-        """Converte qualquer objeto do tipo UpdateSchemaType em um dicionário."""
-        if isinstance(obj_in, dict):
-            update_data = obj_in
+        if mark:
+            self._cache_mark(db_obj.id, self._cache_version(db_obj))
         else:
-            update_data = jsonable_encoder(obj_in)
-        return update_data
+            self._cache_invalidate(db_obj.id)
+        return db_obj
 
     def get(self, session: Session, id: int) -> Optional[ModelType]:
         """
@@ -93,48 +541,302 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         Returns:
             value (Optional[ModelType]): A instância do modelo, se encontrada; caso contrário, None.
         """
+        cached = self._cache_get(id)
+        if cached is not None:
+            return cached
+
         resp = session.get(self.model, id)
 
         if not resp:
             raise CRUDSelectError(self.username, obj_id=id)
+        self._cache_set(resp)
         return resp
 
+    def get_version(self, session: Session, id: int) -> datetime:
+        """
+        Retorna o `updated_at` da instância com o ID correspondente, sem carregá-la.
+
+        É uma única leitura pela chave primária, suficiente para responder 304 Not Modified.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            id (int): O ID da instância.
+
+        Returns:
+            value (datetime): A data e hora da última atualização da instância.
+
+        Raises:
+            CRUDSelectError: Se a instância não existir.
+        """
+        version = session.exec(self._version_statement(id)).first()
+        if version is None:
+            raise CRUDSelectError(self.username, obj_id=id)
+        return version
+
     def get_multi(
-        self, session: Session, *, skip: int = 0, limit: int = 100
-    ) -> List[ModelType]:
+        self,
+        session: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[StatementFilter] = None,
+    ) -> Union[List[ModelType], List[Dict[str, Any]]]:
         """
         Retorna uma lista paginada de instâncias do modelo.
 
+        Com `fields`, a consulta seleciona apenas essas colunas e retorna dicionários,
+        sem instanciar os objetos do ORM.
+
         Args:
             session (Session): A sessão do banco de dados.
             skip (int, opcional): O número de registros a serem ignorados.
             limit (int, opcional): O número máximo de registros a serem retornados.
+            fields (Optional[Sequence[str]], opcional): As colunas a serem retornadas.
+            filters (Optional[StatementFilter], opcional): Os filtros e a ordenação da consulta.
 
         Returns:
-            value (List[ModelType]): Uma lista de instâncias do modelo.
+            value (Union[List[ModelType], List[Dict[str, Any]]]): Uma lista de instâncias do modelo,
+            ou de dicionários com os campos pedidos.
+
+        Raises:
+            InvalidFieldsError: Se algum campo não for uma coluna do modelo.
         """
-        statement = select(self.model).offset(skip).limit(limit)
-        results = session.exec(statement)
-        return results.all()
+        statement = self._multi_statement(skip, limit, fields, filters)
+        if fields is None:
+            return session.exec(statement).all()
+        return self._project_rows(session.execute(statement).all(), fields)
+
+    def get_page(
+        self, session: Session, *, after_id: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[int]]:
+        """
+        Retorna uma página de instâncias do modelo usando paginação por cursor (keyset).
+
+        Diferente do `get_multi`, o custo da consulta não cresce com a profundidade da página,
+        pois usa o índice da chave primária (`id > after_id`) ao invés de `OFFSET`.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            after_id (Optional[int], opcional): O último ID da página anterior.
+            limit (int, opcional): O número máximo de registros a serem retornados.
+
+        Returns:
+            value (Tuple[List[ModelType], Optional[int]]): Os itens da página e o ID
+            a partir do qual a próxima página começa, ou None se esta for a última.
+        """
+        results = session.exec(self._page_statement(after_id, limit))
+        return self._split_page(results.all(), limit)
+
+    def iter_chunks(
+        self, session: Session, *, chunk_size: int = 1000
+    ) -> Iterator[List[ModelType]]:
+        """
+        Percorre todas as instâncias do modelo em lotes, sem carregar a tabela em memória.
+
+        A consulta usa `yield_per` e `stream_results`, então o banco entrega as linhas
+        sob demanda e apenas um lote fica materializado por vez.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            chunk_size (int, opcional): O número de registros por lote.
+
+        Yields:
+            value (List[ModelType]): Um lote de instâncias do modelo, ordenado pelo ID.
+        """
+        results = session.exec(self._stream_statement(chunk_size))
+        for chunk in results.partitions(chunk_size):
+            yield list(chunk)
+
+    def exists(self, session: Session, **filters: Any) -> bool:
+        """
+        Indica se existe alguma instância do modelo com os valores informados.
+
+        A consulta lê apenas o ID de no máximo uma linha, então é resolvida pelo índice
+        quando as colunas filtradas são indexadas (como as colunas únicas).
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            **filters (Any): Os valores esperados, por nome de coluna; listas aceitam qualquer um dos valores.
+
+        Returns:
+            value (bool): True se alguma instância for encontrada.
+        """
+        return session.exec(self._exists_statement(filters)).first() is not None
+
+    def search(
+        self, session: Session, *, query: str, limit: int = 20
+    ) -> List[ModelType]:
+        """
+        Busca as instâncias cujo texto indexado contém `query`, da mais à menos relevante.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            query (str): O trecho buscado.
+            limit (int, opcional): O número máximo de instâncias.
+
+        Returns:
+            value (List[ModelType]): As instâncias encontradas.
+
+        Raises:
+            ValueError: Se o repositório não tiver um índice de busca.
+        """
+        return session.exec(self._search_statement(session, query, limit)).all()
+
+    def search_truncated(self, session: Session, *, query: str) -> bool:
+        """
+        Indica se a busca por `query` ordenou apenas parte das ocorrências.
+
+        No SQLite a busca ordena somente os `SEARCH_CANDIDATES` registros mais recentes que
+        contêm o trecho (`app.db.search`); registros mais antigos não aparecem no resultado.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            query (str): O trecho buscado.
+
+        Returns:
+            value (bool): True se há ocorrências fora dos candidatos ordenados.
+
+        Raises:
+            ValueError: Se o repositório não tiver um índice de busca.
+        """
+        statement = self._truncated_statement(session, query)
+        return statement is not None and session.exec(statement).first() is not None
+
+    def count(
+        self, session: Session, *, filters: Optional[StatementFilter] = None
+    ) -> int:
+        """
+        Retorna o total de instâncias do modelo, restrito pelos filtros, se houver.
+
+        O total fica no `count_cache` até expirar, evitando um `COUNT(*)` a cada requisição.
+        Cada inserção, atualização ou remoção feita pelo repositório troca a geração da tabela
+        (`_count_invalidate`), descartando os totais de todas as combinações de filtros.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            filters (Optional[StatementFilter], opcional): Os filtros da listagem.
+
+        Returns:
+            value (int): O total de instâncias.
+        """
+        total, key = self._count_get(filters)
+        if total is None:
+            total = session.exec(self._count_statement(filters)).one()
+            self._count_set(key, total)
+        return total
+
+    def _sync_search(
+        self,
+        session: Session,
+        removed: Sequence[int] = (),
+        added: Sequence[ModelType] = (),
+    ) -> None:
+        """Atualiza o índice de busca na transação corrente."""
+        for statement, params in self._search_statements(session, removed, added):
+            session.execute(statement, params)
 
     def create(self, session: Session, *, obj_in: CreateSchemaType) -> ModelType:
         """
         Cria uma nova instância do modelo com os dados fornecidos.
 
+        Se o valor da coluna única já existir, o conflito é detectado por uma consulta ao
+        índice, antes de qualquer escrita.
+
         Args:
             session (Session): A sessão do banco de dados.
             obj_in (CreateSchemaType): Os dados para criar a nova instância.
 
         Returns:
             value (ModelType): A instância do modelo recém-criada.
+
+        Raises:
+            CRUDCreateError: Se o valor da coluna única já existir.
         """
         db_obj = self.model.parse_obj(obj_in)
+        duplicate = self._duplicate_filter(obj_in, db_obj)
+        if duplicate is not None and self.exists(session, **duplicate):
+            raise self._duplicate_error(duplicate)
+
         try:
             session.add(db_obj)
-            return self._commit_and_refresh(session, db_obj)
+            if self.search_index is not None:
+                session.flush()
+                self._sync_search(session, added=[db_obj])
+            db_obj = self._commit_and_refresh(session, db_obj)
+            self._count_invalidate()
+            return db_obj
         except IntegrityError as e:
+            session.rollback()
             raise CRUDCreateError(self.username, obj_error=e)
 
+    def create_many(
+        self, session: Session, *, objs_in: Sequence[CreateSchemaType]
+    ) -> List[Optional[int]]:
+        """
+        Cria várias instâncias do modelo em uma única transação.
+
+        Quando o modelo possui uma coluna única, os valores já existentes são buscados em uma
+        única consulta pelo índice, as linhas restantes são inseridas com um `executemany`
+        e os IDs gerados são lidos de volta pela mesma coluna. Conflitos não abortam o lote:
+        a posição correspondente recebe None. Se outra transação inserir o mesmo valor no meio
+        do caminho, o lote é refeito linha a linha.
+
+        Args:
+            session (Session): A sessão do banco de dados.
+            objs_in (Sequence[CreateSchemaType]): Os dados das novas instâncias.
+
+        Returns:
+            value (List[Optional[int]]): O ID de cada instância criada, na ordem de `objs_in`,
+            ou None para as que conflitam com um valor único já existente.
+        """
+        rows = [self.model.parse_obj(obj_in) for obj_in in objs_in]
+        key = self._unique_column()
+        if key is None:
+            session.add_all(rows)
+            session.flush()
+            ids: List[Optional[int]] = [row.id for row in rows]
+            self._sync_search(session, added=rows)
+            session.commit()
+            self._cache_invalidate(*ids)
+            self._count_invalidate()
+            return ids
+
+        column = getattr(self.model, key)
+        values = [getattr(row, key) for row in rows]
+        aliases = self._unique_aliases(objs_in, values)
+        found = session.exec(select(column).where(column.in_(list(aliases))))
+        existing = {aliases[value] for value in found}
+        pending = self._pending_inserts(values, existing)
+        if not pending:
+            return [None] * len(rows)
+
+        try:
+            session.execute(
+                insert(self.model),
+                [rows[index].dict(exclude={"id"}) for index in pending.values()],
+            )
+            statement = select(self.model.id, column).where(column.in_(list(pending)))
+            ids = self._map_ids(len(rows), pending, session.exec(statement).all())
+            self._sync_search(session, added=self._created_rows(rows, ids))
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            return [self._create_or_none(session, obj_in) for obj_in in objs_in]
+
+        self._cache_invalidate(*(obj_id for obj_id in ids if obj_id is not None))
+        self._count_invalidate()
+        return ids
+
+    def _create_or_none(
+        self, session: Session, obj_in: CreateSchemaType
+    ) -> Optional[int]:
+        """Cria uma instância, retornando None ao invés de levantar `CRUDCreateError`."""
+        try:
+            return self.create(session, obj_in=obj_in).id
+        except CRUDCreateError:
+            return None
+
     def update(
         self,
         session: Session,
@@ -145,6 +847,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         Atualiza uma instância do modelo com os dados fornecidos.
 
+        O `updated_at` é renovado, mudando a `ETag` da instância.
+
         Args:
             session (Session): A sessão do banco de dados.
             id (int): O ID da instância a ser atualizada.
@@ -162,9 +866,14 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
         for key, value in result_data.items():
             setattr(result, key, value)
+        self._touch(result, result_data)
 
         session.add(result)
-        return self._commit_and_refresh(session, result)
+        if self._search_touched(result_data):
+            self._sync_search(session, removed=[id], added=[result])
+        result = self._commit_and_refresh(session, result, mark=True)
+        self._count_invalidate()
+        return result
 
     def remove(self, session: Session, *, id: int) -> ModelType:
         """
@@ -183,5 +892,272 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             raise CRUDDeleteError(self.username, obj_id=id)
 
         session.delete(result)
+        self._sync_search(session, removed=[id])
         session.commit()
+        self._cache_mark(id)
+        self._count_invalidate()
+        return result
+
+
+class AsyncCRUDBase(_CRUDCommon[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Versão assíncrona da `CRUDBase`, para uso com `AsyncSession`.
+
+    Os métodos possuem a mesma assinatura e levantam as mesmas exceções da `CRUDBase`,
+    porém devem ser aguardados (`await`), liberando o event loop durante as consultas.
+
+    **Métodos**
+
+    * `get(session: AsyncSession, id: int) -> Optional[ModelType]`
+    * `get_version(session: AsyncSession, id: int) -> datetime`
+    * `get_multi(session: AsyncSession, *, skip: int = 0, limit: int = 100, fields: Optional[Sequence[str]] = None,
+    filters: Optional[StatementFilter] = None)
+    -> Union[List[ModelType], List[Dict[str, Any]]]`
+    * `get_page(session: AsyncSession, *, after_id: Optional[int] = None, limit: int = 100) -> Tuple[List[ModelType], Optional[int]]`
+    * `iter_chunks(session: AsyncSession, *, chunk_size: int = 1000) -> AsyncIterator[List[ModelType]]`
+    * `exists(session: AsyncSession, **filters: Any) -> bool`
+    * `search(session: AsyncSession, *, query: str, limit: int = 20) -> List[ModelType]`
+    * `count(session: AsyncSession, *, filters: Optional[StatementFilter] = None) -> int`
+    * `create(session: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType`
+    * `create_many(session: AsyncSession, *, objs_in: Sequence[CreateSchemaType]) -> List[Optional[int]]`
+    * `update(session: AsyncSession, *, id: int, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType`
+    * `remove(session: AsyncSession, *, id: int) -> ModelType`
+    """
+
+    async def _commit_and_refresh(
+        self, session: AsyncSession, db_obj: ModelType, *, mark: bool = False
+    ) -> ModelType:
+        """
+        Realiza o commit e o refresh da sessão assíncrona do banco de dados, invalidando o cache.
+
+        Com `mark`, a entrada é substituída pelo marcador da nova versão em vez de removida,
+        para que uma leitura anterior à alteração não volte a ser guardada.
+        """
+        await session.commit()
+        await session.refresh(db_obj)
+        if mark:
+            await self._run_cache(
+                self._cache_mark, db_obj.id, self._cache_version(db_obj)
+            )
+        else:
+            await self._run_cache(self._cache_invalidate, db_obj.id)
+        return db_obj
+
+    async def _run_cache(self, method: Any, *args: Any) -> Any:
+        """
+        Executa uma operação do cache de leitura ou de totais sem bloquear o event loop.
+
+        Caches em memória são chamados diretamente; backends remotos (Redis) usam I/O
+        bloqueante e por isso são executados no threadpool.
+        """
+        caches = (self.cache, self.count_cache)
+        if all(cache is None or isinstance(cache, LRUCache) for cache in caches):
+            return method(*args)
+        return await run_in_threadpool(method, *args)
+
+    async def get(self, session: AsyncSession, id: int) -> Optional[ModelType]:
+        """Retorna uma instância do modelo com o ID correspondente."""
+        cached = await self._run_cache(self._cache_get, id)
+        if cached is not None:
+            return cached
+
+        resp = await session.get(self.model, id)
+
+        if not resp:
+            raise CRUDSelectError(self.username, obj_id=id)
+        await self._run_cache(self._cache_set, resp)
+        return resp
+
+    async def get_version(self, session: AsyncSession, id: int) -> datetime:
+        """Retorna o `updated_at` da instância com o ID correspondente, sem carregá-la."""
+        version = (await session.exec(self._version_statement(id))).first()
+        if version is None:
+            raise CRUDSelectError(self.username, obj_id=id)
+        return version
+
+    async def get_multi(
+        self,
+        session: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[StatementFilter] = None,
+    ) -> Union[List[ModelType], List[Dict[str, Any]]]:
+        """
+        Retorna uma lista paginada de instâncias do modelo, ou apenas das colunas em `fields`,
+        filtrada e ordenada por `filters`.
+        """
+        statement = self._multi_statement(skip, limit, fields, filters)
+        if fields is None:
+            return (await session.exec(statement)).all()
+        results = await session.execute(statement)
+        return self._project_rows(results.all(), fields)
+
+    async def get_page(
+        self, session: AsyncSession, *, after_id: Optional[int] = None, limit: int = 100
+    ) -> Tuple[List[ModelType], Optional[int]]:
+        """Retorna uma página de instâncias do modelo usando paginação por cursor (keyset)."""
+        results = await session.exec(self._page_statement(after_id, limit))
+        return self._split_page(results.all(), limit)
+
+    async def iter_chunks(
+        self, session: AsyncSession, *, chunk_size: int = 1000
+    ) -> AsyncIterator[List[ModelType]]:
+        """Percorre todas as instâncias do modelo em lotes, sem carregar a tabela em memória."""
+        results = await session.stream(self._stream_statement(chunk_size))
+        async for chunk in results.scalars().partitions(chunk_size):
+            yield list(chunk)
+
+    async def exists(self, session: AsyncSession, **filters: Any) -> bool:
+        """Indica se existe alguma instância do modelo com os valores informados."""
+        results = await session.exec(self._exists_statement(filters))
+        return results.first() is not None
+
+    async def search(
+        self, session: AsyncSession, *, query: str, limit: int = 20
+    ) -> List[ModelType]:
+        """Busca as instâncias cujo texto indexado contém `query`, da mais à menos relevante."""
+        results = await session.exec(self._search_statement(session, query, limit))
+        return results.all()
+
+    async def search_truncated(self, session: AsyncSession, *, query: str) -> bool:
+        """Indica se a busca por `query` ordenou apenas parte das ocorrências (veja `CRUDBase`)."""
+        statement = self._truncated_statement(session, query)
+        if statement is None:
+            return False
+        return (await session.exec(statement)).first() is not None
+
+    async def count(
+        self, session: AsyncSession, *, filters: Optional[StatementFilter] = None
+    ) -> int:
+        """Retorna o total de instâncias do modelo, usando o cache de totais (veja `CRUDBase.count`)."""
+        total, key = await self._run_cache(self._count_get, filters)
+        if total is None:
+            total = (await session.exec(self._count_statement(filters))).one()
+            await self._run_cache(self._count_set, key, total)
+        return total
+
+    async def _sync_search(
+        self,
+        session: AsyncSession,
+        removed: Sequence[int] = (),
+        added: Sequence[ModelType] = (),
+    ) -> None:
+        """Atualiza o índice de busca na transação corrente."""
+        for statement, params in self._search_statements(session, removed, added):
+            await session.execute(statement, params)
+
+    async def create(
+        self, session: AsyncSession, *, obj_in: CreateSchemaType
+    ) -> ModelType:
+        """Cria uma nova instância do modelo, rejeitando duplicados antes de inserir."""
+        db_obj = self.model.parse_obj(obj_in)
+        duplicate = self._duplicate_filter(obj_in, db_obj)
+        if duplicate is not None and await self.exists(session, **duplicate):
+            raise self._duplicate_error(duplicate)
+
+        try:
+            session.add(db_obj)
+            if self.search_index is not None:
+                await session.flush()
+                await self._sync_search(session, added=[db_obj])
+            db_obj = await self._commit_and_refresh(session, db_obj)
+            await self._run_cache(self._count_invalidate)
+            return db_obj
+        except IntegrityError as e:
+            await session.rollback()
+            raise CRUDCreateError(self.username, obj_error=e)
+
+    async def create_many(
+        self, session: AsyncSession, *, objs_in: Sequence[CreateSchemaType]
+    ) -> List[Optional[int]]:
+        """Cria várias instâncias do modelo em uma única transação, veja `CRUDBase.create_many`."""
+        rows = [self.model.parse_obj(obj_in) for obj_in in objs_in]
+        key = self._unique_column()
+        if key is None:
+            session.add_all(rows)
+            await session.flush()
+            ids: List[Optional[int]] = [row.id for row in rows]
+            await self._sync_search(session, added=rows)
+            await session.commit()
+            await self._run_cache(self._cache_invalidate, *ids)
+            await self._run_cache(self._count_invalidate)
+            return ids
+
+        column = getattr(self.model, key)
+        values = [getattr(row, key) for row in rows]
+        aliases = self._unique_aliases(objs_in, values)
+        found = await session.exec(select(column).where(column.in_(list(aliases))))
+        existing = {aliases[value] for value in found}
+        pending = self._pending_inserts(values, existing)
+        if not pending:
+            return [None] * len(rows)
+
+        try:
+            await session.execute(
+                insert(self.model),
+                [rows[index].dict(exclude={"id"}) for index in pending.values()],
+            )
+            statement = select(self.model.id, column).where(column.in_(list(pending)))
+            results = await session.exec(statement)
+            ids = self._map_ids(len(rows), pending, results.all())
+            await self._sync_search(session, added=self._created_rows(rows, ids))
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            return [await self._create_or_none(session, obj_in) for obj_in in objs_in]
+
+        created = [obj_id for obj_id in ids if obj_id is not None]
+        await self._run_cache(self._cache_invalidate, *created)
+        await self._run_cache(self._count_invalidate)
+        return ids
+
+    async def _create_or_none(
+        self, session: AsyncSession, obj_in: CreateSchemaType
+    ) -> Optional[int]:
+        """Cria uma instância, retornando None ao invés de levantar `CRUDCreateError`."""
+        try:
+            return (await self.create(session, obj_in=obj_in)).id
+        except CRUDCreateError:
+            return None
+
+    async def update(
+        self,
+        session: AsyncSession,
+        *,
+        id: int,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> ModelType:
+        """Atualiza uma instância do modelo com os dados fornecidos."""
+        result = await session.get(self.model, id)
+
+        if not result:
+            raise CRUDUpdateError(self.username, obj_id=id)
+
+        result_data = self.convert_any_to_dict(obj_in)
+
+        for key, value in result_data.items():
+            setattr(result, key, value)
+        self._touch(result, result_data)
+
+        session.add(result)
+        if self._search_touched(result_data):
+            await self._sync_search(session, removed=[id], added=[result])
+        result = await self._commit_and_refresh(session, result, mark=True)
+        await self._run_cache(self._count_invalidate)
+        return result
+
+    async def remove(self, session: AsyncSession, *, id: int) -> ModelType:
+        """Remove uma instância do modelo com o ID correspondente."""
+        result = await session.get(self.model, id)
+
+        if not result:
+            raise CRUDDeleteError(self.username, obj_id=id)
+
+        await session.delete(result)
+        await self._sync_search(session, removed=[id])
+        await session.commit()
+        await self._run_cache(self._cache_mark, id)
+        await self._run_cache(self._count_invalidate)
         return result
@@ -0,0 +1,165 @@
+"""
+## Módulo de Filtros de Consulta.
+Filtros e ordenação da listagem de cartões (`GET /credit-card/`), traduzidos em SQL que
+aproveita os índices de `holder`, `brand`, `created_at` e `updated_at`:
+
+- `brand`: igualdade, normalizada em minúsculas como as bandeiras gravadas.
+- `holder_prefix`: faixa `holder >= prefixo AND holder < prefixo_seguinte` em vez de `LIKE`,
+que no SQLite não diferencia maiúsculas e por isso não usa o índice. O prefixo diferencia
+maiúsculas de minúsculas.
+- `created_after`/`created_before` e `updated_after`/`updated_before`: faixas semiabertas
+(`>=` e `<`) sobre as datas.
+- `sort`: a coluna de ordenação, com `-` para ordem decrescente; o `id` desempata a ordem,
+mantendo a paginação por `skip`/`limit` estável.
+"""
+import logging
+from datetime import datetime
+from typing import Any, List, Optional
+
+from fastapi import Query
+from pydantic import BaseModel
+from sqlalchemy.sql import Select
+
+from app.db.model import CreditCard
+
+logger = logging.getLogger(__name__)
+
+SORT_FIELDS = ("id", "holder", "brand", "created_at", "updated_at")
+
+SORT_PATTERN = rf"^-?({'|'.join(SORT_FIELDS)})$"
+
+_MAX_CHAR = chr(0x10FFFF)
+
+
+def prefix_upper_bound(prefix: str) -> Optional[str]:
+    """
+    Calcula o menor texto maior que todos os textos iniciados por `prefix`.
+
+    Args:
+        prefix (str): O prefixo, por exemplo `"Ana"`.
+
+    Returns:
+        value (Optional[str]): O limite superior exclusivo, por exemplo `"Anb"`, ou None se
+        não houver limite (prefixo formado apenas pelo maior caractere Unicode).
+    """
+    stripped = prefix.rstrip(_MAX_CHAR)
+    if not stripped:
+        return None
+    return stripped[:-1] + chr(ord(stripped[-1]) + 1)
+
+
+class CreditCardFilter(BaseModel):
+    """
+    Filtros e ordenação da listagem de cartões de crédito.
+
+    **Atributos**
+
+    * `brand` (Optional[str]): A bandeira exata.
+    * `holder_prefix` (Optional[str]): O início do nome do titular.
+    * `created_after`, `created_before` (Optional[datetime]): A faixa de criação.
+    * `updated_after`, `updated_before` (Optional[datetime]): A faixa de atualização.
+    * `sort` (str): A coluna de ordenação, com `-` para ordem decrescente.
+
+    **Métodos**
+
+    * `apply(statement: Select) -> Select`: Adiciona os filtros e a ordenação à consulta.
+    * `where(statement: Select) -> Select`: Adiciona apenas os filtros, por exemplo a um `COUNT`.
+    * `cache_key() -> str`: Identifica os filtros (sem a ordenação) no cache de totais.
+
+    Example:
+        statement = CreditCardFilter(brand="visa", sort="-created_at").apply(select(CreditCard))
+    """
+
+    brand: Optional[str] = None
+    holder_prefix: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    sort: str = "id"
+
+    def _conditions(self) -> List[Any]:
+        """Monta as condições `WHERE` dos filtros informados."""
+        conditions = []
+        if self.brand:
+            conditions.append(CreditCard.brand == self.brand.lower())
+        if self.holder_prefix:
+            conditions.append(CreditCard.holder >= self.holder_prefix)
+            upper = prefix_upper_bound(self.holder_prefix)
+            if upper is not None:
+                conditions.append(CreditCard.holder < upper)
+        if self.created_after is not None:
+            conditions.append(CreditCard.created_at >= self.created_after)
+        if self.created_before is not None:
+            conditions.append(CreditCard.created_at < self.created_before)
+        if self.updated_after is not None:
+            conditions.append(CreditCard.updated_at >= self.updated_after)
+        if self.updated_before is not None:
+            conditions.append(CreditCard.updated_at < self.updated_before)
+        return conditions
+
+    def _order_by(self) -> List[Any]:
+        """Monta a ordenação, desempatada pelo `id` no mesmo sentido."""
+        descending = self.sort.startswith("-")
+        column = getattr(CreditCard, self.sort.lstrip("-"))
+        order = [column.desc() if descending else column.asc()]
+        if column is not CreditCard.id:
+            order.append(CreditCard.id.desc() if descending else CreditCard.id.asc())
+        return order
+
+    def where(self, statement: Select) -> Select:
+        """Adiciona à consulta apenas as condições dos filtros informados."""
+        conditions = self._conditions()
+        if conditions:
+            statement = statement.where(*conditions)
+        return statement
+
+    def apply(self, statement: Select) -> Select:
+        """
+        Adiciona os filtros e a ordenação à consulta.
+
+        Args:
+            statement (Select): A consulta sobre `CreditCard` (todas as colunas ou projetada).
+
+        Returns:
+            value (Select): A consulta filtrada e ordenada.
+        """
+        return self.where(statement).order_by(*self._order_by())
+
+    def cache_key(self) -> str:
+        """Retorna uma chave estável dos filtros informados, ignorando a ordenação."""
+        return self.json(exclude={"sort"}, exclude_none=True, sort_keys=True)
+
+
+def get_credit_card_filter(
+    brand: Optional[str] = Query(
+        default=None, description="Bandeira exata (ex.: `visa`)."
+    ),
+    holder_prefix: Optional[str] = Query(
+        default=None, min_length=1, description="Início do nome do titular."
+    ),
+    created_after: Optional[datetime] = Query(default=None),
+    created_before: Optional[datetime] = Query(default=None),
+    updated_after: Optional[datetime] = Query(default=None),
+    updated_before: Optional[datetime] = Query(default=None),
+    sort: str = Query(
+        default="id",
+        pattern=SORT_PATTERN,
+        description=f"Ordenação por {', '.join(SORT_FIELDS)}; prefixo `-` para decrescente.",
+    ),
+) -> CreditCardFilter:
+    """
+    Dependência que monta o `CreditCardFilter` a partir dos parâmetros de consulta.
+
+    Returns:
+        value (CreditCardFilter): Os filtros e a ordenação da requisição.
+    """
+    return CreditCardFilter(
+        brand=brand,
+        holder_prefix=holder_prefix,
+        created_after=created_after,
+        created_before=created_before,
+        updated_after=updated_after,
+        updated_before=updated_before,
+        sort=sort,
+    )
@@ -2,21 +2,69 @@
 ## Modulo que cria a ação dos Verbos HTTP.
 Módulo que define ações relacionadas aos Verbos HTTP para manipulação de cartões de crédito.
 Cria um especificação do modulo generico de CRUD.
+
+As views recebem um repositório novo a cada requisição pela dependência
+`get_credit_card_repository`, já com o usuário autenticado, então nenhum estado é
+compartilhado entre requisições concorrentes. A classe é escolhida pela configuração
+`settings.async_database`: `CartRepository` (síncrono) ou `AsyncCartRepository` (assíncrono).
+Em ambos os casos as views chamam o repositório através de `execute`, que nunca bloqueia o event loop.
+
+As leituras por ID passam pelo cache de leituras (`get_record_cache`), configurado por
+`settings.record_cache_backend`, e as escritas mantêm o índice de busca por titular
+(`app.db.search.holder_search_index`). Os totais da listagem (`count`) ficam no cache de totais
+(`get_count_cache`), no mesmo backend, por até `settings.count_cache_ttl` segundos.
+
+Os caches são criados no primeiro uso, a partir das configurações daquele momento, e não ao
+importar o módulo: o launcher (`app.server`) pode desabilitá-los depois de importar o app e
+antes de iniciar os workers, e cada worker do gunicorn (um fork) cria os seus.
 """
 
+import inspect
 import logging
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional, Type
 
+from fastapi import Depends
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
-from app.db.crud import CRUDBase
+from app.auth import check_token
+from app.cache import CacheBackend, build_cache
+from app.config import settings
+from app.db.crud import AsyncCRUDBase, CRUDBase
 from app.db.model import CreditCard
 from app.db.schema import CreditCardSchema, CreditCardSchemaUpdate
+from app.db.search import holder_search_index
 
 logger = logging.getLogger(__name__)
 
 
-class CartRepository(CRUDBase[CreditCard, CreditCardSchema, CreditCardSchemaUpdate]):
+class _CartRules:
+    """Regras de negócio compartilhadas entre os repositórios síncrono e assíncrono."""
+
+    @staticmethod
+    def holder_only(obj_in: CreditCardSchemaUpdate | Dict[str, Any]) -> Dict[str, Any]:
+        """Mantém apenas o nome do titular, único campo que pode ser atualizado."""
+        if isinstance(obj_in, dict):
+            return {"holder": obj_in["holder"]}
+        return {"holder": obj_in.holder}
+
+    @staticmethod
+    def _unique_values(
+        obj_in: CreditCardSchema | Dict[str, Any], value: str
+    ) -> List[str]:
+        """
+        Inclui na checagem de duplicados as impressões digitais com as chaves anteriores.
+
+        Um cartão gravado antes da rotação de `settings.fingerprint_keys` tem outra impressão
+        digital, e seria inserido de novo se apenas a da chave atual fosse consultada.
+        """
+        return [value, *getattr(obj_in, "_previous_numbers", ())]
+
+
+class CartRepository(
+    _CartRules, CRUDBase[CreditCard, CreditCardSchema, CreditCardSchemaUpdate]
+):
     """
     Classe responsável por operações CRUD em relação aos cartões de crédito.
 
@@ -26,15 +74,16 @@ class CartRepository(CRUDBase[CreditCard, CreditCardSchema, CreditCardSchemaUpda
 
     * `get(session: Session, id: int) -> Optional[CreditCard]`: Retorna um cartão de crédito pelo ID.
     * `get_multi(session: Session, *, skip: int = 0, limit: int = 100) -> List[CreditCard]`: Retorna uma lista paginada de cartões de crédito.
+    * `get_page(session: Session, *, after_id: Optional[int] = None, limit: int = 100) -> Tuple[List[CreditCard], Optional[int]]`:
+    Retorna uma página por cursor de cartões de crédito.
+    * `search(session: Session, *, query: str, limit: int = 20) -> List[CreditCard]`: Busca cartões por trecho do titular.
+    * `search_truncated(session: Session, *, query: str) -> bool`: Se a busca ordenou apenas parte das ocorrências.
+    * `count(session: Session, *, filters: Optional[CreditCardFilter] = None) -> int`: Retorna o total de cartões.
     * `create(session: Session, *, obj_in: CreditCardSchema) -> CreditCard`: Cria um novo cartão de crédito.
     * `update(session: Session, *, id: int, obj_in: CreditCardSchemaUpdate) -> CreditCard`: Atualiza um cartão de crédito existente.
     * `remove(session: Session, *, id: int) -> CreditCard`: Remove um cartão de crédito pelo ID.
     """
 
-    def set_username(self, username: str):
-        """Define o nome de usuário do usuário que está realizando a operação."""
-        self.username = username
-
     def update(
         self,
         session: Session,
@@ -47,8 +96,104 @@ class CartRepository(CRUDBase[CreditCard, CreditCardSchema, CreditCardSchemaUpda
         não é permitido atualizar o número do cartão de crédito,
         por isso, a atualização pode ser feita apenas no nome do titular.
         """
-        db_obj = self.convert_any_to_dict(obj_in)
-        return super().update(session, id=id, obj_in={"holder": db_obj["holder"]})
+        return super().update(session, id=id, obj_in=self.holder_only(obj_in))
+
+
+class AsyncCartRepository(
+    _CartRules, AsyncCRUDBase[CreditCard, CreditCardSchema, CreditCardSchemaUpdate]
+):
+    """
+    Versão assíncrona do `CartRepository`, usada quando `settings.async_database` está habilitado.
+
+    Possui os mesmos métodos e regras do `CartRepository`, porém todos devem ser aguardados.
+    """
+
+    async def update(
+        self,
+        session: AsyncSession,
+        *,
+        id: int,
+        obj_in: CreditCardSchemaUpdate | Dict[str, Any]
+    ) -> CreditCard:
+        """Atualiza apenas o nome do titular do cartão de crédito."""
+        return await super().update(session, id=id, obj_in=self.holder_only(obj_in))
+
+
+async def execute(method: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Executa um método do repositório sem bloquear o event loop.
+
+    Métodos assíncronos são aguardados diretamente, enquanto os síncronos
+    são executados no threadpool do Starlette.
+
+    Args:
+        method (Callable): O método do repositório, por exemplo `repository.get`.
+        *args: Argumentos posicionais repassados ao método.
+        **kwargs: Argumentos nomeados repassados ao método.
+
+    Returns:
+        value (Any): O retorno do método do repositório.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(*args, **kwargs)
+    return await run_in_threadpool(method, *args, **kwargs)
+
+
+_caches: Dict[str, Optional[CacheBackend]] = {}
+
+
+def _get_cache(name: str, maxsize: int, ttl: float) -> Optional[CacheBackend]:
+    """Retorna o cache `name` do processo, criando-o no primeiro uso."""
+    if name not in _caches:
+        cache = build_cache(
+            settings.record_cache_backend,
+            maxsize=maxsize,
+            ttl=ttl,
+            url=settings.redis_url,
+        )
+        _caches.setdefault(name, cache)
+    return _caches[name]
+
+
+def get_record_cache() -> Optional[CacheBackend]:
+    """Retorna o cache das leituras por ID, ou None se desabilitado."""
+    return _get_cache("record", settings.record_cache_size, settings.record_cache_ttl)
 
 
-credit_card_repository = CartRepository(CreditCard)
+def get_count_cache() -> Optional[CacheBackend]:
+    """Retorna o cache dos totais da listagem, ou None se desabilitado."""
+    return _get_cache("count", settings.count_cache_size, settings.count_cache_ttl)
+
+
+def reset_caches() -> None:
+    """Descarta os caches do processo, recriados no próximo uso com as configurações atuais."""
+    _caches.clear()
+
+
+repository_class: Type[CartRepository] | Type[AsyncCartRepository] = (
+    AsyncCartRepository if settings.async_database else CartRepository
+)
+
+
+async def get_credit_card_repository(
+    username: str = Depends(check_token),
+) -> CartRepository | AsyncCartRepository:
+    """
+    Dependência que cria o repositório de cartões de crédito da requisição.
+
+    Cada requisição recebe a sua própria instância, com o usuário autenticado definido na
+    criação; apenas os caches de leituras e de totais (thread-safe) são compartilhados entre elas.
+
+    Args:
+        username (str): O nome de usuário obtido a partir do token de autenticação.
+
+    Returns:
+        value (CartRepository | AsyncCartRepository): O repositório da requisição.
+    """
+    return repository_class(
+        CreditCard,
+        cache=get_record_cache(),
+        username=username,
+        search_index=holder_search_index,
+        count_cache=get_count_cache(),
+    )
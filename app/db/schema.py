@@ -1,17 +1,88 @@
 """
 ## Modulo de Schemas, a camada de serialização e validação de dados.
+
+As respostas com registros do banco usam serializadores pré-computados (`row_serializer`):
+os registros lidos do ORM já são válidos, então são convertidos direto em dicionários,
+sem a nova validação pelo `response_model` e sem o `jsonable_encoder` do FastAPI.
 """
 import logging
-from typing import Annotated, Optional
+from operator import attrgetter
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Type,
+)
 
 from creditcard import CreditCard
-from pydantic import BaseModel, Field, root_validator, validator
+from pydantic import BaseModel, Field, PrivateAttr, root_validator, validator
 
-from app.utils import datetime_validator, hashable
+from app.brand import brand_classifier
+from app.db.model import CreditCard as CreditCardModel
+from app.fingerprint import card_fingerprint, previous_card_fingerprints
+from app.timing import timed
+from app.utils import datetime_validator
 
 logger = logging.getLogger(__name__)
 
 
+def card_brand(number: str, card: CreditCard) -> Optional[str]:
+    """
+    Determina a bandeira de um cartão já validado.
+
+    A bandeira vem do classificador de BIN do projeto (`app.brand`); a biblioteca
+    `creditcard` só é consultada para números fora das faixas do arquivo.
+
+    Args:
+        number (str): O número do cartão.
+        card (CreditCard): O cartão da biblioteca `creditcard`, já validado.
+
+    Returns:
+        value (Optional[str]): A bandeira do cartão.
+    """
+    return brand_classifier.classify(number) or card.get_brand()
+
+
+def row_serializer(model: Type[BaseModel]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    Cria um serializador de instâncias do modelo para dicionários.
+
+    Os nomes dos campos e o `attrgetter` são calculados uma única vez; cada chamada apenas lê
+    os atributos da instância, na mesma ordem e com os mesmos nomes do `response_model`.
+
+    Args:
+        model (Type[BaseModel]): O modelo (SQLModel ou pydantic) das instâncias.
+
+    Returns:
+        value (Callable[[Any], Dict[str, Any]]): A função que converte uma instância em dicionário.
+
+    Example:
+        serialize = row_serializer(CreditCardModel)
+        serialize(card)  # {"id": 1, "created_at": datetime(...), ...}
+    """
+    fields = tuple(model.__fields__)
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda row: {fields[0]: getter(row)}
+    return lambda row: dict(zip(fields, getter(row)))
+
+
+_serialize_row = row_serializer(CreditCardModel)
+
+serialize_credit_card = timed("serialization")(_serialize_row)
+
+
+def serialize_credit_cards(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Converte uma lista de cartões de crédito do banco em dicionários."""
+    with timed("serialization"):
+        return [_serialize_row(row) for row in rows]
+
+
 class CreditCardSchemaUpdate(BaseModel):
     """
     Esquema de atualização para informações de cartão de crédito.
@@ -43,6 +114,10 @@ class CreditCardSchemaUpdate(BaseModel):
 
     holder: str
 
+    def __init__(__pydantic_self__, **data: Any) -> None:
+        with timed("validation"):
+            super().__init__(**data)
+
     @validator("holder", pre=True, always=True)
     @classmethod
     def check_holder(cls, value: str) -> str:
@@ -80,6 +155,8 @@ class CreditCardSchema(BaseModel):
     * `exp_date` (str): A data de expiração do cartão (no formato "mm/aaaa").
     * `cvv` (Optional[int]): O código CVV do cartão (opcional).
     * `brand` (Optional[str]): A marca do cartão (atributo oculto).
+    * `_previous_numbers` (List[str]): As impressões digitais do número com as chaves anteriores
+    (`settings.fingerprint_keys`), usadas na checagem de duplicados; vazia sem rotação.
 
     **Métodos Estáticos**
 
@@ -98,6 +175,14 @@ class CreditCardSchema(BaseModel):
     exp_date: str
     cvv: Optional[int] = None
     brand: Optional[Annotated[str, Field(validate_default=True, hidden=True)]] = None
+    _previous_numbers: List[str] = PrivateAttr(default_factory=list)
+
+    def __init__(__pydantic_self__, **data: Any) -> None:
+        with timed("validation"):
+            super().__init__(**data)
+            __pydantic_self__._previous_numbers = previous_card_fingerprints(
+                data["number"]
+            )
 
     @root_validator(pre=True)
     @classmethod
@@ -115,11 +200,13 @@ class CreditCardSchema(BaseModel):
             ValueError: Se o número do cartão for inválido.
         """
         number = values.get("number")
+        if not isinstance(number, str):
+            raise ValueError("Invalid card number")
         cc = CreditCard(number)
         if not cc.is_valid():
             raise ValueError("Invalid card number")
-        values["brand"] = cc.get_brand()
-        values["number"] = hashable(number)
+        values["brand"] = card_brand(number, cc)
+        values["number"] = card_fingerprint(number)
         return values
 
     @validator("exp_date", pre=True, always=True)
@@ -179,3 +266,71 @@ class CreditCardSchema(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class BrandLookup(BaseModel):
+    """
+    Esquema de resposta da consulta de bandeira por BIN.
+
+    **Atributos**
+
+    * `bin` (str): Os dígitos consultados.
+    * `brand` (str): A bandeira correspondente.
+    """
+
+    bin: str
+    brand: str
+
+
+class CreditCardPage(BaseModel):
+    """
+    Esquema de resposta da listagem paginada por cursor.
+
+    **Atributos**
+
+    * `items` (List[CreditCard]): Os cartões de crédito da página.
+    * `next_cursor` (Optional[str]): Cursor opaco da próxima página, ou None se esta for a última.
+    * `total` (Optional[int]): O total de cartões, quando pedido com `with_total`.
+    * `total_pages` (Optional[int]): O total de páginas do tamanho pedido, quando pedido com `with_total`.
+    """
+
+    items: List[CreditCardModel]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
+
+
+class BulkItemResult(BaseModel):
+    """
+    Resultado de um item da criação de cartões de crédito em lote.
+
+    **Atributos**
+
+    * `index` (int): A posição do item no corpo da requisição.
+    * `status` (str): `created`, `conflict` (número já cadastrado) ou `invalid` (falha de validação).
+    * `id` (Optional[int]): O ID do cartão criado, quando `status` for `created`.
+    * `detail` (Optional[Any]): Os erros de validação ou a mensagem de conflito.
+    """
+
+    index: int
+    status: Literal["created", "conflict", "invalid"]
+    id: Optional[int] = None
+    detail: Optional[Any] = None
+
+
+class BulkCreateResult(BaseModel):
+    """
+    Esquema de resposta da criação de cartões de crédito em lote.
+
+    **Atributos**
+
+    * `created` (int): Quantidade de cartões criados.
+    * `conflicts` (int): Quantidade de cartões com número já cadastrado.
+    * `invalid` (int): Quantidade de itens que falharam na validação.
+    * `items` (List[BulkItemResult]): O resultado de cada item, na ordem do corpo da requisição.
+    """
+
+    created: int
+    conflicts: int
+    invalid: int
+    items: List[BulkItemResult]
@@ -0,0 +1,206 @@
+"""
+## Módulo de Busca Textual.
+Índice de busca por trecho do nome do titular, que o índice B-tree de `CreditCard.holder` não
+atende (`LIKE '%nome%'` percorreria a tabela inteira).
+
+O índice depende do banco:
+
+- SQLite: tabela virtual FTS5 com o tokenizador `trigram` (`creditcard_fts`), cujo `rowid` é o
+ID do cartão. Ela é mantida pelo `CRUDBase` na mesma transação de `create`, `create_many`,
+`update` e `remove`.
+- PostgreSQL: índice GIN com `gin_trgm_ops` (extensão `pg_trgm`) sobre a própria coluna,
+mantido pelo banco; os resultados são ordenados pela `similarity`.
+- Outros bancos: `LIKE` sem índice, ordenado pelo ID.
+
+Relevância no SQLite: os `SEARCH_CANDIDATES` registros mais recentes que contêm o trecho são
+lidos na ordem do `rowid`, que o FTS5 percorre sem ler a lista completa de ocorrências, e então
+ordenados pela posição do trecho no nome (início primeiro) e pelo tamanho do nome (o trecho
+cobre uma parte maior dos nomes curtos). O `bm25` do FTS5 foi descartado: ele conta todas as
+ocorrências de cada trigrama, e um sobrenome comum em milhões de registros levava centenas de
+milissegundos, contra cerca de 1 ms desta ordenação.
+
+O limite de candidatos pode deixar de fora registros relevantes mais antigos quando o trecho
+aparece em mais de `SEARCH_CANDIDATES` nomes. `truncated_statement` verifica se há uma ocorrência
+além do limite, lendo um único `rowid` a mais no FTS5, e a rota de busca informa o resultado ao
+cliente no cabeçalho `X-Search-Truncated`, para que ele refine o trecho. No PostgreSQL e nos
+outros bancos todas as ocorrências são ordenadas, sem limite de candidatos.
+
+O índice é criado junto com as tabelas (`SQLModel.metadata.create_all`); no SQLite, os
+registros já existentes são copiados para a tabela FTS5 quando ela é criada.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Table, column, delete, event, func, insert, literal_column, table
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Delete, Insert, Select
+from sqlmodel import SQLModel, select
+
+from app.db.model import CreditCard
+
+logger = logging.getLogger(__name__)
+
+MIN_QUERY_LENGTH = 3
+
+SEARCH_CANDIDATES = 500
+
+
+def fts_phrase(query: str) -> str:
+    """Monta uma frase FTS5 entre aspas, que o tokenizador `trigram` busca como trecho do texto."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+class TrigramSearchIndex:
+    """
+    Índice de busca por trecho de uma coluna de texto.
+
+    **Atributos**
+
+    * `source` (Table): A tabela indexada.
+    * `column` (str): O nome da coluna indexada.
+    * `name` (str): O nome da tabela FTS5 (SQLite) ou do índice GIN (PostgreSQL).
+
+    **Métodos**
+
+    * `maintained(dialect: str) -> bool`: Se o índice precisa ser atualizado pela aplicação.
+    * `delete_statement(ids: Sequence[int]) -> Delete`: Remove as linhas dos IDs do índice.
+    * `insert_statement() -> Insert`: Insere linhas `{"rowid": id, column: texto}` no índice.
+    * `search_statement(model, query, limit, dialect) -> Select`: A busca ordenada por relevância.
+    * `truncated_statement(query, dialect) -> Optional[Select]`: Se há ocorrências além dos
+    candidatos ordenados.
+    * `create(connection: Connection) -> None`: Cria o índice, se ainda não existir.
+
+    Example:
+        index = TrigramSearchIndex(CreditCard.__table__, "holder")
+        statement = index.search_statement(CreditCard, "silva", 20, "sqlite")
+    """
+
+    def __init__(self, source: Table, column_name: str):
+        self.source = source
+        self.column = column_name
+        self.name = f"{source.name}_fts"
+        self._fts = table(self.name, column("rowid"), column(column_name))
+
+    @staticmethod
+    def maintained(dialect: str) -> bool:
+        """Indica se o índice é uma tabela separada, atualizada pela aplicação (apenas SQLite)."""
+        return dialect == "sqlite"
+
+    def delete_statement(self, ids: Sequence[int]) -> Delete:
+        """Monta a remoção das linhas dos IDs informados da tabela FTS5."""
+        return delete(self._fts).where(self._fts.c.rowid.in_(list(ids)))
+
+    def insert_statement(self) -> Insert:
+        """Monta a inserção na tabela FTS5, executada com uma lista de `{"rowid", coluna}`."""
+        return insert(self._fts)
+
+    def rows(self, pairs: Sequence[Tuple[int, Any]]) -> List[Dict[str, Any]]:
+        """Converte pares `(id, texto)` nos parâmetros de `insert_statement`."""
+        return [{"rowid": obj_id, self.column: value} for obj_id, value in pairs]
+
+    def search_statement(
+        self, model: Any, query: str, limit: int, dialect: str
+    ) -> Select:
+        """
+        Monta a busca pelos registros cujo texto contém `query`, do mais ao menos relevante.
+
+        Args:
+            model (Any): O modelo SQLModel da tabela indexada.
+            query (str): O trecho buscado, com pelo menos `MIN_QUERY_LENGTH` caracteres no SQLite.
+            limit (int): O número máximo de registros.
+            dialect (str): O nome do dialeto do banco (`sqlite`, `postgresql`, ...).
+
+        Returns:
+            value (Select): A consulta dos registros do modelo.
+        """
+        target = getattr(model, self.column)
+        if dialect == "sqlite":
+            candidates = self._matches(query).limit(SEARCH_CANDIDATES).subquery()
+            position = func.instr(func.lower(target), query.lower())
+            statement = (
+                select(model)
+                .join(candidates, candidates.c.id == model.id)
+                .order_by(position == 0, position, func.length(target), model.id.desc())
+            )
+        elif dialect == "postgresql":
+            statement = select(model).where(
+                target.ilike(f"%{_escape_like(query)}%", escape="\\")
+            )
+            statement = statement.order_by(
+                func.similarity(target, query).desc(), model.id
+            )
+        else:
+            statement = select(model).where(target.contains(query, autoescape=True))
+            statement = statement.order_by(model.id)
+        return statement.limit(limit)
+
+    def truncated_statement(self, query: str, dialect: str) -> Optional[Select]:
+        """
+        Monta a verificação de ocorrências de `query` além dos `SEARCH_CANDIDATES` ordenados.
+
+        Args:
+            query (str): O trecho buscado.
+            dialect (str): O nome do dialeto do banco (`sqlite`, `postgresql`, ...).
+
+        Returns:
+            value (Optional[Select]): A consulta do primeiro `rowid` fora dos candidatos, que não
+            retorna linhas quando a busca ordenou todas as ocorrências; None nos bancos em que a
+            busca não limita os candidatos.
+        """
+        if dialect != "sqlite":
+            return None
+        return self._matches(query).offset(SEARCH_CANDIDATES).limit(1)
+
+    def _matches(self, query: str) -> Select:
+        """Monta a leitura dos IDs que contêm `query` no FTS5, do mais ao menos recente."""
+        return (
+            select(self._fts.c.rowid.label("id"))
+            .where(literal_column(self.name).match(fts_phrase(query)))
+            .order_by(self._fts.c.rowid.desc())
+        )
+
+    def create(self, connection: Connection) -> None:
+        """
+        Cria o índice, se ainda não existir.
+
+        No SQLite, a tabela FTS5 recém-criada recebe os registros já existentes.
+
+        Args:
+            connection (Connection): A conexão usada pelo `create_all`.
+        """
+        dialect = connection.dialect.name
+        if dialect == "sqlite":
+            exists = connection.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (self.name,),
+            ).first()
+            if exists:
+                return
+            connection.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {self.name} USING fts5({self.column}, tokenize='trigram')"
+            )
+            connection.exec_driver_sql(
+                f"INSERT INTO {self.name} (rowid, {self.column}) "
+                f"SELECT id, {self.column} FROM {self.source.name}"
+            )
+            logger.info("search index %s created", self.name)
+        elif dialect == "postgresql":
+            connection.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            connection.exec_driver_sql(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.source.name}_{self.column}_trgm "
+                f"ON {self.source.name} USING gin ({self.column} gin_trgm_ops)"
+            )
+
+
+def _escape_like(value: str) -> str:
+    """Escapa os curingas do `LIKE` para buscar o texto literalmente."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+holder_search_index = TrigramSearchIndex(CreditCard.__table__, "holder")
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def create_search_indexes(target: Any, connection: Connection, **kw: Any) -> None:
+    """Cria os índices de busca depois das tabelas, em cada `SQLModel.metadata.create_all`."""
+    holder_search_index.create(connection)
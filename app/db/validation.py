@@ -0,0 +1,245 @@
+"""
+## Módulo de Validação em Lote.
+Valida muitos registros de cartão de crédito de uma vez, para as cargas em lote.
+
+O resultado é o mesmo do `CreditCardSchema` registro a registro (mesmos valores e mesmos
+erros, na mesma ordem), porém o trabalho é feito por coluna e não por registro:
+
+- Luhn calculado sobre todos os números de uma vez, com NumPy quando instalado
+(extra `validation`); números reprovados não chegam à biblioteca `creditcard`.
+- A validação da biblioteca `creditcard` e a bandeira (`card_brand`) são obtidas apenas uma vez
+por número distinto aprovado no Luhn.
+- A data de expiração é validada uma vez por valor distinto, já que lotes costumam repetir poucas datas.
+- CVV e titular são checados diretamente, sem instanciar o modelo pydantic.
+- As impressões digitais dos números aceitos são calculadas em lote (`Fingerprinter.fingerprints`).
+
+Registros com formato fora do comum (campos ausentes, tipos inesperados ou números com
+separadores) são validados pelo próprio `CreditCardSchema`, garantindo o mesmo resultado.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from creditcard import CreditCard
+from pydantic import ValidationError
+
+from app.db.schema import BulkItemResult, CreditCardSchema, card_brand
+from app.fingerprint import fingerprinter
+from app.timing import timed
+from app.utils import datetime_validator
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende do ambiente
+    np = None
+
+logger = logging.getLogger(__name__)
+
+NUMPY_MIN_BATCH = 32
+
+_FIELDS = set(CreditCardSchema.__fields__)
+
+
+def _luhn(number: str) -> bool:
+    """Calcula o dígito verificador de Luhn de um número com apenas dígitos ASCII."""
+    total = 0
+    for position, char in enumerate(reversed(number)):
+        digit = ord(char) - 48
+        if position % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def luhn_valid(numbers: Sequence[str]) -> List[bool]:
+    """
+    Aplica o algoritmo de Luhn a um lote de números.
+
+    Com NumPy instalado e lotes de pelo menos `NUMPY_MIN_BATCH` números, os números de mesmo
+    tamanho são convertidos em uma matriz de dígitos e somados de uma vez; caso contrário, o
+    cálculo é feito em Python puro.
+
+    Args:
+        numbers (Sequence[str]): Os números, contendo apenas dígitos ASCII.
+
+    Returns:
+        value (List[bool]): Se cada número é válido no Luhn, na mesma ordem.
+
+    Example:
+        luhn_valid(["4539578763621486", "1111111111111112"])  # [True, False]
+    """
+    if np is None or len(numbers) < NUMPY_MIN_BATCH:
+        return [_luhn(number) for number in numbers]
+
+    result = [False] * len(numbers)
+    by_length: Dict[int, List[int]] = {}
+    for index, number in enumerate(numbers):
+        by_length.setdefault(len(number), []).append(index)
+
+    for length, indexes in by_length.items():
+        raw = "".join(numbers[index] for index in indexes).encode("ascii")
+        digits = np.frombuffer(raw, dtype=np.uint8).reshape(len(indexes), length)
+        reversed_digits = digits[:, ::-1].astype(np.int16) - 48
+        doubled = reversed_digits[:, 1::2] * 2
+        doubled -= 9 * (doubled > 9)
+        totals = reversed_digits[:, 0::2].sum(axis=1) + doubled.sum(axis=1)
+        for index, valid in zip(indexes, (totals % 10 == 0).tolist()):
+            result[index] = valid
+    return result
+
+
+def _is_fast_path(record: Any) -> bool:
+    """Indica se o registro tem o formato comum, validado pelo caminho em lote."""
+    if not isinstance(record, dict):
+        return False
+    holder, number, exp_date = (
+        record.get("holder"),
+        record.get("number"),
+        record.get("exp_date"),
+    )
+    cvv = record.get("cvv")
+    return (
+        isinstance(holder, str)
+        and isinstance(exp_date, str)
+        and isinstance(number, str)
+        and number.isascii()
+        and number.isdigit()
+        and (cvv is None or (isinstance(cvv, int) and not isinstance(cvv, bool)))
+    )
+
+
+def _error(loc: str, msg: str) -> Dict[str, Any]:
+    """Monta um erro no mesmo formato de `ValidationError.errors()`."""
+    return {"loc": (loc,), "msg": msg, "type": "value_error"}
+
+
+class _ExpiryCache:
+    """Valida cada data de expiração distinta uma única vez dentro do lote."""
+
+    def __init__(self):
+        self._results: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+
+    def __call__(self, value: str) -> Tuple[Optional[str], Optional[str]]:
+        """Retorna a data validada ou a mensagem de erro do `datetime_validator`."""
+        result = self._results.get(value)
+        if result is None:
+            try:
+                result = (datetime_validator(value), None)
+            except ValueError as e:
+                result = (None, str(e))
+            self._results[value] = result
+        return result
+
+
+def _brands(numbers: Sequence[str]) -> Dict[str, Tuple[bool, Optional[str]]]:
+    """Consulta a biblioteca `creditcard` uma única vez por número distinto."""
+    brands: Dict[str, Tuple[bool, Optional[str]]] = {}
+    for number in numbers:
+        if number not in brands:
+            card = CreditCard(number)
+            valid = card.is_valid()
+            brands[number] = (valid, card_brand(number, card) if valid else None)
+    return brands
+
+
+@timed("validation")
+def validate_credit_cards_batch(
+    records: List[Any],
+) -> Tuple[List[Tuple[int, CreditCardSchema]], List[BulkItemResult]]:
+    """
+    Valida uma lista de registros brutos de uma vez, com o mesmo resultado do `CreditCardSchema`.
+
+    Args:
+        records (List[Any]): Os registros recebidos, por exemplo de `parse_json_records`.
+
+    Returns:
+        value (Tuple[List[Tuple[int, CreditCardSchema]], List[BulkItemResult]]): Os registros válidos
+        junto com sua posição original, e o resultado `invalid` de cada registro rejeitado.
+
+    Example:
+        valid, invalid = validate_credit_cards_batch(
+            [{"holder": "Fulano", "number": "4539578763621486", "exp_date": "01/2030"}]
+        )
+    """
+    valid: List[Tuple[int, CreditCardSchema]] = []
+    invalid: List[BulkItemResult] = []
+
+    fast = [index for index, record in enumerate(records) if _is_fast_path(record)]
+    fast_set = set(fast)
+    for index, record in enumerate(records):
+        if index not in fast_set:
+            _validate_with_schema(index, record, valid, invalid)
+
+    numbers = [records[index]["number"] for index in fast]
+    luhn = luhn_valid(numbers)
+    brands = _brands([number for number, ok in zip(numbers, luhn) if ok])
+    expiry = _ExpiryCache()
+    accepted: List[Tuple[int, str, Set[str], str, str, Optional[int], Any]] = []
+
+    for index, number, luhn_ok in zip(fast, numbers, luhn):
+        record = records[index]
+        card_valid, brand = (
+            brands.get(number, (False, None)) if luhn_ok else (False, None)
+        )
+        if not card_valid:
+            invalid.append(
+                BulkItemResult(
+                    index=index,
+                    status="invalid",
+                    detail=[_error("__root__", "Invalid card number")],
+                )
+            )
+            continue
+
+        errors = []
+        holder = record["holder"]
+        if len(holder) <= 2:
+            errors.append(_error("holder", "Invalid holder, very short statement"))
+
+        exp_date, exp_error = expiry(record["exp_date"])
+        if exp_error is not None:
+            errors.append(_error("exp_date", exp_error))
+
+        cvv = record.get("cvv") or None
+        if cvv is not None and not 3 <= len(str(cvv)) <= 4:
+            errors.append(_error("cvv", "Invalid cvv"))
+
+        if errors:
+            invalid.append(BulkItemResult(index=index, status="invalid", detail=errors))
+            continue
+
+        fields_set = {key for key in record if key in _FIELDS} | {"brand"}
+        accepted.append((index, number, fields_set, holder, exp_date, cvv, brand))
+
+    digests = fingerprinter.fingerprints([item[1] for item in accepted])
+    for (index, number, fields_set, holder, exp_date, cvv, brand), digest in zip(
+        accepted, digests
+    ):
+        schema = CreditCardSchema.construct(
+            fields_set,
+            holder=holder,
+            number=digest,
+            exp_date=exp_date,
+            cvv=cvv,
+            brand=brand,
+        )
+        schema._previous_numbers = fingerprinter.previous(number)
+        valid.append((index, schema))
+
+    valid.sort(key=lambda item: item[0])
+    invalid.sort(key=lambda item: item.index)
+    return valid, invalid
+
+
+def _validate_with_schema(
+    index: int,
+    record: Any,
+    valid: List[Tuple[int, CreditCardSchema]],
+    invalid: List[BulkItemResult],
+) -> None:
+    """Valida um registro fora do formato comum com o próprio `CreditCardSchema`."""
+    try:
+        valid.append((index, CreditCardSchema.parse_obj(record)))
+    except ValidationError as e:
+        invalid.append(BulkItemResult(index=index, status="invalid", detail=e.errors()))
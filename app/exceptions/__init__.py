@@ -10,6 +10,8 @@ from .crud_error import (  # isort:skip
     CRUDUpdateError,  # isort:skip
 )  # isort:skip
 from .http_error_schema import HTTPError
+from .payload_error import InvalidPayloadError, PayloadTooLargeError
+from .query_error import InvalidCursorError, InvalidFieldsError, UnknownBrandError
 
 __all__ = [
     "CRUDCreateError",
@@ -17,4 +19,9 @@ __all__ = [
     "CRUDDeleteError",
     "CRUDSelectError",
     "HTTPError",
+    "InvalidCursorError",
+    "InvalidFieldsError",
+    "InvalidPayloadError",
+    "PayloadTooLargeError",
+    "UnknownBrandError",
 ]
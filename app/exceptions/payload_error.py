@@ -0,0 +1,60 @@
+"""
+## Modulo que cria as exceções de erro de payload
+Módulo que define exceções personalizadas para corpos de requisição inválidos.
+"""
+
+import logging
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPayloadError(HTTPException):
+    """
+    Exceção personalizada para corpos de requisição que não puderam ser lidos.
+
+    Esta classe herda da classe HTTPException do módulo FastAPI e é usada para indicar que o
+    corpo enviado não está no formato esperado (por exemplo, um JSON que não é um array).
+
+    Atributos:
+        username (str): O nome de usuário relacionado ao erro.
+        reason (str): O motivo pelo qual o corpo foi rejeitado.
+
+    Exemplo:
+        Para lançar esta exceção em seu código, você pode fazer o seguinte:
+
+        raise InvalidPayloadError(username="john_doe", reason="Expecting value")
+    """
+
+    def __init__(self, username, *, reason) -> None:
+        super().__init__(
+            422,
+            f"Invalid request body, Reason<{reason}>",
+            headers={"X-Username-Error": username},
+        )
+
+
+class PayloadTooLargeError(HTTPException):
+    """
+    Exceção personalizada para lotes com mais itens que o permitido.
+
+    Esta classe herda da classe HTTPException do módulo FastAPI e é usada para indicar que o
+    lote enviado excede o limite configurado em `settings.bulk_max_items`.
+
+    Atributos:
+        username (str): O nome de usuário relacionado ao erro.
+        limit (int): A quantidade máxima de itens permitida.
+
+    Exemplo:
+        Para lançar esta exceção em seu código, você pode fazer o seguinte:
+
+        raise PayloadTooLargeError(username="john_doe", limit=10000)
+    """
+
+    def __init__(self, username, *, limit) -> None:
+        super().__init__(
+            413,
+            f"Too many items in a single request, Limit<{limit}>",
+            headers={"X-Username-Error": username},
+        )
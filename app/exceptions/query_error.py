@@ -0,0 +1,85 @@
+"""
+## Modulo que cria as exceções de erro de consulta
+Módulo que define exceções personalizadas para parâmetros de consulta inválidos.
+"""
+
+import logging
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursorError(HTTPException):
+    """
+    Exceção personalizada para cursores de paginação inválidos.
+
+    Esta classe herda da classe HTTPException do módulo FastAPI e é usada para indicar que o
+    cursor informado pelo cliente não foi gerado pela API ou está corrompido.
+
+    Atributos:
+        username (str): O nome de usuário relacionado ao erro.
+        cursor (str): O cursor recebido.
+
+    Exemplo:
+        Para lançar esta exceção em seu código, você pode fazer o seguinte:
+
+        raise InvalidCursorError(username="john_doe", cursor="abc")
+    """
+
+    def __init__(self, username, *, cursor) -> None:
+        super().__init__(
+            400,
+            f"Invalid pagination cursor, Cursor<{cursor}>",
+            headers={"X-Username-Error": username},
+        )
+
+
+class UnknownBrandError(HTTPException):
+    """
+    Exceção personalizada para BINs que não pertencem a nenhuma bandeira conhecida.
+
+    Esta classe herda da classe HTTPException do módulo FastAPI e é usada para indicar que os
+    dígitos informados não correspondem a nenhuma faixa do arquivo de bandeiras.
+
+    Atributos:
+        username (str): O nome de usuário relacionado ao erro.
+        bin (str): Os dígitos consultados.
+
+    Exemplo:
+        Para lançar esta exceção em seu código, você pode fazer o seguinte:
+
+        raise UnknownBrandError(username="john_doe", bin="999999")
+    """
+
+    def __init__(self, username, *, bin) -> None:
+        super().__init__(
+            404,
+            f"Brand not found, BIN<{bin}>",
+            headers={"X-Username-Error": username},
+        )
+
+
+class InvalidFieldsError(HTTPException):
+    """
+    Exceção personalizada para campos de projeção inexistentes.
+
+    Esta classe herda da classe HTTPException do módulo FastAPI e é usada para indicar que o
+    parâmetro `fields` pediu campos que não existem no modelo.
+
+    Atributos:
+        username (str): O nome de usuário relacionado ao erro.
+        fields (Iterable[str]): Os campos inexistentes.
+
+    Exemplo:
+        Para lançar esta exceção em seu código, você pode fazer o seguinte:
+
+        raise InvalidFieldsError(username="john_doe", fields=["cpf"])
+    """
+
+    def __init__(self, username, *, fields) -> None:
+        super().__init__(
+            400,
+            f"Invalid fields, Fields<{','.join(fields)}>",
+            headers={"X-Username-Error": username},
+        )
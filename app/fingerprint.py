@@ -0,0 +1,141 @@
+"""
+## Módulo de Impressão Digital (Fingerprint) de Cartões.
+O número do cartão nunca é armazenado; a coluna única `CreditCard.number` guarda a
+impressão digital de 32 bytes calculada aqui (apresentada como 64 caracteres hexadecimais).
+
+Algoritmos disponíveis, pela configuração `settings.fingerprint_algorithm`:
+
+- `sha256`: SHA-256 sem chave, compatível com os registros gravados pelo `app.utils.hashable`.
+- `hmac-sha256`: HMAC-SHA256 com chave, impede que um vazamento do banco seja revertido
+por força bruta sobre os poucos números de cartão possíveis.
+- `blake2b`: BLAKE2b com chave e digest de 32 bytes, mais rápido que o HMAC.
+
+Rotação de chaves: `settings.fingerprint_keys` é uma lista de chaves hexadecimais separadas
+por vírgula; a primeira é usada nas gravações e as demais continuam aceitas nas consultas
+(`card_fingerprints`) e na checagem de duplicados da criação (`previous_card_fingerprints`), para
+encontrar registros gravados antes da rotação.
+
+O cálculo em lote (`Fingerprinter.fingerprints`) reaproveita o estado inicial do hash já com a
+chave (`copy()`), evitando refazer a derivação da chave a cada número. Não há ganho em usar
+threads: o `hashlib` só libera o GIL para entradas acima de 2 KiB, e um número de cartão tem
+no máximo 19 bytes.
+"""
+import hashlib
+import hmac
+import logging
+from typing import Any, Callable, List, Optional, Sequence
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = ("sha256", "hmac-sha256", "blake2b")
+
+DIGEST_SIZE = 32
+
+
+def _hasher_factory(algorithm: str, key: Optional[bytes]) -> Callable[[], Any]:
+    """Retorna uma função que cria o hash inicial do algoritmo, já com a chave aplicada."""
+    if algorithm == "sha256":
+        base = hashlib.sha256()
+    elif algorithm == "hmac-sha256":
+        base = hmac.new(key or b"", digestmod=hashlib.sha256)
+    elif algorithm == "blake2b":
+        base = hashlib.blake2b(key=key or b"", digest_size=DIGEST_SIZE)
+    else:
+        raise ValueError(f"Unknown fingerprint algorithm: {algorithm}")
+    return base.copy
+
+
+class Fingerprinter:
+    """
+    Calcula a impressão digital de números de cartão com o algoritmo e as chaves configurados.
+
+    **Atributos**
+
+    * `algorithm` (str): `sha256`, `hmac-sha256` ou `blake2b`.
+    * `keys` (List[bytes]): As chaves, a primeira é a atual; vazia para `sha256`.
+
+    **Métodos**
+
+    * `fingerprint(number: str) -> str`: A impressão digital com a chave atual, em hexadecimal.
+    * `fingerprints(numbers: Sequence[str]) -> List[str]`: O mesmo, para um lote de números.
+    * `candidates(number: str) -> List[str]`: A impressão digital com cada chave aceita.
+    * `previous(number: str) -> List[str]`: A impressão digital com cada chave anterior.
+
+    Example:
+        fingerprinter = Fingerprinter("blake2b", [bytes.fromhex("00" * 32)])
+        fingerprinter.fingerprint("4539578763621486")  # 64 caracteres hexadecimais
+    """
+
+    def __init__(self, algorithm: str = "sha256", keys: Sequence[bytes] = ()):
+        if algorithm != "sha256" and not keys:
+            raise ValueError(f"Fingerprint algorithm {algorithm} requires a key")
+        self.algorithm = algorithm
+        self.keys = list(keys) if algorithm != "sha256" else []
+        key_list: List[Optional[bytes]] = list(self.keys) or [None]
+        self._factories = [_hasher_factory(algorithm, key) for key in key_list]
+
+    @staticmethod
+    def _digest(factory: Callable[[], Any], number: str) -> str:
+        hasher = factory()
+        hasher.update(number.encode())
+        return hasher.hexdigest()
+
+    def fingerprint(self, number: str) -> str:
+        """Retorna a impressão digital do número com a chave atual, em hexadecimal."""
+        return self._digest(self._factories[0], number)
+
+    def fingerprints(self, numbers: Sequence[str]) -> List[str]:
+        """Retorna a impressão digital de cada número com a chave atual, na mesma ordem."""
+        factory = self._factories[0]
+        return [self._digest(factory, number) for number in numbers]
+
+    def candidates(self, number: str) -> List[str]:
+        """Retorna a impressão digital do número com cada chave aceita, a atual primeiro."""
+        return [self._digest(factory, number) for factory in self._factories]
+
+    def previous(self, number: str) -> List[str]:
+        """Retorna a impressão digital do número com cada chave anterior, vazia sem rotação."""
+        return [self._digest(factory, number) for factory in self._factories[1:]]
+
+
+def parse_keys(value: str) -> List[bytes]:
+    """
+    Converte a configuração de chaves (hexadecimais separadas por vírgula) em bytes.
+
+    Raises:
+        ValueError: Se alguma chave não for hexadecimal.
+    """
+    return [bytes.fromhex(key.strip()) for key in value.split(",") if key.strip()]
+
+
+fingerprinter = Fingerprinter(
+    settings.fingerprint_algorithm.lower(), parse_keys(settings.fingerprint_keys)
+)
+
+
+def card_fingerprint(number: str) -> str:
+    """
+    Gera a impressão digital com que o número do cartão é armazenado e consultado.
+
+    Tanto o schema de criação quanto a consulta de existência usam esta função, garantindo
+    que o mesmo número sempre produza o mesmo valor.
+
+    Args:
+        number (str): O número do cartão.
+
+    Returns:
+        value (str): A impressão digital do número, com a chave atual, em hexadecimal.
+    """
+    return fingerprinter.fingerprint(number)
+
+
+def card_fingerprints(number: str) -> List[str]:
+    """Retorna a impressão digital do número com a chave atual e com as chaves anteriores."""
+    return fingerprinter.candidates(number)
+
+
+def previous_card_fingerprints(number: str) -> List[str]:
+    """Retorna a impressão digital do número apenas com as chaves anteriores."""
+    return fingerprinter.previous(number)
@@ -0,0 +1,273 @@
+"""
+## Módulo de Log.
+Configura o log do serviço a partir de `logging.conf` e das configurações:
+
+- `log_queue`: os handlers do logger raiz passam a ser executados por um `QueueListener`, em
+uma thread própria; os loggers apenas colocam os registros em uma fila (`QueueHandler`), e o
+event loop nunca espera a escrita no stdout. A mensagem é montada (`%`) por quem registra, e
+a formatação final e a escrita ficam com a thread.
+- `log_format`: `text` mantém os formatos de `logging.conf`; `json` escreve um objeto JSON por
+linha, com o id da requisição e os campos passados em `extra` (por exemplo, `timings`).
+- `log_debug_sample_rate`: fração dos registros `DEBUG` mantida, por ponto de chamada; os
+registros de nível `INFO` ou acima nunca são descartados.
+- `log_level`: o nível do logger raiz.
+- `db_echo`: as instruções SQL são registradas pelo logger `sqlalchemy.engine`, passando pela
+fila, em vez do handler próprio que o `echo` do SQLAlchemy adiciona ao stdout.
+
+Cada requisição recebe um id, lido do cabeçalho `X-Request-ID` (se válido) ou gerado, devolvido
+no mesmo cabeçalho da resposta e guardado em uma `ContextVar`; todos os registros criados durante
+a requisição têm o atributo `request_id`.
+
+Convenção: as mensagens usam a formatação preguiçosa do `logging`, com os valores como
+argumentos (`logger.info("brand table loaded from %s", path)`), e não f-strings; a mensagem só é
+montada se o registro for emitido, e registros da mesma mensagem podem ser agrupados pelo texto
+fixo no log JSON.
+"""
+import atexit
+import copy
+import logging
+import logging.config
+import os
+import queue
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LOG_CONFIG = "logging.conf"
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+NO_REQUEST_ID = "-"
+
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+_RECORD_ATTRIBUTES = set(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "request_id"}
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> Optional[str]:
+    """Retorna o id da requisição em andamento, ou None fora de uma requisição."""
+    return _request_id.get()
+
+
+_base_record_factory = logging.getLogRecordFactory()
+
+
+def _record_factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+    """Cria o registro com o atributo `request_id` da requisição em andamento."""
+    record = _base_record_factory(*args, **kwargs)
+    record.request_id = _request_id.get() or NO_REQUEST_ID
+    return record
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formata cada registro como um objeto JSON em uma única linha.
+
+    Os campos são `time` (ISO 8601, UTC), `level`, `logger`, `message`, `request_id`,
+    `function`, `line`, os atributos passados em `extra` e, se houver, `exc_info`.
+
+    Example:
+        handler.setFormatter(JsonFormatter())
+        logger.warning("slow request", extra={"timings": {"db_queries": 42}})
+        # {"time": "...", "level": "WARNING", ..., "timings": {"db_queries": 42}}
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        record.message = record.getMessage()
+        request_id = getattr(record, "request_id", NO_REQUEST_ID)
+        payload: Dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.message,
+            "request_id": None if request_id == NO_REQUEST_ID else request_id,
+            "function": record.funcName,
+            "line": record.lineno,
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(
+            payload, default=str, option=orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+
+class DebugSampler(logging.Filter):
+    """
+    Mantém uma fração dos registros `DEBUG` de cada ponto de chamada (arquivo e linha).
+
+    O primeiro registro de cada ponto é sempre mantido e, depois dele, um a cada
+    `round(1 / rate)`; registros de nível `INFO` ou acima passam sempre.
+
+    Args:
+        rate (float): A fração mantida, entre 0 (descarta todos) e 1 (mantém todos).
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = round(1 / rate) if rate > 0 else 0
+        self._counts: Dict[Tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        if self.every == 0:
+            return False
+        key = (record.pathname, record.lineno)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.every == 0
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    `QueueHandler` que monta apenas a mensagem e o traceback antes de enfileirar.
+
+    O `QueueHandler` padrão aplica o formatter em quem registra; aqui a formatação (texto
+    ou JSON) fica com os handlers do `QueueListener`, que recebem o registro com `msg`
+    já montada e os atributos de `extra` preservados.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener(log_queue: Any, *handlers: logging.Handler) -> None:
+    global _listener
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_listener_after_fork() -> None:
+    """Recria a thread do listener no processo filho, que herda a fila mas não a thread."""
+    if _listener is not None:
+        _start_listener(_listener.queue, *_listener.handlers)
+
+
+def stop_logging() -> None:
+    """Escreve os registros ainda na fila e encerra a thread do listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def configure_logging(config_file: str = LOG_CONFIG) -> None:
+    """
+    Configura o log a partir do arquivo e das configurações (`log_*` e `db_echo`).
+
+    Pode ser chamada novamente; o listener anterior é encerrado antes da nova configuração.
+
+    Args:
+        config_file (str, optional): O arquivo no formato do `logging.config.fileConfig`.
+    """
+    stop_logging()
+    logging.config.fileConfig(config_file, disable_existing_loggers=False)
+    logging.setLogRecordFactory(_record_factory)
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+    if settings.db_echo:
+        logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+    handlers = list(root.handlers)
+    if settings.log_format.lower() == "json":
+        formatter = JsonFormatter()
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+    sampler = None
+    if settings.log_debug_sample_rate < 1:
+        sampler = DebugSampler(settings.log_debug_sample_rate)
+
+    if settings.log_queue:
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        queue_handler = LogQueueHandler(log_queue)
+        if sampler is not None:
+            queue_handler.addFilter(sampler)
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        _start_listener(log_queue, *handlers)
+    elif sampler is not None:
+        for handler in handlers:
+            handler.addFilter(sampler)
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que define o id de cada requisição e o devolve em `X-Request-ID`.
+
+    Um `X-Request-ID` recebido é reaproveitado se tiver até 128 letras, dígitos ou `._:-`;
+    caso contrário, um id novo é gerado.
+
+    Example:
+        app.add_middleware(RequestIdMiddleware)
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    @staticmethod
+    def _incoming(scope: Dict[str, Any]) -> Optional[str]:
+        """Retorna o `X-Request-ID` recebido, se válido."""
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                if _VALID_REQUEST_ID.fullmatch(request_id):
+                    return request_id
+                return None
+        return None
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming(scope) or uuid.uuid4().hex
+        token = _request_id.set(request_id)
+
+        async def send_with_request_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
@@ -0,0 +1,312 @@
+"""
+## Módulo de Métricas.
+Métricas no formato do Prometheus, expostas em `GET /metrics`. Requer o extra `metrics`
+(`prometheus-client`) e `settings.metrics_enabled`; sem a biblioteca, o serviço funciona
+normalmente, apenas sem a rota e o middleware.
+
+Métricas:
+
+- `http_request_duration_seconds{method, route, status}`: histograma da latência, por rota
+(o caminho com parâmetros, por exemplo `/api/v1/credit-card/{id}`) e por status; o
+`_count` do histograma é a vazão. Requisições que não chegam a uma rota usam `<unmatched>`.
+- `http_requests_in_progress{method}`: requisições em andamento.
+- `db_pool_checkout_seconds{engine}`: espera por uma conexão livre no pool (`sync`/`async`).
+- `db_pool_connections{engine, state}`: conexões `checked_out`, `idle` e `overflow` do pool.
+- `app_cache_requests_total{cache, result}`: leituras `hit`/`miss` dos caches `token`,
+`record` e `count`; a taxa de acerto é `hit / (hit + miss)` na consulta do Prometheus.
+
+O middleware é ASGI puro e guarda os filhos de cada combinação de labels, evitando o
+`labels()` a cada requisição. Os contadores dos caches e o uso do pool já existem em cada
+processo; eles são copiados para as métricas no máximo uma vez a cada `SAMPLE_INTERVAL`
+segundos, após uma requisição, e sempre antes de responder `/metrics`.
+
+Vários workers: com `PROMETHEUS_MULTIPROC_DIR` definida, cada processo grava as métricas em
+arquivos nesse diretório e `/metrics` soma os arquivos de todos os workers do servidor. O
+launcher (`app.server`) cria e limpa o diretório antes de iniciar os workers. Como o
+`prometheus_client` escolhe o modo no momento em que é importado, ele só é importado aqui
+dentro das funções, depois de o launcher definir a variável.
+"""
+import importlib.util
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+SAMPLE_INTERVAL = 1.0
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+POOL_WAIT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+def metrics_available() -> bool:
+    """Indica se as métricas estão habilitadas e o `prometheus_client` está instalado."""
+    return (
+        settings.metrics_enabled
+        and importlib.util.find_spec("prometheus_client") is not None
+    )
+
+
+class Metrics:
+    """
+    As métricas do serviço, registradas no registry padrão do `prometheus_client`.
+
+    **Atributos**
+
+    * `caches` (Dict[str, Callable[[], Any]]): Funções que retornam cada cache, pelo nome.
+    * `pools` (Dict[str, Callable[[], Optional[Pool]]]): Funções que retornam o pool de cada engine.
+
+    **Métodos**
+
+    * `observe_request(method, route, status, seconds) -> None`: Registra uma requisição concluída.
+    * `in_progress(method) -> Any`: O gauge de requisições em andamento do método.
+    * `observe_checkout(engine, seconds) -> None`: Registra a espera por uma conexão do pool.
+    * `sample(force: bool = False) -> None`: Copia o uso dos pools e os contadores dos caches.
+    """
+
+    def __init__(self):
+        from prometheus_client import Counter, Gauge, Histogram
+
+        self._requests = Histogram(
+            "http_request_duration_seconds",
+            "Latência das requisições HTTP, por rota e status.",
+            ["method", "route", "status"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self._in_progress = Gauge(
+            "http_requests_in_progress",
+            "Requisições HTTP em andamento.",
+            ["method"],
+            multiprocess_mode="livesum",
+        )
+        self._pool_wait = Histogram(
+            "db_pool_checkout_seconds",
+            "Espera por uma conexão livre no pool do banco.",
+            ["engine"],
+            buckets=POOL_WAIT_BUCKETS,
+        )
+        self._pool_connections = Gauge(
+            "db_pool_connections",
+            "Conexões do pool do banco, por estado.",
+            ["engine", "state"],
+            multiprocess_mode="livesum",
+        )
+        self._cache_requests = Counter(
+            "app_cache_requests",
+            "Leituras dos caches, por resultado.",
+            ["cache", "result"],
+        )
+        self.caches: Dict[str, Callable[[], Any]] = {}
+        self.pools: Dict[str, Callable[[], Optional[Pool]]] = {}
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._cache_seen: Dict[Tuple[str, str], int] = {}
+        self._sampled_at = 0.0
+
+    def _child(self, metric: Any, *labels: str) -> Any:
+        """Retorna o filho da métrica com os labels, guardado após o primeiro uso."""
+        key = (metric._name, *labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children[key] = metric.labels(*labels)
+        return child
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        """Registra a latência de uma requisição concluída."""
+        self._child(self._requests, method, route, str(status)).observe(seconds)
+
+    def in_progress(self, method: str) -> Any:
+        """Retorna o gauge de requisições em andamento do método."""
+        return self._child(self._in_progress, method)
+
+    def observe_checkout(self, engine: str, seconds: float) -> None:
+        """Registra a espera por uma conexão do pool do engine."""
+        self._child(self._pool_wait, engine).observe(seconds)
+
+    def _sample_pools(self) -> None:
+        for name, get_pool in self.pools.items():
+            pool = get_pool()
+            if not isinstance(pool, QueuePool):
+                continue
+            states = {
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            }
+            for state, value in states.items():
+                self._child(self._pool_connections, name, state).set(value)
+
+    def _sample_caches(self) -> None:
+        for name, get_cache in self.caches.items():
+            cache = get_cache()
+            if cache is None:
+                continue
+            for result, current in (("hit", cache.hits), ("miss", cache.misses)):
+                seen = self._cache_seen.get((name, result), 0)
+                # Um valor menor que o copiado indica `clear()`, que zera os contadores.
+                delta = current - seen if current >= seen else current
+                if delta:
+                    self._child(self._cache_requests, name, result).inc(delta)
+                self._cache_seen[(name, result)] = current
+
+    def sample(self, force: bool = False) -> None:
+        """
+        Copia o uso dos pools e os contadores dos caches para as métricas.
+
+        Args:
+            force (bool, optional): Copia mesmo que a última cópia tenha menos de
+            `SAMPLE_INTERVAL` segundos. (Padrão: False)
+        """
+        now = time.monotonic()
+        if not force and now - self._sampled_at < SAMPLE_INTERVAL:
+            return
+        self._sampled_at = now
+        self._sample_pools()
+        self._sample_caches()
+
+
+@lru_cache()
+def get_metrics() -> Optional[Metrics]:
+    """Cria as métricas uma única vez por processo, ou retorna None se indisponíveis."""
+    if not metrics_available():
+        return None
+    return Metrics()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Gera o texto de `/metrics`.
+
+    Com `PROMETHEUS_MULTIPROC_DIR`, soma as métricas gravadas por todos os workers;
+    caso contrário, usa o registry deste processo.
+
+    Returns:
+        value (Tuple[bytes, str]): O corpo e o `Content-Type` da resposta.
+    """
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        generate_latest,
+    )
+
+    metrics = get_metrics()
+    if metrics is not None:
+        metrics.sample(force=True)
+    if os.environ.get(MULTIPROC_ENV):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: Optional[int] = None) -> None:
+    """Remove os gauges `livesum` de um worker encerrado dos arquivos do modo multiprocesso."""
+    if os.environ.get(MULTIPROC_ENV) and metrics_available():
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid or os.getpid())
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI que registra a latência, o status e as requisições em andamento.
+
+    Example:
+        app.add_middleware(MetricsMiddleware, metrics=get_metrics())
+    """
+
+    def __init__(self, app: Any, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+        self._routes: Optional[Dict[Any, str]] = None
+
+    def _route(self, scope: Dict[str, Any]) -> str:
+        """Retorna o caminho com parâmetros da rota que atendeu a requisição."""
+        if self._routes is None:
+            self._routes = {}
+            for route in scope["app"].routes:
+                endpoint = getattr(route, "endpoint", None)
+                if endpoint is not None:
+                    self._routes.setdefault(endpoint, route.path_format)
+        return self._routes.get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        method = scope["method"]
+        in_progress = self.metrics.in_progress(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            self.metrics.observe_request(method, self._route(scope), status, elapsed)
+            self.metrics.sample()
+
+
+class _TimedCheckout:
+    """Mede a espera de `_do_get`, que bloqueia até haver uma conexão livre no pool."""
+
+    metrics_engine = "sync"
+
+    def _do_get(self) -> Any:
+        metrics = get_metrics()
+        if metrics is None:
+            return super()._do_get()
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe_checkout(self.metrics_engine, time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    """`QueuePool` que registra a espera pelas conexões em `db_pool_checkout_seconds`."""
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """`AsyncAdaptedQueuePool` que registra a espera pelas conexões do engine assíncrono."""
+
+    metrics_engine = "async"
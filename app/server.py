@@ -0,0 +1,225 @@
+"""
+## Módulo do Servidor de Produção.
+Launcher que executa a aplicação com vários workers, um por CPU por padrão.
+
+O schema do banco é criado uma única vez, neste processo, antes de os workers serem
+iniciados; os workers recebem `DB_CREATE_ALL=false` e não repetem o DDL. Como os workers do
+gunicorn são forks deste processo, `settings.db_create_all` também é desabilitado aqui e as
+conexões do pool abertas pelo DDL são descartadas antes do fork.
+
+Os caches em memória (`record_cache_backend=memory`) são de cada worker, e um worker não vê as
+alterações feitas por outro; com mais de um worker o launcher os desabilita (`none`), e o cache
+compartilhado entre os workers é o backend `redis`. Os caches são criados no primeiro uso
+(`app.db.repository.get_record_cache`), então a troca vale também para os workers do gunicorn,
+que são forks deste processo e já têm o app importado; cada worker descarta, após o fork, os
+caches herdados.
+
+Dois gerenciadores de processos são suportados, pela configuração `settings.server_backend`:
+
+- `uvicorn`: o supervisor de workers do próprio uvicorn.
+- `gunicorn`: gunicorn com `UvicornWorker`, que reinicia workers travados e permite reload
+gracioso (`kill -HUP <pid>`) e reciclagem de workers (`web_max_requests`). Requer o extra `server`.
+
+Em ambos os casos o uvicorn usa `uvloop` e `httptools` quando disponíveis.
+
+O log é configurado por `app.log.configure_logging` ao importar o app, e não pelo servidor:
+o uvicorn recebe `log_config=None`, e seus loggers passam pela fila do logger raiz; o gunicorn
+configura os próprios loggers com `logging.conf` no processo principal, e cada worker refaz a
+configuração do app após o fork (`post_fork`).
+
+Com as métricas habilitadas (`app.metrics`), o launcher prepara o diretório do modo
+multiprocesso do Prometheus (`PROMETHEUS_MULTIPROC_DIR`, por padrão um diretório temporário),
+removendo os arquivos de execuções anteriores, para que `/metrics` some todos os workers.
+
+Example:
+    python -m app.server
+    SERVER_BACKEND=gunicorn WEB_CONCURRENCY=8 python -m app.server
+"""
+import importlib.util
+import logging
+import os
+import tempfile
+from typing import Any, Dict, Optional
+
+from app.config import settings
+from app.db import repository
+from app.db.model import engine, init_db
+from app.log import LOG_CONFIG, configure_logging
+from app.metrics import MULTIPROC_ENV, mark_process_dead, metrics_available
+
+logger = logging.getLogger(__name__)
+
+APP_PATH = "asgi:application"
+
+
+def worker_count(cpu_count: Optional[int] = None) -> int:
+    """
+    Calcula a quantidade de workers do servidor.
+
+    Args:
+        cpu_count (Optional[int], optional): A quantidade de CPUs, por padrão `os.cpu_count()`.
+
+    Returns:
+        value (int): `settings.web_concurrency`, ou a quantidade de CPUs se ela for 0.
+    """
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    return max(cpu_count or os.cpu_count() or 1, 1)
+
+
+def _available(module: str, fallback: str = "auto") -> str:
+    """Retorna o nome do módulo se ele estiver instalado, senão `fallback`."""
+    return module if importlib.util.find_spec(module) is not None else fallback
+
+
+def uvicorn_options() -> Dict[str, Any]:
+    """Monta os argumentos nomeados de `uvicorn.run` a partir das configurações."""
+    return {
+        "host": settings.web_host,
+        "port": settings.web_port,
+        "workers": worker_count(),
+        "loop": _available("uvloop"),
+        "http": _available("httptools"),
+        "backlog": settings.web_backlog,
+        "timeout_keep_alive": settings.web_keepalive,
+        "timeout_graceful_shutdown": settings.web_graceful_timeout,
+        "proxy_headers": True,
+        "log_config": None,
+    }
+
+
+def gunicorn_options() -> Dict[str, Any]:
+    """Monta a configuração do gunicorn a partir das configurações."""
+    return {
+        "bind": f"{settings.web_host}:{settings.web_port}",
+        "workers": worker_count(),
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "backlog": settings.web_backlog,
+        "keepalive": settings.web_keepalive,
+        "timeout": settings.web_timeout,
+        "graceful_timeout": settings.web_graceful_timeout,
+        "max_requests": settings.web_max_requests,
+        "max_requests_jitter": settings.web_max_requests // 10,
+        "logconfig": LOG_CONFIG,
+        "preload_app": False,
+        "post_fork": _post_fork,
+        "child_exit": _child_exit,
+    }
+
+
+def _post_fork(server: Any, worker: Any) -> None:
+    """
+    Hook `post_fork` do gunicorn, refaz no worker a configuração de log (`app.log`) e descarta
+    os caches herdados do processo principal.
+    """
+    configure_logging()
+    repository.reset_caches()
+
+
+def _child_exit(server: Any, worker: Any) -> None:
+    """Hook `child_exit` do gunicorn, descarta os gauges do worker encerrado."""
+    mark_process_dead(worker.pid)
+
+
+def prepare_metrics_dir() -> Optional[str]:
+    """
+    Prepara o diretório das métricas multiprocesso, herdado pelos workers.
+
+    Usa `PROMETHEUS_MULTIPROC_DIR`, se definida, ou cria um diretório temporário; os arquivos
+    de execuções anteriores são removidos.
+
+    Returns:
+        value (Optional[str]): O diretório, ou None se as métricas estiverem indisponíveis.
+    """
+    if not metrics_available():
+        return None
+    path = os.environ.get(MULTIPROC_ENV) or tempfile.mkdtemp(prefix="prometheus-")
+    os.makedirs(path, exist_ok=True)
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    os.environ[MULTIPROC_ENV] = path
+    return path
+
+
+def run_uvicorn() -> None:
+    """Executa a aplicação com o supervisor de workers do uvicorn."""
+    import uvicorn
+
+    uvicorn.run(APP_PATH, **uvicorn_options())
+
+
+def run_gunicorn() -> None:
+    """Executa a aplicação com o gunicorn e workers `UvicornWorker`."""
+    from gunicorn.app.base import BaseApplication
+
+    class GunicornApplication(BaseApplication):
+        def __init__(self, options: Dict[str, Any]):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from asgi import application
+
+            return application
+
+    GunicornApplication(gunicorn_options()).run()
+
+
+def disable_memory_caches() -> None:
+    """
+    Desabilita os caches de leituras e de totais em memória quando há mais de um worker.
+
+    Cada worker teria o seu cache, e uma leitura em um worker devolveria os dados anteriores a
+    uma alteração feita em outro até o fim do TTL; com um único worker ou com o backend `redis`,
+    nada muda.
+    """
+    if worker_count() <= 1 or settings.record_cache_backend.lower() != "memory":
+        return
+    logger.warning(
+        "in-memory record cache disabled with %d workers, use RECORD_CACHE_BACKEND=redis",
+        worker_count(),
+    )
+    os.environ["RECORD_CACHE_BACKEND"] = "none"
+    settings.record_cache_backend = "none"
+    repository.reset_caches()
+
+
+def main() -> None:
+    """
+    Cria o schema do banco uma única vez e inicia os workers.
+
+    Raises:
+        ValueError: Se `settings.server_backend` não for `uvicorn` nem `gunicorn`.
+    """
+    runners = {"uvicorn": run_uvicorn, "gunicorn": run_gunicorn}
+    backend = settings.server_backend.lower()
+    if backend not in runners:
+        raise ValueError(f"Unknown server backend: {settings.server_backend}")
+
+    if settings.db_create_all:
+        init_db()
+    # Os workers do uvicorn são novos processos e leem a variável de ambiente; os do gunicorn
+    # são forks deste processo e herdam o `settings` já criado e o pool do engine.
+    os.environ["DB_CREATE_ALL"] = "false"
+    settings.db_create_all = False
+    engine.dispose()
+    disable_memory_caches()
+    prepare_metrics_dir()
+
+    logger.info(
+        "starting %s with %d workers on %s:%s",
+        backend,
+        worker_count(),
+        settings.web_host,
+        settings.web_port,
+    )
+    runners[backend]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+## Módulo de Tempos por Requisição.
+Mede, para cada requisição, quantas instruções SQL foram executadas e quanto tempo foi gasto
+em cada fase, e devolve os totais no cabeçalho `Server-Timing` e no log:
+
+    Server-Timing: db;dur=1.42;desc="3 queries", auth;dur=0.05, validation;dur=0.31, total;dur=4.87
+
+Fases medidas (durações em milissegundos):
+
+- `db`: as instruções SQL, pelos eventos `before_cursor_execute`/`after_cursor_execute` dos
+engines (`instrument_engine`), incluindo as dos engines assíncronos.
+- `auth`: a verificação do token (`check_token`).
+- `validation`: a validação dos cartões pelos schemas e pela validação em lote.
+- `serialization`: a conversão dos cartões do banco em dicionários.
+- `total`: a requisição inteira, até o início da resposta.
+
+Os tempos ficam em um `RequestTimings` guardado em uma `ContextVar`, definida pelo
+`RequestTimingMiddleware` para cada requisição; o contexto é herdado pelas tarefas, pelas
+threads do threadpool e pelos greenlets do SQLAlchemy assíncrono. Fora de uma requisição
+(scripts, testes de unidade), as medições não fazem nada.
+
+Ao final de cada requisição, um registro `DEBUG` com os totais é emitido, com os campos também
+disponíveis no atributo `timings` do registro; se a requisição executar mais instruções que
+`settings.db_query_warning`, o registro é emitido como `WARNING`.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Set, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+HEADER = "Server-Timing"
+
+PHASES = ("db", "auth", "validation", "serialization")
+
+
+class RequestTimings:
+    """
+    Tempos e contagem de instruções SQL de uma requisição.
+
+    **Atributos**
+
+    * `durations` (Dict[str, float]): O tempo acumulado de cada fase, em segundos.
+    * `queries` (int): A quantidade de instruções SQL executadas.
+    * `started_at` (float): O início da requisição (`time.perf_counter`).
+
+    **Métodos**
+
+    * `add(phase: str, seconds: float) -> None`: Soma um tempo à fase.
+    * `add_query(seconds: float) -> None`: Soma uma instrução SQL e o seu tempo.
+    * `as_dict() -> Dict[str, Any]`: Os totais, em milissegundos, para o log.
+    * `header() -> str`: O valor do cabeçalho `Server-Timing`.
+    """
+
+    __slots__ = ("durations", "queries", "started_at", "active")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.queries = 0
+        self.started_at = time.perf_counter()
+        self.active: Set[str] = set()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Soma um tempo, em segundos, à fase."""
+        self.durations[phase] = self.durations.get(phase, 0.0) + seconds
+
+    def add_query(self, seconds: float) -> None:
+        """Soma uma instrução SQL e o seu tempo à fase `db`."""
+        self.queries += 1
+        self.add("db", seconds)
+
+    def elapsed(self) -> float:
+        """Retorna o tempo, em segundos, desde o início da requisição."""
+        return time.perf_counter() - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Retorna a contagem de instruções e o tempo de cada fase, em milissegundos."""
+        result: Dict[str, Any] = {"db_queries": self.queries}
+        for phase in PHASES:
+            if phase in self.durations:
+                result[f"{phase}_ms"] = round(self.durations[phase] * 1000, 3)
+        result["total_ms"] = round(self.elapsed() * 1000, 3)
+        return result
+
+    def header(self) -> str:
+        """Monta o valor do cabeçalho `Server-Timing`, com as fases medidas e o total."""
+        metrics = []
+        for phase in PHASES:
+            if phase not in self.durations:
+                continue
+            metric = f"{phase};dur={self.durations[phase] * 1000:.2f}"
+            if phase == "db":
+                metric += f';desc="{self.queries} queries"'
+            metrics.append(metric)
+        metrics.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(metrics)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Retorna os tempos da requisição em andamento, ou None fora de uma requisição."""
+    return _current.get()
+
+
+class timed:
+    """
+    Mede o bloco (ou a função decorada) e soma o tempo à fase da requisição em andamento.
+
+    Blocos da mesma fase aninhados são medidos uma única vez, pelo mais externo. Como
+    decorador, a função é chamada diretamente quando não há uma requisição em andamento.
+
+    Args:
+        phase (str): A fase, uma de `PHASES`.
+
+    Example:
+        with timed("validation"):
+            card = CreditCardSchema(**payload)
+
+        @timed("auth")
+        def check_token(token: str) -> str:
+            ...
+    """
+
+    __slots__ = ("phase", "_timings", "_start")
+
+    def __init__(self, phase: str):
+        self.phase = phase
+        self._timings: Optional[RequestTimings] = None
+        self._start = 0.0
+
+    def __enter__(self) -> None:
+        timings = _current.get()
+        if timings is None or self.phase in timings.active:
+            self._timings = None
+            return
+        timings.active.add(self.phase)
+        self._timings = timings
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        timings = self._timings
+        if timings is not None:
+            timings.add(self.phase, time.perf_counter() - self._start)
+            timings.active.discard(self.phase)
+            self._timings = None
+
+    def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
+        phase = self.phase
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with timed(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        context._timing_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    start = getattr(context, "_timing_start", None)
+    if timings is not None and start is not None:
+        timings.add_query(time.perf_counter() - start)
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """
+    Registra a contagem e o tempo das instruções SQL do engine na requisição em andamento.
+
+    Args:
+        engine (Engine): O engine síncrono, ou o `sync_engine` de um engine assíncrono.
+
+    Returns:
+        value (Engine): O mesmo engine.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+class RequestTimingMiddleware:
+    """
+    Middleware ASGI que mede cada requisição e adiciona o cabeçalho `Server-Timing`.
+
+    Example:
+        app.add_middleware(RequestTimingMiddleware)
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    def _log(self, scope: Dict[str, Any], status: int, timings: RequestTimings) -> None:
+        """Registra os totais da requisição, como aviso se passar do limite de instruções."""
+        limit = settings.db_query_warning
+        level = logging.DEBUG
+        if limit and timings.queries > limit:
+            level = logging.WARNING
+        if not logger.isEnabledFor(level):
+            return
+        fields = timings.as_dict()
+        logger.log(
+            level,
+            "request method=%s path=%s status=%s db_queries=%d db_ms=%.2f total_ms=%.2f",
+            scope["method"],
+            scope["path"],
+            status,
+            timings.queries,
+            fields.get("db_ms", 0.0),
+            fields["total_ms"],
+            extra={"timings": fields},
+        )
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        status = 500
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append(HEADER, timings.header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status, timings)
@@ -4,11 +4,49 @@ Itens que podem ser reutilizados em outros módulos do projeto
 
 Functions:
     hashable: Gera o hash SHA-256 de um valor.
+    parse_expiry: Converte uma data mês/ano no último dia do mês, com cache.
     datetime_validator: Valida e formata uma data no formato mês/ano.
+    encode_cursor: Gera um cursor opaco de paginação a partir de um ID.
+    decode_cursor: Recupera o ID contido em um cursor opaco de paginação.
+    ndjson_stream: Converte lotes de modelos em blocos NDJSON, opcionalmente em gzip.
+    async_ndjson_stream: Versão assíncrona do `ndjson_stream`.
+    parse_json_records: Lê uma lista de registros de um corpo JSON (array) ou NDJSON.
+    parse_fields: Converte o parâmetro `fields` na lista de campos pedidos.
+    page_headers: Monta os cabeçalhos de total e paginação de uma listagem.
+    entity_tag: Gera a `ETag` forte de um ou mais registros a partir do ID e do `updated_at`.
+    validator_headers: Monta os cabeçalhos `ETag` e `Last-Modified` de uma resposta.
+    is_not_modified: Avalia `If-None-Match`/`If-Modified-Since` para responder 304.
+    is_conditional: Indica se a requisição possui cabeçalhos condicionais.
 """
+import base64
+import binascii
+import calendar
 import hashlib
+import json
 import logging
-from datetime import datetime, timedelta
+import re
+import time
+import zlib
+from datetime import date, datetime
+from datetime import time as dt_time
+from datetime import timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
+
+import orjson
+from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +73,63 @@ def hashable(value):
     return hash_object.hexdigest()
 
 
+EXPIRY_PATTERN = re.compile(r"(1[0-2]|0[1-9]|[1-9])/(\d\d\d\d)")
+
+
+class _Today:
+    """
+    Data atual (horário local) reaproveitada até a virada do dia.
+
+    Evita chamar `datetime.now()` para cada cartão; a data só é recalculada quando
+    o relógio passa da meia-noite seguinte.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._today: Optional[date] = None
+        self._expires_at = 0.0
+
+    def __call__(self) -> date:
+        now = self.clock()
+        if self._today is None or now >= self._expires_at:
+            current = datetime.fromtimestamp(now)
+            tomorrow = datetime.combine(current.date() + timedelta(days=1), dt_time())
+            self._today = current.date()
+            self._expires_at = tomorrow.timestamp()
+        return self._today
+
+
+today = _Today()
+
+
+@lru_cache(maxsize=4096)
+def parse_expiry(value: str) -> Tuple[date, str]:
+    """
+    Converte uma data "mês/ano" no último dia do mês, sem usar `strptime`.
+
+    Aceita as mesmas entradas de `datetime.strptime(value, "%m/%Y")` e levanta os mesmos
+    erros; o resultado fica em cache, pois há poucas centenas de valores distintos na prática.
+
+    Args:
+        value (str): A data no formato "mês/ano".
+
+    Returns:
+        value (Tuple[date, str]): O último dia do mês, como `date` e no formato "ano-mês-dia".
+
+    Raises:
+        ValueError: Se o valor não estiver no formato "mês/ano".
+    """
+    match = EXPIRY_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"time data {value!r} does not match format '%m/%Y'")
+    if match.end() != len(value):
+        raise ValueError(f"unconverted data remains: {value[match.end():]}")
+
+    month, year = int(match.group(1)), int(match.group(2))
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    return last_day, last_day.isoformat()
+
+
 def datetime_validator(value: str) -> str:
     """
     Valida e formata uma data no formato mês/ano.
@@ -43,6 +138,9 @@ def datetime_validator(value: str) -> str:
     - Valida se a data é posterior à data atual.
     - Calcula e retorna o último dia do mês correspondente à data fornecida, no formato "ano-mês-dia".
 
+    A conversão é feita por `parse_expiry` (em cache) e a data atual por `today`, que só é
+    recalculada na virada do dia.
+
     Args:
         value (str): A data no formato "mês/ano" a ser validada e formatada.
 
@@ -57,16 +155,275 @@ def datetime_validator(value: str) -> str:
         formatted_date = datetime_validator(input_date)
         print(f"Último dia do mês: {formatted_date}")
     """
-    input_format = "%m/%Y"
-    output_format = "%Y-%m-%d"
-    today = datetime.now().date()
-
-    parsed_date = datetime.strptime(value, input_format).date()
-    last_day_of_month = (parsed_date.replace(day=1) + timedelta(days=32)).replace(
-        day=1
-    ) - timedelta(days=1)
+    if not isinstance(value, str):
+        raise TypeError(
+            f"strptime() argument 1 must be str, not {type(value).__name__}"
+        )
 
-    if last_day_of_month < today:
+    last_day_of_month, formatted = parse_expiry(value)
+    if last_day_of_month < today():
         raise ValueError("The input date is not earlier than today.")
 
-    return last_day_of_month.strftime(output_format)
+    return formatted
+
+
+def encode_cursor(value: int) -> str:
+    """
+    Gera um cursor opaco de paginação a partir de um ID.
+
+    O cursor é um JSON codificado em base64 url-safe, sem o padding `=`,
+    para que o cliente o trate como um valor opaco.
+
+    Args:
+        value (int): O último ID retornado na página.
+
+    Returns:
+        value (str): O cursor opaco.
+
+    Example:
+        cursor = encode_cursor(42)
+        assert decode_cursor(cursor) == 42
+    """
+    payload = json.dumps({"id": value}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Recupera o ID contido em um cursor gerado por `encode_cursor`.
+
+    Args:
+        cursor (str): O cursor opaco recebido do cliente.
+
+    Returns:
+        value (int): O ID a partir do qual a próxima página deve começar.
+
+    Raises:
+        ValueError: Se o cursor estiver corrompido ou não tiver sido gerado pela API.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = json.loads(base64.urlsafe_b64decode(padded.encode()))["id"]
+    except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError("Invalid cursor")
+    return value
+
+
+def parse_fields(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Converte o parâmetro `fields` (nomes separados por vírgula) na lista de campos pedidos.
+
+    Nomes repetidos são descartados, mantendo a ordem da primeira ocorrência.
+
+    Args:
+        value (Optional[str]): O valor recebido, por exemplo `"id,holder,brand"`.
+
+    Returns:
+        value (Optional[List[str]]): Os campos pedidos, ou None se nenhum foi informado.
+    """
+    if value is None:
+        return None
+    fields = list(
+        dict.fromkeys(field.strip() for field in value.split(",") if field.strip())
+    )
+    return fields or None
+
+
+def page_headers(total: int, skip: int, limit: int) -> Dict[str, str]:
+    """
+    Monta os cabeçalhos com o total e a paginação de uma listagem por `skip`/`limit`.
+
+    Args:
+        total (int): O total de registros da listagem.
+        skip (int): O número de registros ignorados.
+        limit (int): O número máximo de registros por página.
+
+    Returns:
+        value (Dict[str, str]): `X-Total-Count`, `X-Total-Pages` e `X-Page` (a página atual, a partir de 1).
+    """
+    pages = -(-total // limit) if limit > 0 else 0
+    page = skip // limit + 1 if limit > 0 else 1
+    return {
+        "X-Total-Count": str(total),
+        "X-Total-Pages": str(pages),
+        "X-Page": str(page),
+    }
+
+
+def _ndjson_block(rows: List[BaseModel]) -> bytes:
+    """Serializa um lote de modelos em linhas JSON separadas por quebra de linha, com orjson."""
+    return b"".join(orjson.dumps(row.dict()) + b"\n" for row in rows)
+
+
+def _gzip_compressor(compress: bool) -> Optional["zlib._Compress"]:
+    """Cria um compressor no formato gzip (wbits=31), se a compressão estiver habilitada."""
+    return zlib.compressobj(wbits=31) if compress else None
+
+
+def ndjson_stream(
+    chunks: Iterable[List[BaseModel]], *, compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Converte lotes de modelos em blocos NDJSON, um bloco por lote.
+
+    Cada lote é serializado e liberado antes do próximo ser lido, mantendo o uso de memória
+    proporcional ao tamanho do lote e não ao total de registros.
+
+    Args:
+        chunks (Iterable[List[BaseModel]]): Os lotes de modelos, por exemplo `CRUDBase.iter_chunks`.
+        compress (bool, optional): Se True, os blocos são comprimidos em gzip.
+
+    Yields:
+        value (bytes): Um bloco NDJSON, comprimido ou não.
+
+    Example:
+        body = b"".join(ndjson_stream([[card_1, card_2], [card_3]]))
+    """
+    compressor = _gzip_compressor(compress)
+    for rows in chunks:
+        block = _ndjson_block(rows)
+        data = compressor.compress(block) if compressor else block
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+async def async_ndjson_stream(
+    chunks: AsyncIterable[List[BaseModel]], *, compress: bool = False
+) -> AsyncIterable[bytes]:
+    """Versão assíncrona do `ndjson_stream`, para lotes vindos da `AsyncCRUDBase`."""
+    compressor = _gzip_compressor(compress)
+    async for rows in chunks:
+        block = _ndjson_block(rows)
+        data = compressor.compress(block) if compressor else block
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def parse_json_records(
+    body: bytes, content_type: str = "application/json"
+) -> List[Any]:
+    """
+    Lê uma lista de registros de um corpo JSON (array) ou NDJSON (um JSON por linha).
+
+    No formato NDJSON, linhas em branco são ignoradas e linhas que não são JSON válido
+    viram `None`, para que o chamador as reporte individualmente sem descartar o restante.
+
+    Args:
+        body (bytes): O corpo da requisição.
+        content_type (str, optional): O `Content-Type` da requisição.
+
+    Returns:
+        value (List[Any]): Os registros, na ordem em que aparecem no corpo.
+
+    Raises:
+        ValueError: Se o corpo JSON não for um array válido.
+
+    Example:
+        records = parse_json_records(b'{"a": 1}\n{"a": 2}\n', "application/x-ndjson")
+        # [{"a": 1}, {"a": 2}]
+    """
+    if "ndjson" in content_type:
+        records: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                records.append(None)
+        return records
+
+    records = json.loads(body)
+    if not isinstance(records, list):
+        raise ValueError("The request body must be a JSON array")
+    return records
+
+
+def entity_tag(
+    versions: Iterable[Tuple[Any, Optional[datetime]]], variant: str = ""
+) -> str:
+    """
+    Gera uma `ETag` forte a partir do ID e do `updated_at` de cada registro da resposta.
+
+    Todo registro tem o `updated_at` renovado a cada atualização, então o par identifica a
+    representação sem precisar serializá-la.
+
+    Args:
+        versions (Iterable[Tuple[Any, Optional[datetime]]]): Os pares `(id, updated_at)`, na ordem da resposta.
+        variant (str, optional): O que mais altera a representação, por exemplo os campos pedidos.
+
+    Returns:
+        value (str): A `ETag`, entre aspas.
+    """
+    digest = hashlib.blake2b(variant.encode(), digest_size=16)
+    for obj_id, updated_at in versions:
+        stamp = updated_at.isoformat() if updated_at is not None else ""
+        digest.update(f"{obj_id}:{stamp};".encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Interpreta datas sem fuso como UTC, o fuso das datas gravadas no banco."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    """
+    Monta os cabeçalhos de validação de cache de uma resposta.
+
+    Args:
+        etag (str): A `ETag` gerada por `entity_tag`.
+        last_modified (Optional[datetime]): A última atualização dos registros da resposta.
+
+    Returns:
+        value (Dict[str, str]): `ETag` e, se houver data, `Last-Modified`.
+    """
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    return headers
+
+
+def is_not_modified(
+    headers: Mapping[str, str], etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """
+    Indica se a requisição condicional pode ser respondida com 304 Not Modified.
+
+    Segue a precedência da RFC 9110: com `If-None-Match`, apenas a `ETag` é comparada
+    (comparação fraca, como pedido para GET/HEAD); sem ele, `If-Modified-Since` é comparado
+    com `last_modified`, na precisão de segundos do cabeçalho.
+
+    Args:
+        headers (Mapping[str, str]): Os cabeçalhos da requisição.
+        etag (str): A `ETag` atual do recurso.
+        last_modified (Optional[datetime]): A última atualização atual do recurso.
+
+    Returns:
+        value (bool): True se o cliente já possui a representação atual.
+    """
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+    if_modified_since = headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def is_conditional(headers: Mapping[str, str]) -> bool:
+    """Indica se a requisição possui `If-None-Match` ou `If-Modified-Since`."""
+    return "if-none-match" in headers or "if-modified-since" in headers
@@ -6,10 +6,12 @@ As rotas importadas incluem:
 - Rota de autenticação (router_auth)
 - Rota de informações de cartão de crédito (router_credit_card)
 - Rota de status da aplicação (router_health)
+- Rota de métricas no formato do Prometheus (router_metrics)
 """
 
 from .auth import router as router_auth
 from .credit_card import router as router_credit_card
 from .health import router as router_health
+from .metrics import router as router_metrics
 
-__all__ = ["router_health", "router_credit_card", "router_auth"]
+__all__ = ["router_health", "router_credit_card", "router_auth", "router_metrics"]
@@ -4,49 +4,158 @@ Este módulo contém as rotas relacionadas à manipulação de informações de
 
 As rotas disponíveis incluem:
 - Listagem de todos os cartões de crédito
+- Listagem paginada por cursor (keyset)
+- Exportação completa em NDJSON via streaming
+- Verificação de existência de um número de cartão (`HEAD /by-number`, número no cabeçalho
+`X-Card-Number`)
+- Consulta da bandeira de um BIN
 - Detalhes de um cartão de crédito por ID
 - Criação de um novo cartão de crédito
+- Criação de cartões de crédito em lote (JSON array ou NDJSON)
 - Atualização de informações de um cartão de crédito
 - Exclusão de um cartão de crédito por ID
+
+As respostas com cartões são montadas pelos serializadores pré-computados do `app.db.schema`
+e codificadas com orjson (`ORJSONResponse`), sem a revalidação pelo `response_model`; o
+`response_model` e o `responses` de cada rota continuam definindo o schema do OpenAPI.
+
+A sessão e o repositório são escolhidos pela configuração `settings.async_database`,
+e as chamadas ao repositório passam por `execute`, que não bloqueia o event loop.
+Cada requisição recebe o seu próprio repositório (`get_credit_card_repository`), já com o
+usuário autenticado, então requisições concorrentes não compartilham estado.
 """
+import inspect
 import logging
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Path, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.auth import check_token
-from app.db.model import CreditCard, get_session
-from app.db.repository import credit_card_repository
-from app.db.schema import CreditCardSchema, CreditCardSchemaUpdate
+from app.brand import brand_classifier
+from app.config import settings
+from app.db.filters import CreditCardFilter, get_credit_card_filter
+from app.db.model import CreditCard, get_async_session, get_session
+from app.db.repository import CartRepository, execute, get_credit_card_repository
+from app.db.schema import (
+    BrandLookup,
+    BulkCreateResult,
+    BulkItemResult,
+    CreditCardPage,
+    CreditCardSchema,
+    CreditCardSchemaUpdate,
+    serialize_credit_card,
+    serialize_credit_cards,
+)
+from app.db.search import MIN_QUERY_LENGTH
+from app.db.validation import validate_credit_cards_batch
 from app.exceptions.http_error_schema import HTTPError
+from app.exceptions.payload_error import InvalidPayloadError, PayloadTooLargeError
+from app.exceptions.query_error import InvalidCursorError, UnknownBrandError
+from app.fingerprint import card_fingerprints
+from app.utils import (
+    async_ndjson_stream,
+    decode_cursor,
+    encode_cursor,
+    entity_tag,
+    is_conditional,
+    is_not_modified,
+    ndjson_stream,
+    page_headers,
+    parse_fields,
+    parse_json_records,
+    validator_headers,
+)
 
 router = APIRouter()
 
 logger = logging.getLogger(__name__)
 
+session_dependency = get_async_session if settings.async_database else get_session
+
+VERSION_FIELDS = ["id", "updated_at"]
 
-@router.get("/", response_model=List[CreditCard])
+
+def _validators(
+    versions: List[Tuple[int, datetime]], variant: str = ""
+) -> Tuple[str, Optional[datetime]]:
+    """Calcula a `ETag` e o `Last-Modified` a partir dos pares `(id, updated_at)` da resposta."""
+    last_modified = max((updated_at for _, updated_at in versions), default=None)
+    return entity_tag(versions, variant), last_modified
+
+
+def _collection_tag(versions: List[Tuple[int, datetime]], variant: str = "") -> str:
+    """
+    Calcula a `ETag` de uma listagem a partir dos pares `(id, updated_at)` e da quantidade.
+
+    Listagens não têm `Last-Modified`: a maior data não muda quando um item sai da página
+    (remoção ou filtro), e um `If-Modified-Since` responderia 304 com a página antiga.
+    """
+    return entity_tag(versions, f"{len(versions)}:{variant}")
+
+
+def _not_modified(etag: str, last_modified: Optional[datetime]) -> Response:
+    """Monta a resposta 304, sem corpo, com os cabeçalhos de validação atuais."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, last_modified),
+    )
+
+
+@router.get(
+    "/",
+    response_model=List[CreditCard],
+    responses={
+        304: {"description": "Not modified"},
+        400: {"model": HTTPError, "description": "Unknown fields"},
+    },
+)
 async def list_all_credit_card(
     *,
-    session: Session = Depends(get_session),
+    request: Request,
+    session: Session = Depends(session_dependency),
     skip: int = Query(default=0, lte=100),
     limit: int = Query(default=100, lte=100),
-    username: str = Depends(check_token)
+    fields: Optional[str] = Query(
+        default=None,
+        description="Campos a retornar, separados por vírgula (ex.: `id,holder,brand`).",
+    ),
+    filters: CreditCardFilter = Depends(get_credit_card_filter),
+    with_total: bool = Query(
+        default=False,
+        description="Inclui os cabeçalhos `X-Total-Count`, `X-Total-Pages` e `X-Page`.",
+    ),
+    repository: CartRepository = Depends(get_credit_card_repository),
 ):
     """
     Lista todos os cartões de crédito disponíveis.
 
     Esta função retorna uma lista de cartões de crédito com base nos parâmetros especificados.
 
+    A resposta traz a `ETag`, calculada a partir dos `id`, dos `updated_at` e da quantidade dos
+    cartões listados, sem `Last-Modified`. Com `If-None-Match`, apenas essas duas colunas são
+    consultadas primeiro e, se a página não mudou, a resposta é 304 sem corpo; `If-Modified-Since`
+    é ignorado.
+
     Parâmetros:
+        request (Request): A requisição, com os cabeçalhos condicionais.
         session (Session): Uma sessão de banco de dados obtida usando `get_session` (opcional).
         skip (int): O número de cartões de crédito a serem ignorados (padrão é 0, no máximo 100).
         limit (int): O número máximo de cartões de crédito a serem retornados (padrão é 100, no máximo 100).
-        username (str): O nome de usuário obtido a partir do token de autenticação (opcional).
+        fields (Optional[str]): Os campos a retornar, separados por vírgula; por padrão todos.
+            Com `fields`, apenas essas colunas são consultadas no banco.
+        filters (CreditCardFilter): Os filtros (`brand`, `holder_prefix`, faixas de `created_*` e
+            `updated_*`) e a ordenação (`sort`), aplicados no banco sobre as colunas indexadas.
+        with_total (bool): Inclui o total de cartões (com os mesmos filtros) e das páginas nos
+            cabeçalhos da resposta. O total vem do cache de totais do repositório.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
 
     Retorna:
-        List[CreditCard]: Uma lista de objetos `CreditCard` representando os cartões de crédito.
+        List[CreditCard]: Uma lista de objetos `CreditCard` representando os cartões de crédito,
+            ou apenas com os campos pedidos.
 
     Exemplo:
         >>> username = "john_doe"
@@ -55,25 +164,283 @@ async def list_all_credit_card(
     Exceções:
         HTTPException(400, "Limit deve ser no máximo 100"): Se o parâmetro `limit` for superior a 100.
         HTTPException(400, "Skip deve ser no máximo 100"): Se o parâmetro `skip` for superior a 100.
+        InvalidFieldsError: Se algum campo de `fields` não existir no modelo.
 
     """
-    credit_card_repository.set_username(username)
-    resp = credit_card_repository.get_multi(session, skip=skip, limit=limit)
-    return resp
+    projection = parse_fields(fields)
+    variant = ",".join(projection or [])
+    if is_conditional(request.headers):
+        rows = await execute(
+            repository.get_multi,
+            session,
+            skip=skip,
+            limit=limit,
+            fields=VERSION_FIELDS,
+            filters=filters,
+        )
+        etag = _collection_tag(
+            [(row["id"], row["updated_at"]) for row in rows], variant
+        )
+        if is_not_modified(request.headers, etag, None):
+            return _not_modified(etag, None)
+
+    # A `ETag` é calculada pela própria consulta, com as colunas de versão acrescentadas à
+    # projeção e retiradas da resposta.
+    extra = [
+        field for field in VERSION_FIELDS if field not in (projection or VERSION_FIELDS)
+    ]
+    resp = await execute(
+        repository.get_multi,
+        session,
+        skip=skip,
+        limit=limit,
+        fields=projection + extra if projection is not None else None,
+        filters=filters,
+    )
+    if projection is not None:
+        etag = _collection_tag(
+            [(row["id"], row["updated_at"]) for row in resp], variant
+        )
+        for row in resp:
+            for field in extra:
+                del row[field]
+    else:
+        etag = _collection_tag([(card.id, card.updated_at) for card in resp])
+    headers = validator_headers(etag, None)
+    if with_total:
+        total = await execute(repository.count, session, filters=filters)
+        headers.update(page_headers(total, skip, limit))
+    if projection is not None:
+        return ORJSONResponse(resp, headers=headers)
+    return ORJSONResponse(serialize_credit_cards(resp), headers=headers)
+
+
+@router.get(
+    "/page",
+    response_model=CreditCardPage,
+    responses={400: {"model": HTTPError, "description": "Invalid pagination cursor"}},
+)
+async def list_credit_card_page(
+    *,
+    session: Session = Depends(session_dependency),
+    cursor: Optional[str] = Query(default=None),
+    limit: int = Query(default=100, gt=0, le=100),
+    with_total: bool = Query(
+        default=False, description="Inclui `total` e `total_pages`."
+    ),
+    username: str = Depends(check_token),
+    repository: CartRepository = Depends(get_credit_card_repository),
+):
+    """
+    Lista os cartões de crédito usando paginação por cursor (keyset).
+
+    A primeira página é obtida sem o parâmetro `cursor`; as seguintes usando o `next_cursor`
+    retornado na página anterior, até que ele seja `null`. O custo de cada página é constante,
+    independente da profundidade, pois a consulta usa o índice da chave primária ao invés de `OFFSET`.
+
+    Parâmetros:
+        session (Session): Uma sessão de banco de dados obtida usando `get_session` (opcional).
+        cursor (Optional[str]): O cursor opaco retornado pela página anterior (opcional).
+        limit (int): O número máximo de cartões de crédito por página (padrão é 100, no máximo 100).
+        with_total (bool): Inclui o total de cartões e de páginas, lidos do cache de totais.
+        username (str): O nome de usuário obtido a partir do token de autenticação.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
+
+    Retorna:
+        CreditCardPage: Os cartões de crédito da página, o `next_cursor` e, com `with_total`,
+            o `total` e o `total_pages`.
+
+    Exceções:
+        HTTPException(400, "Invalid pagination cursor"): Se o cursor não tiver sido gerado pela API.
+
+    """
+    after_id = None
+    if cursor:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise InvalidCursorError(username, cursor=cursor)
+
+    items, last_id = await execute(
+        repository.get_page, session, after_id=after_id, limit=limit
+    )
+    next_cursor = encode_cursor(last_id) if last_id is not None else None
+    page = {"items": serialize_credit_cards(items), "next_cursor": next_cursor}
+    if with_total:
+        total = await execute(repository.count, session)
+        page.update(total=total, total_pages=-(-total // limit))
+    return ORJSONResponse(page)
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {"application/x-ndjson": {}},
+            "description": "One JSON credit card per line",
+        }
+    },
+)
+async def export_credit_cards(
+    *,
+    session: Session = Depends(session_dependency),
+    gzip: bool = Query(default=False),
+    repository: CartRepository = Depends(get_credit_card_repository),
+):
+    """
+    Exporta todos os cartões de crédito em NDJSON (um JSON por linha), via streaming.
+
+    Os registros são lidos em lotes de `settings.export_chunk_size` com cursor do servidor
+    e enviados conforme são lidos, então o uso de memória é o mesmo para 10 mil ou 10 milhões
+    de cartões. Com `gzip=true` o corpo é comprimido e enviado com `Content-Encoding: gzip`.
+
+    Parâmetros:
+        session (Session): Uma sessão do banco de dados obtida usando `get_session`.
+        gzip (bool): Se o corpo da resposta deve ser comprimido em gzip (padrão é False).
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
+
+    Retorna:
+        StreamingResponse: O corpo NDJSON, ordenado pelo ID.
+
+    """
+    chunks = repository.iter_chunks(session, chunk_size=settings.export_chunk_size)
+    if inspect.isasyncgen(chunks):
+        body = async_ndjson_stream(chunks, compress=gzip)
+    else:
+        body = ndjson_stream(chunks, compress=gzip)
+
+    headers = {"Content-Disposition": 'attachment; filename="credit_cards.ndjson"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type="application/x-ndjson", headers=headers)
+
+
+@router.head(
+    "/by-number",
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "A credit card with this number exists"},
+        404: {"description": "No credit card with this number"},
+    },
+)
+async def credit_card_number_exists(
+    *,
+    session: Session = Depends(session_dependency),
+    number: str = Header(alias="X-Card-Number", min_length=1),
+    repository: CartRepository = Depends(get_credit_card_repository),
+):
+    """
+    Verifica se um número de cartão de crédito já está cadastrado.
+
+    Permite que os clientes removam duplicados antes de enviar uma criação ou uma carga em lote.
+    O número é convertido na mesma impressão digital usada no armazenamento (com a chave atual
+    e com as chaves anteriores à rotação) e consultado pelo índice único da coluna, sem ler o
+    registro e sem abrir uma transação de escrita.
+
+    O número é recebido no cabeçalho `X-Card-Number`, e nunca na query string: a url (com a
+    query) é registrada no log de acesso e no log das requisições.
+
+    Parâmetros:
+        session (Session): Uma sessão do banco de dados obtida usando `get_session`.
+        number (str): O número do cartão de crédito, do cabeçalho `X-Card-Number`.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
+
+    Retorna:
+        Response: Status 200 se o número existir, ou 404 caso contrário, sempre sem corpo.
+
+    """
+    found = await execute(repository.exists, session, number=card_fingerprints(number))
+    return Response(
+        status_code=status.HTTP_200_OK if found else status.HTTP_404_NOT_FOUND
+    )
+
+
+@router.get(
+    "/brand/{bin}",
+    response_model=BrandLookup,
+    responses={404: {"model": HTTPError, "description": "Brand not found"}},
+)
+async def get_brand_for_bin(
+    bin: str = Path(pattern=r"^\d{1,19}$"),
+    username: str = Depends(check_token),
+):
+    """
+    Consulta a bandeira de um cartão a partir do BIN (os primeiros dígitos do número).
+
+    Permite a pré-validação no checkout sem enviar o número completo. A consulta usa o
+    classificador em memória (`app.brand`) e não acessa o banco de dados.
+
+    Parâmetros:
+        bin (str): Os primeiros dígitos do cartão, de 1 a 19 dígitos (normalmente 6 ou 8).
+        username (str): O nome de usuário obtido a partir do token de autenticação.
+
+    Retorna:
+        BrandLookup: Os dígitos consultados e a bandeira correspondente.
+
+    Exceções:
+        HTTPException(404, "Brand not found"): Se os dígitos não pertencerem a nenhuma faixa conhecida.
+
+    """
+    brand = brand_classifier.classify(bin)
+    if brand is None:
+        raise UnknownBrandError(username, bin=bin)
+    return {"bin": bin, "brand": brand}
+
+
+@router.get("/search", response_model=List[CreditCard])
+async def search_credit_card(
+    *,
+    session: Session = Depends(session_dependency),
+    q: str = Query(
+        min_length=MIN_QUERY_LENGTH,
+        max_length=100,
+        description="Trecho do nome do titular, sem diferenciar maiúsculas de minúsculas.",
+    ),
+    limit: int = Query(default=20, gt=0, le=100),
+    repository: CartRepository = Depends(get_credit_card_repository),
+):
+    """
+    Busca cartões de crédito por trecho do nome do titular.
+
+    A busca usa o índice textual do banco (`app.db.search`): FTS5 com trigramas no SQLite
+    ou `pg_trgm` no PostgreSQL, sem percorrer a tabela inteira como um `LIKE '%trecho%'`.
+    No SQLite, apenas os 500 cartões mais recentes que contêm o trecho
+    (`app.db.search.SEARCH_CANDIDATES`) são ordenados por relevância. O cabeçalho
+    `X-Search-Truncated` é `true` quando outros cartões com o trecho ficaram fora do resultado;
+    nesse caso, refine o trecho buscado.
+
+    Parâmetros:
+        session (Session): Uma sessão de banco de dados obtida usando `get_session` (opcional).
+        q (str): O trecho buscado, com pelo menos 3 caracteres.
+        limit (int): O número máximo de cartões de crédito retornados (padrão é 20, no máximo 100).
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
+
+    Retorna:
+        List[CreditCard]: Os cartões encontrados, do mais ao menos relevante, com o cabeçalho
+        `X-Search-Truncated`.
+
+    """
+    resp = await execute(repository.search, session, query=q, limit=limit)
+    truncated = await execute(repository.search_truncated, session, query=q)
+    headers = {"X-Search-Truncated": "true" if truncated else "false"}
+    return ORJSONResponse(serialize_credit_cards(resp), headers=headers)
 
 
 @router.get(
     "/{id}",
     responses={
         200: {"model": CreditCard},
+        304: {"description": "Not modified"},
         404: {"model": HTTPError, "description": "Credit card not found"},
     },
 )
 async def get_credit_card_for_key(
     id: int,
     *,
-    session: Session = Depends(get_session),
-    username: str = Depends(check_token)
+    request: Request,
+    session: Session = Depends(session_dependency),
+    repository: CartRepository = Depends(get_credit_card_repository),
 ):
     """
     Obtém informações de um cartão de crédito com base em seu ID.
@@ -81,10 +448,15 @@ async def get_credit_card_for_key(
     Esta função recebe um ID como parâmetro e retorna as informações do cartão de crédito correspondente,
     se existir. Caso contrário, lança uma exceção HTTP 404 indicando que o cartão de crédito não foi encontrado.
 
+    A resposta traz `ETag` e `Last-Modified`. Com `If-None-Match` ou `If-Modified-Since`, apenas o
+    `updated_at` do cartão é lido (pela chave primária) e, se ele não mudou, a resposta é 304 sem
+    corpo e sem serialização.
+
     Parâmetros:
         id (int): O ID do cartão de crédito que deseja ser consultado.
+        request (Request): A requisição, com os cabeçalhos condicionais.
         session (Session): Uma sessão de banco de dados obtida usando `get_session` (opcional).
-        username (str): O nome de usuário obtido a partir do token de autenticação (opcional).
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
 
     Retorna:
         CreditCard: Um objeto `CreditCard` com as informações do cartão de crédito.
@@ -98,9 +470,15 @@ async def get_credit_card_for_key(
         HTTPException(404, "Cartão de crédito não encontrado"): Se o cartão de crédito com o ID especificado não for encontrado.
 
     """
-    credit_card_repository.set_username(username)
-    resp = credit_card_repository.get(session, id=id)
-    return resp
+    if is_conditional(request.headers):
+        version = await execute(repository.get_version, session, id=id)
+        validators = _validators([(id, version)])
+        if is_not_modified(request.headers, *validators):
+            return _not_modified(*validators)
+
+    resp = await execute(repository.get, session, id=id)
+    headers = validator_headers(*_validators([(resp.id, resp.updated_at)]))
+    return ORJSONResponse(serialize_credit_card(resp), headers=headers)
 
 
 @router.post(
@@ -115,9 +493,9 @@ async def get_credit_card_for_key(
 )
 async def create_credit(
     *,
-    session: Session = Depends(get_session),
+    session: Session = Depends(session_dependency),
     data: CreditCardSchema,
-    username: str = Depends(check_token)
+    repository: CartRepository = Depends(get_credit_card_repository),
 ):
     """
     Criação de um novo cartão de crédito.
@@ -127,7 +505,7 @@ async def create_credit(
     Parâmetros:
         session (Session): Uma sessão do banco de dados obtida usando `get_session`.
         data (CreditCardSchema): Os dados do cartão de crédito a serem criados.
-        username (str): O nome de usuário obtido a partir do token de autenticação.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
 
     Retorna:
         CreditCard: Um objeto representando o cartão de crédito recém-criado.
@@ -147,9 +525,101 @@ async def create_credit(
         >>> credit_card = await create_credit(session=session, data=data, username=username)
 
     """
-    credit_card_repository.set_username(username)
-    resp = credit_card_repository.create(session, obj_in=data)
-    return resp
+    resp = await execute(repository.create, session, obj_in=data)
+    return ORJSONResponse(serialize_credit_card(resp))
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkCreateResult,
+    responses={
+        413: {"model": HTTPError, "description": "Too many items in a single request"},
+        422: {"model": HTTPError, "description": "Invalid request body"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/CreditCardSchema"},
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        }
+    },
+)
+async def create_credit_bulk(
+    request: Request,
+    *,
+    session: Session = Depends(session_dependency),
+    username: str = Depends(check_token),
+    repository: CartRepository = Depends(get_credit_card_repository),
+):
+    """
+    Criação de cartões de crédito em lote.
+
+    O corpo pode ser um JSON array ou NDJSON (`Content-Type: application/x-ndjson`, um cartão
+    por linha). Todos os itens são validados de uma vez (`validate_credit_cards_batch`) e os
+    válidos são inseridos em transações de `settings.bulk_chunk_size` cartões. Itens inválidos
+    ou com número já cadastrado não abortam o lote: cada um é reportado individualmente no resultado.
+
+    Parâmetros:
+        request (Request): A requisição, de onde o corpo é lido.
+        session (Session): Uma sessão do banco de dados obtida usando `get_session`.
+        username (str): O nome de usuário obtido a partir do token de autenticação.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
+
+    Retorna:
+        BulkCreateResult: Os totais e o resultado de cada item, na ordem do corpo.
+
+    Exceções:
+        HTTPException(413, "Too many items in a single request"): Se o lote exceder `settings.bulk_max_items`.
+        HTTPException(422, "Invalid request body"): Se o corpo não for um JSON array nem NDJSON.
+
+    """
+    content_type = request.headers.get("content-type", "application/json")
+    try:
+        records = parse_json_records(await request.body(), content_type)
+    except ValueError as e:
+        raise InvalidPayloadError(username, reason=e)
+
+    if len(records) > settings.bulk_max_items:
+        raise PayloadTooLargeError(username, limit=settings.bulk_max_items)
+
+    valid, results = await run_in_threadpool(validate_credit_cards_batch, records)
+
+    for start in range(0, len(valid), settings.bulk_chunk_size):
+        chunk = valid[start : start + settings.bulk_chunk_size]  # noqa: E203
+        ids = await execute(
+            repository.create_many,
+            session,
+            objs_in=[data for _, data in chunk],
+        )
+        for (index, _), obj_id in zip(chunk, ids):
+            if obj_id is None:
+                results.append(
+                    BulkItemResult(
+                        index=index,
+                        status="conflict",
+                        detail="Conflict, this card number already exists",
+                    )
+                )
+            else:
+                results.append(BulkItemResult(index=index, status="created", id=obj_id))
+
+    results.sort(key=lambda item: item.index)
+    statuses = [item.status for item in results]
+    return BulkCreateResult(
+        created=statuses.count("created"),
+        conflicts=statuses.count("conflict"),
+        invalid=statuses.count("invalid"),
+        items=results,
+    )
 
 
 @router.put(
@@ -163,8 +633,8 @@ async def update_credit_card_for_key(
     id: int,
     *,
     data: CreditCardSchemaUpdate,
-    session: Session = Depends(get_session),
-    username: str = Depends(check_token)
+    session: Session = Depends(session_dependency),
+    repository: CartRepository = Depends(get_credit_card_repository),
 ):
     """
     Atualização de informações de um cartão de crédito.
@@ -180,7 +650,7 @@ async def update_credit_card_for_key(
         id (int): O ID do cartão de crédito a ser atualizado.
         data (CreditCardSchemaUpdate): Os dados atualizados do cartão de crédito.
         session (Session): Uma sessão do banco de dados obtida usando `get_session`.
-        username (str): O nome de usuário obtido a partir do token de autenticação.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
 
     Retorna:
         CreditCard: Um objeto representando o cartão de crédito após a atualização.
@@ -201,9 +671,8 @@ async def update_credit_card_for_key(
         ... )
 
     """
-    credit_card_repository.set_username(username)
-    resp = credit_card_repository.update(session, id=id, obj_in=data)
-    return resp
+    resp = await execute(repository.update, session, id=id, obj_in=data)
+    return ORJSONResponse(serialize_credit_card(resp))
 
 
 @router.delete(
@@ -216,8 +685,8 @@ async def update_credit_card_for_key(
 async def delete_credit_card_for_key(
     id: int,
     *,
-    session: Session = Depends(get_session),
-    username: str = Depends(check_token)
+    session: Session = Depends(session_dependency),
+    repository: CartRepository = Depends(get_credit_card_repository),
 ):
     """
     Exclusão de um cartão de crédito.
@@ -228,7 +697,7 @@ async def delete_credit_card_for_key(
     Parâmetros:
         id (int): O ID do cartão de crédito a ser excluído.
         session (Session): Uma sessão do banco de dados obtida usando `get_session`.
-        username (str): O nome de usuário obtido a partir do token de autenticação.
+        repository (CartRepository): O repositório da requisição, já com o usuário autenticado.
 
     Retorna:
         CreditCard: Um objeto representando o cartão de crédito excluído.
@@ -245,6 +714,5 @@ async def delete_credit_card_for_key(
         ... )
 
     """
-    credit_card_repository.set_username(username)
-    resp = credit_card_repository.remove(session, id=id)
-    return resp
+    resp = await execute(repository.remove, session, id=id)
+    return ORJSONResponse(serialize_credit_card(resp))
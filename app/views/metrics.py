@@ -0,0 +1,22 @@
+"""
+## Modulo de Métricas
+Esse módulo é responsável por disponibilizar as métricas da aplicação no formato do Prometheus.
+"""
+import logging
+
+from fastapi import APIRouter, Response
+
+from app.metrics import render_metrics
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    """
+    Métricas de todos os workers do servidor, no formato de texto do Prometheus.
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, headers={"Content-Type": content_type})
@@ -0,0 +1,14 @@
+"""
+## Microbenchmarks dos Componentes da Requisição.
+Mede, isoladamente, o tempo e a memória de cada componente do caminho de uma requisição:
+validação do `CreditCardSchema`, `hashable`, `datetime_validator`, `create_access_token`,
+`check_token` e as operações do `CRUDBase` em um SQLite em memória.
+
+Os benchmarks não são coletados pelo pytest (`--ignore=tests/benchmarks`); eles são executados
+pelo runner, que salva os resultados em JSON e compara com um baseline salvo antes:
+
+Example:
+    python -m tests.benchmarks --save .benchmarks/baseline.json
+    python -m tests.benchmarks --compare .benchmarks/baseline.json --threshold 0.2
+    python -m tests.benchmarks -k crud
+"""
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+
+from tests.benchmarks import bench_components  # noqa: F401  (registra os benchmarks)
+from tests.benchmarks.runner import compare, load, run, save
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.benchmarks",
+        description="Microbenchmarks dos componentes da requisição.",
+    )
+    parser.add_argument(
+        "-k", dest="pattern", help="executa apenas os nomes com o texto"
+    )
+    parser.add_argument("--repeat", type=int, default=7, help="rodadas cronometradas")
+    parser.add_argument("--save", metavar="PATH", help="salva os resultados em JSON")
+    parser.add_argument(
+        "--compare", metavar="PATH", help="compara com um baseline JSON"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="piora máxima aceita na comparação (0.2 = 20%%)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = load(args.compare) if args.compare else None
+    results = run(args.pattern, repeat=args.repeat)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        save(args.save, results)
+        print(f"results saved to {args.save}")
+
+    if baseline is not None:
+        regressions = compare(baseline, results, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"no regressions against {args.compare} (threshold {args.threshold:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+import itertools
+from datetime import timedelta
+
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.auth import check_token, create_access_token, token_cache
+from app.db.crud import CRUDBase
+from app.db.filters import CreditCardFilter
+from app.db.model import CreditCard
+from app.db.schema import CreditCardSchema
+from app.db.search import holder_search_index
+from app.fingerprint import card_fingerprint
+from app.utils import datetime_validator, hashable, parse_expiry
+from tests.benchmarks.runner import benchmark
+from tests.mocks.credit_card import (
+    VALID_VISA_CREDIT_CARD_NUMBER,
+    valid_visa_credit_card_json,
+)
+
+SEED_ROWS = 1000
+
+
+@benchmark("schema.credit_card")
+def credit_card_schema():
+    return lambda: CreditCardSchema(**valid_visa_credit_card_json)
+
+
+@benchmark("utils.hashable")
+def utils_hashable():
+    return lambda: hashable(VALID_VISA_CREDIT_CARD_NUMBER)
+
+
+@benchmark("utils.datetime_validator")
+def utils_datetime_validator():
+    return lambda: datetime_validator("01/2029")
+
+
+@benchmark("utils.parse_expiry.uncached")
+def utils_parse_expiry_uncached():
+    return lambda: parse_expiry.__wrapped__("01/2029")
+
+
+@benchmark("auth.create_access_token")
+def auth_create_access_token():
+    return lambda: create_access_token({"sub": "bench"}, timedelta(minutes=5))
+
+
+@benchmark("auth.check_token.cached")
+def auth_check_token_cached():
+    token = create_access_token({"sub": "bench"}, timedelta(minutes=5))
+    return lambda: check_token(token)
+
+
+@benchmark("auth.check_token.uncached")
+def auth_check_token_uncached():
+    token = create_access_token({"sub": "bench"}, timedelta(minutes=5))
+
+    def run():
+        token_cache.clear()
+        return check_token(token)
+
+    return run
+
+
+def _card(index: int) -> CreditCardSchema:
+    """Monta um cartão já validado, com um número (impressão digital) único por índice."""
+    return CreditCardSchema.construct(
+        holder=f"Titular {index:06d}",
+        number=card_fingerprint(f"{index:016d}"),
+        exp_date="2029-01-31",
+        cvv=123,
+        brand="visa" if index % 2 else "master",
+    )
+
+
+def _crud():
+    """Cria um SQLite em memória com `SEED_ROWS` cartões e o `CRUDBase` de cartões."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    SQLModel.metadata.create_all(engine)
+    session = Session(engine)
+    crud = CRUDBase(CreditCard, search_index=holder_search_index)
+    crud.create_many(session, objs_in=[_card(index) for index in range(SEED_ROWS)])
+    return crud, session
+
+
+@benchmark("crud.create")
+def crud_create():
+    crud, session = _crud()
+    counter = itertools.count(SEED_ROWS)
+    return lambda: crud.create(session, obj_in=_card(next(counter)))
+
+
+@benchmark("crud.get")
+def crud_get():
+    crud, session = _crud()
+    ids = itertools.cycle(range(1, SEED_ROWS + 1))
+
+    def run():
+        session.expunge_all()
+        return crud.get(session, next(ids))
+
+    return run
+
+
+@benchmark("crud.get_multi")
+def crud_get_multi():
+    crud, session = _crud()
+
+    def run():
+        session.expunge_all()
+        return crud.get_multi(session, skip=0, limit=100)
+
+    return run
+
+
+@benchmark("crud.get_multi.filtered")
+def crud_get_multi_filtered():
+    crud, session = _crud()
+    filters = CreditCardFilter(
+        brand="visa", holder_prefix="Titular 0001", sort="-holder"
+    )
+
+    def run():
+        session.expunge_all()
+        return crud.get_multi(session, skip=0, limit=100, filters=filters)
+
+    return run
+
+
+@benchmark("crud.get_multi.fields")
+def crud_get_multi_fields():
+    crud, session = _crud()
+    return lambda: crud.get_multi(session, skip=0, limit=100, fields=["id", "holder"])
+
+
+@benchmark("crud.count")
+def crud_count():
+    crud, session = _crud()
+    return lambda: crud.count(session)
+
+
+@benchmark("crud.search")
+def crud_search():
+    crud, session = _crud()
+
+    def run():
+        session.expunge_all()
+        return crud.search(session, query="0042")
+
+    return run
+
+
+@benchmark("crud.update")
+def crud_update():
+    crud, session = _crud()
+    names = itertools.cycle(["Titular A", "Titular B"])
+    return lambda: crud.update(session, id=1, obj_in={"holder": next(names)})
@@ -0,0 +1,219 @@
+"""
+## Runner dos Microbenchmarks.
+Registro, medição, baseline em JSON e comparação dos benchmarks de `tests.benchmarks`.
+
+Cada benchmark é uma função de preparação, registrada com `@benchmark`, que monta o seu estado
+(engine, tokens, payloads) fora da medição e retorna a função sem argumentos a ser medida.
+
+Medições de cada benchmark:
+
+- Tempo: `timeit`, com o coletor de lixo desligado. O número de chamadas por rodada é calibrado
+até a rodada levar pelo menos `MIN_ROUND_TIME`; são feitas `repeat` rodadas e guardados o
+mínimo (a medida mais estável, usada na comparação) e a mediana, por chamada.
+- Memória: `tracemalloc`, em execuções separadas das cronometradas (o rastreamento deixa o
+código várias vezes mais lento). `peak_bytes` é o pico de memória alocada durante uma chamada,
+descontada a memória já em uso; `retained_blocks` é a média de blocos que continuam alocados
+após cada chamada, o que revela caches crescendo ou vazamentos.
+"""
+import gc
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+MIN_ROUND_TIME = 0.05
+
+ALLOCATION_CALLS = 50
+
+PEAK_BYTES_SLACK = 256
+
+Setup = Callable[[], Callable[[], Any]]
+
+registry: Dict[str, Setup] = {}
+
+
+def benchmark(name: str) -> Callable[[Setup], Setup]:
+    """
+    Registra uma função de preparação de benchmark com o nome informado.
+
+    Args:
+        name (str): O nome do benchmark, no formato `componente.operação`.
+
+    Returns:
+        value (Callable[[Setup], Setup]): O decorator, que devolve a função sem alterações.
+
+    Raises:
+        ValueError: Se já existir um benchmark com o mesmo nome.
+
+    Example:
+        @benchmark("utils.hashable")
+        def hashable_benchmark():
+            return lambda: hashable("4539578763621486")
+    """
+
+    def register(setup: Setup) -> Setup:
+        if name in registry:
+            raise ValueError(f"Benchmark {name} already registered")
+        registry[name] = setup
+        return setup
+
+    return register
+
+
+def _calibrate(timer: timeit.Timer) -> int:
+    """Dobra o número de chamadas por rodada até a rodada levar `MIN_ROUND_TIME`."""
+    number = 1
+    while True:
+        if timer.timeit(number) >= MIN_ROUND_TIME:
+            return number
+        number *= 2
+
+
+def _allocations(func: Callable[[], Any]) -> Dict[str, int]:
+    """Mede o pico de memória de uma chamada e os blocos retidos por chamada."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        before = tracemalloc.take_snapshot().filter_traces(ignore)
+        for _ in range(ALLOCATION_CALLS):
+            func()
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(ignore)
+    finally:
+        tracemalloc.stop()
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "peak_bytes": max(peak - baseline, 0),
+        "retained_blocks": round(blocks / ALLOCATION_CALLS),
+    }
+
+
+def measure(func: Callable[[], Any], repeat: int = 7) -> Dict[str, Any]:
+    """
+    Mede o tempo e a memória de uma função sem argumentos.
+
+    Args:
+        func (Callable[[], Any]): A função medida, já preparada.
+        repeat (int, optional): O número de rodadas cronometradas. (Padrão: 7)
+
+    Returns:
+        value (Dict[str, Any]): `min_us` e `median_us` por chamada, `number` e `repeat` das rodadas,
+        `peak_bytes` e `retained_blocks`.
+    """
+    func()
+    timer = timeit.Timer(func)
+    number = _calibrate(timer)
+    rounds = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat, number)]
+    result: Dict[str, Any] = {
+        "min_us": round(min(rounds), 3),
+        "median_us": round(statistics.median(rounds), 3),
+        "number": number,
+        "repeat": repeat,
+    }
+    result.update(_allocations(func))
+    return result
+
+
+def run(pattern: Optional[str] = None, repeat: int = 7) -> Dict[str, Dict[str, Any]]:
+    """
+    Executa os benchmarks registrados, em ordem alfabética.
+
+    Args:
+        pattern (Optional[str], optional): Executa apenas os benchmarks cujo nome contém o texto.
+        repeat (int, optional): O número de rodadas cronometradas de cada benchmark. (Padrão: 7)
+
+    Returns:
+        value (Dict[str, Dict[str, Any]]): O resultado de `measure` de cada benchmark, pelo nome.
+    """
+    results = {}
+    for name in sorted(registry):
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(registry[name](), repeat=repeat)
+        print(format_result(name, results[name]), flush=True)
+    return results
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str:
+    """Formata o resultado de um benchmark em uma linha."""
+    return (
+        f"{name:<32} {result['min_us']:>12.2f} us  {result['median_us']:>12.2f} us"
+        f"  {result['peak_bytes']:>10} B  {result['retained_blocks']:>6} blocks"
+    )
+
+
+def metadata() -> Dict[str, str]:
+    """Descreve o ambiente da execução, salvo junto com os resultados."""
+    return {
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def save(path: str, results: Dict[str, Dict[str, Any]]) -> None:
+    """Salva os resultados e os metadados do ambiente em um arquivo JSON."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"metadata": metadata(), "results": results}, file, indent=2)
+        file.write("\n")
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    """Lê os resultados de um arquivo JSON salvo por `save`."""
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)["results"]
+
+
+def compare(
+    baseline: Dict[str, Dict[str, Any]],
+    results: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[str]:
+    """
+    Compara os resultados com um baseline.
+
+    Um benchmark regride quando o tempo mínimo ou o pico de memória passam do baseline por mais
+    de `threshold` (fração, `0.2` = 20%). O pico de memória tem ainda uma folga absoluta de
+    `PEAK_BYTES_SLACK` bytes, para que pequenas variações do alocador em benchmarks que quase
+    não alocam não sejam sinalizadas. Benchmarks ausentes do baseline são ignorados.
+
+    Args:
+        baseline (Dict[str, Dict[str, Any]]): Os resultados de referência, de `load`.
+        results (Dict[str, Dict[str, Any]]): Os resultados atuais, de `run`.
+        threshold (float): A piora máxima aceita.
+
+    Returns:
+        value (List[str]): A descrição de cada regressão; vazia se não houver nenhuma.
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        time_ratio = (
+            result["min_us"] / reference["min_us"] if reference["min_us"] else 1.0
+        )
+        if time_ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: time {reference['min_us']:.2f} -> {result['min_us']:.2f} us "
+                f"(+{(time_ratio - 1) * 100:.0f}%)"
+            )
+        peak_limit = reference["peak_bytes"] * (1 + threshold) + PEAK_BYTES_SLACK
+        if result["peak_bytes"] > peak_limit:
+            regressions.append(
+                f"{name}: peak memory {reference['peak_bytes']} -> {result['peak_bytes']} B"
+            )
+    return regressions
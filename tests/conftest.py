@@ -9,6 +9,8 @@ from sqlmodel.pool import StaticPool
 from app import create_app
 from app.auth import create_access_token
 from app.db.model import get_session
+from app.db.repository import get_count_cache, get_record_cache
+from app.timing import instrument_engine
 
 
 @pytest.fixture
@@ -37,6 +39,7 @@ def session():
         "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
     )
     SQLModel.metadata.create_all(engine)
+    instrument_engine(engine)
     with Session(engine) as session:
         yield session
 
@@ -47,6 +50,9 @@ def client(app, session: Session) -> Generator:
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    for cache in (get_record_cache(), get_count_cache()):
+        if cache is not None:
+            cache.clear()
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
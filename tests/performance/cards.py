@@ -0,0 +1,107 @@
+"""
+## Gerador de Números de Cartão para os Testes de Carga.
+Gera números de cartão válidos no Luhn, de várias bandeiras, sem repetição dentro do processo,
+para que cada "Create credit card" do Locust crie um cartão novo em vez de receber 409.
+
+A parte variável de cada número percorre uma permutação do espaço de dígitos da bandeira
+(`inicio + n * passo`, módulo 10^k, com o passo primo com 10), a partir de um início aleatório
+por processo: os números não se repetem até o espaço se esgotar e não há um conjunto dos números
+já emitidos crescendo em testes longos. Processos diferentes (workers do Locust distribuído)
+começam em pontos aleatórios, e a chance de colisão entre eles é desprezível.
+
+Os prefixos de cada bandeira ficam fora das faixas mais específicas de `app/data/brands.json`
+(por exemplo, Elo `401178` dentro da faixa Visa `4` e Elo `650031` dentro da Discover `65`),
+para que a bandeira gravada pela API seja a mesma do número gerado.
+"""
+import os
+import random
+from typing import Dict, Optional, Sequence, Tuple
+
+BRANDS: Dict[str, Tuple[Sequence[str], int]] = {
+    "visa": (("4532", "4539", "4556", "4916", "4929"), 16),
+    "master": (("51", "52", "53", "54", "55"), 16),
+    "amex": (("34", "37"), 15),
+    "discover": (("6011", "659"), 16),
+    "diners": (("36",), 14),
+}
+
+BRAND_WEIGHTS: Dict[str, int] = {
+    "visa": 45,
+    "master": 35,
+    "amex": 10,
+    "discover": 5,
+    "diners": 5,
+}
+
+STEP = 7_654_321_987
+
+
+def luhn_check_digit(partial: str) -> str:
+    """
+    Calcula o dígito verificador de Luhn a ser acrescentado ao final do número.
+
+    Args:
+        partial (str): O número sem o dígito verificador.
+
+    Returns:
+        value (str): O dígito verificador.
+
+    Example:
+        luhn_check_digit("453957876362148")  # "6"
+    """
+    total = 0
+    for position, char in enumerate(reversed(partial)):
+        digit = int(char)
+        if position % 2 == 0:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return str((10 - total % 10) % 10)
+
+
+class CardNumberGenerator:
+    """
+    Gera números de cartão válidos no Luhn, sem repetição, na proporção de `BRAND_WEIGHTS`.
+
+    **Atributos**
+
+    * `random` (random.Random): O gerador aleatório; com `seed`, a sequência é reproduzível.
+
+    **Métodos**
+
+    * `number(brand: Optional[str] = None) -> str`: Um número novo da bandeira, ou de uma
+    bandeira sorteada pelos pesos.
+
+    Example:
+        generator = CardNumberGenerator(seed=42)
+        generator.number("visa")  # 16 dígitos, iniciado por 4
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        self.random = random.Random(seed)
+        self._brands = list(BRAND_WEIGHTS)
+        self._weights = [BRAND_WEIGHTS[brand] for brand in self._brands]
+        self._positions: Dict[Tuple[str, int], int] = {}
+
+    def _body(self, prefix: str, length: int) -> str:
+        """Retorna a próxima parte variável da permutação do prefixo."""
+        digits = length - len(prefix) - 1
+        space = 10**digits
+        key = (prefix, length)
+        position = self._positions.get(key)
+        if position is None:
+            position = self.random.randrange(space)
+        self._positions[key] = position + 1
+        return f"{(position * STEP) % space:0{digits}d}"
+
+    def number(self, brand: Optional[str] = None) -> str:
+        """Gera um número novo da bandeira informada ou de uma bandeira sorteada."""
+        if brand is None:
+            brand = self.random.choices(self._brands, weights=self._weights)[0]
+        prefixes, length = BRANDS[brand]
+        prefix = self.random.choice(prefixes)
+        partial = prefix + self._body(prefix, length)
+        return partial + luhn_check_digit(partial)
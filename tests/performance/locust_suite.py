@@ -1,10 +1,27 @@
-from locust import HttpUser, LoadTestShape
+from locust import HttpUser, LoadTestShape, events
 
+from tests.performance import shapes
 from tests.performance.auth import AuthLoadTest
 from tests.performance.credit_card import CreditCardLoadTest
 from tests.performance.health import HealthLoadTest
 
 
+@events.init_command_line_parser.add_listener
+def add_shape_arguments(parser):
+    parser.add_argument(
+        "--load-shape",
+        choices=list(shapes.SHAPES),
+        default="ramp",
+        help="Formato de carga: ramp, step, spike ou soak",
+    )
+    parser.add_argument(
+        "--shape-users", type=int, default=1000, help="Máximo de usuários simultâneos"
+    )
+    parser.add_argument(
+        "--shape-duration", type=int, default=60, help="Duração do teste, em segundos"
+    )
+
+
 class SuiteTest(HttpUser):
     tasks = [
         CreditCardLoadTest,
@@ -14,14 +31,12 @@ class SuiteTest(HttpUser):
 
 
 class TestShape(LoadTestShape):
-    stages = [
-        {"duration": 60, "users": 1000, "spawn_rate": 20},
-    ]
+    stages = None
 
     def tick(self):
-        run_time = self.get_run_time()
-
-        for stage in self.stages:
-            if run_time < stage["duration"]:
-                tick_data = (stage["users"], stage["spawn_rate"])
-                return tick_data
+        if self.stages is None:
+            options = self.runner.environment.parsed_options
+            self.stages = shapes.stages(
+                options.load_shape, options.shape_users, options.shape_duration
+            )
+        return shapes.tick(self.stages, self.get_run_time())
@@ -0,0 +1,113 @@
+"""
+## Formatos de Carga dos Testes de Carga.
+Estágios de cada formato de carga do Locust, escolhido em `locust.conf` (`load-shape`):
+
+- `ramp`: sobe linearmente até `shape-users` usuários e os mantém até o fim.
+- `step`: sobe em `SHAPE_STEPS` degraus iguais, cada um mantido pela mesma duração.
+- `spike`: carga base de `SPIKE_BASE` dos usuários, com um pico de todos os usuários durante
+`SPIKE_WINDOW` da duração, no meio do teste, e a volta à carga base.
+- `soak`: sobe em `SOAK_RAMP` da duração e mantém a carga pelo restante, para encontrar
+vazamentos de memória e degradação ao longo do tempo.
+
+Cada estágio é um dicionário `{"duration", "users", "spawn_rate"}`, onde `duration` é o instante
+(em segundos desde o início) em que o estágio termina.
+"""
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+Stage = Dict[str, int]
+
+SHAPE_STEPS = 5
+
+SPIKE_BASE = 0.1
+
+SPIKE_WINDOW = 0.2
+
+SOAK_RAMP = 0.1
+
+
+def _rate(users: int, seconds: float) -> int:
+    """Calcula a taxa de criação de usuários para chegar a `users` em `seconds`."""
+    return max(math.ceil(users / max(seconds, 1)), 1)
+
+
+def ramp(users: int, duration: int) -> List[Stage]:
+    """Sobe até `users` usuários ao longo de toda a duração."""
+    return [
+        {"duration": duration, "users": users, "spawn_rate": _rate(users, duration)}
+    ]
+
+
+def step(users: int, duration: int) -> List[Stage]:
+    """Sobe em `SHAPE_STEPS` degraus iguais de usuários e de duração."""
+    step_users = max(users // SHAPE_STEPS, 1)
+    step_time = duration / SHAPE_STEPS
+    rate = _rate(step_users, step_time / 10)
+    return [
+        {
+            "duration": round(step_time * index),
+            "users": users if index == SHAPE_STEPS else step_users * index,
+            "spawn_rate": rate,
+        }
+        for index in range(1, SHAPE_STEPS + 1)
+    ]
+
+
+def spike(users: int, duration: int) -> List[Stage]:
+    """Mantém a carga base, com um pico de todos os usuários no meio do teste."""
+    base = max(round(users * SPIKE_BASE), 1)
+    start = round(duration * (1 - SPIKE_WINDOW) / 2)
+    end = round(duration * (1 + SPIKE_WINDOW) / 2)
+    return [
+        {"duration": start, "users": base, "spawn_rate": _rate(base, start / 10)},
+        {"duration": end, "users": users, "spawn_rate": _rate(users, 5)},
+        {"duration": duration, "users": base, "spawn_rate": _rate(users, 5)},
+    ]
+
+
+def soak(users: int, duration: int) -> List[Stage]:
+    """Sobe em `SOAK_RAMP` da duração e mantém a carga até o fim."""
+    ramp_time = max(round(duration * SOAK_RAMP), 1)
+    rate = _rate(users, ramp_time)
+    return [
+        {"duration": ramp_time, "users": users, "spawn_rate": rate},
+        {"duration": duration, "users": users, "spawn_rate": rate},
+    ]
+
+
+SHAPES: Dict[str, Callable[[int, int], List[Stage]]] = {
+    "ramp": ramp,
+    "step": step,
+    "spike": spike,
+    "soak": soak,
+}
+
+
+def stages(name: str, users: int, duration: int) -> List[Stage]:
+    """
+    Monta os estágios do formato de carga.
+
+    Args:
+        name (str): O formato, uma das chaves de `SHAPES`.
+        users (int): O número máximo de usuários simultâneos.
+        duration (int): A duração total do teste, em segundos.
+
+    Returns:
+        value (List[Stage]): Os estágios, em ordem.
+
+    Raises:
+        ValueError: Se o formato não existir.
+    """
+    if name not in SHAPES:
+        raise ValueError(
+            f"Unknown load shape {name}, choose one of {', '.join(SHAPES)}"
+        )
+    return SHAPES[name](users, duration)
+
+
+def tick(stage_list: List[Stage], run_time: float) -> Optional[Tuple[int, int]]:
+    """Retorna `(usuários, taxa)` do estágio do instante, ou None para encerrar o teste."""
+    for stage in stage_list:
+        if run_time < stage["duration"]:
+            return stage["users"], stage["spawn_rate"]
+    return None
@@ -0,0 +1,135 @@
+"""
+## Verificação de SLO dos Testes de Carga.
+Confere o arquivo de estatísticas do Locust (`serveres_test_stats.csv`, gerado pela opção `csv`
+de `locust.conf`) contra os limites de latência (p50, p95 e p99, em milissegundos) e de taxa de
+erros, e termina com código 1 se algum limite for ultrapassado.
+
+Os limites valem para a linha `Aggregated` e, com `--per-endpoint`, também para cada requisição.
+
+Example:
+    python -m tests.performance.slo serveres_test_stats.csv
+    python -m tests.performance.slo serveres_test_stats.csv --p95 300 --max-error-rate 0.005
+"""
+import argparse
+import csv
+import sys
+from typing import Dict, List, Optional
+
+AGGREGATED = "Aggregated"
+
+DEFAULT_BUDGETS: Dict[str, float] = {
+    "p50": 100,
+    "p95": 500,
+    "p99": 1000,
+    "max_error_rate": 0.01,
+}
+
+PERCENTILE_COLUMNS = {"p50": "50%", "p95": "95%", "p99": "99%"}
+
+
+def _number(value: str) -> Optional[float]:
+    """Converte uma célula do CSV, que é `N/A` quando não houve requisições."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_stats(path: str) -> List[Dict[str, str]]:
+    """Lê as linhas do arquivo `<prefixo>_stats.csv` do Locust."""
+    with open(path, newline="", encoding="utf-8") as file:
+        return list(csv.DictReader(file))
+
+
+def check_row(row: Dict[str, str], budgets: Dict[str, float]) -> List[str]:
+    """
+    Confere uma linha de estatísticas contra os limites.
+
+    Args:
+        row (Dict[str, str]): A linha do CSV, com as colunas `Name`, `Request Count`,
+        `Failure Count` e os percentis.
+        budgets (Dict[str, float]): Os limites `p50`, `p95`, `p99` (ms) e `max_error_rate` (fração).
+
+    Returns:
+        value (List[str]): A descrição de cada limite ultrapassado; vazia se a linha estiver dentro.
+    """
+    name = row["Name"]
+    violations = []
+    for budget, column in PERCENTILE_COLUMNS.items():
+        value = _number(row.get(column, ""))
+        if value is not None and value > budgets[budget]:
+            violations.append(
+                f"{name}: {budget} {value:.0f} ms > {budgets[budget]:.0f} ms"
+            )
+
+    requests = _number(row.get("Request Count", "")) or 0
+    failures = _number(row.get("Failure Count", "")) or 0
+    if requests:
+        error_rate = failures / requests
+        if error_rate > budgets["max_error_rate"]:
+            violations.append(
+                f"{name}: error rate {error_rate:.2%} > {budgets['max_error_rate']:.2%}"
+            )
+    return violations
+
+
+def check(
+    rows: List[Dict[str, str]], budgets: Dict[str, float], per_endpoint: bool = False
+) -> List[str]:
+    """
+    Confere as estatísticas do teste contra os limites.
+
+    Args:
+        rows (List[Dict[str, str]]): As linhas de `read_stats`.
+        budgets (Dict[str, float]): Os limites, veja `check_row`.
+        per_endpoint (bool, optional): Confere também cada requisição, além da linha `Aggregated`.
+
+    Returns:
+        value (List[str]): A descrição de cada limite ultrapassado.
+
+    Raises:
+        ValueError: Se o arquivo não tiver a linha `Aggregated`.
+    """
+    aggregated = [row for row in rows if row["Name"] == AGGREGATED]
+    if not aggregated:
+        raise ValueError(f"No {AGGREGATED} row in the Locust stats")
+    selected = rows if per_endpoint else aggregated
+    return [violation for row in selected for violation in check_row(row, budgets)]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m tests.performance.slo",
+        description="Confere as estatísticas do Locust contra os limites de latência e de erros.",
+    )
+    parser.add_argument("stats", help="arquivo <prefixo>_stats.csv do Locust")
+    for budget in PERCENTILE_COLUMNS:
+        parser.add_argument(
+            f"--{budget}",
+            type=float,
+            default=DEFAULT_BUDGETS[budget],
+            help=f"limite do {budget}, em ms",
+        )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=DEFAULT_BUDGETS["max_error_rate"],
+        help="fração máxima de falhas",
+    )
+    parser.add_argument(
+        "--per-endpoint", action="store_true", help="confere também cada requisição"
+    )
+    args = parser.parse_args(argv)
+
+    budgets = {budget: getattr(args, budget) for budget in DEFAULT_BUDGETS}
+    violations = check(read_stats(args.stats), budgets, per_endpoint=args.per_endpoint)
+    for violation in violations:
+        print(f"SLO FAILED {violation}")
+    if violations:
+        return 1
+    print(f"SLO passed: {budgets}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
 import faker
 from locust import TaskSet
 
+from tests.performance.cards import CardNumberGenerator
+
 
 class BaseLoadTest(TaskSet):
     fake = faker.Faker()
+    cards = CardNumberGenerator()
 
     def on_start(self):
         resp = self.client.post(
@@ -13,13 +16,10 @@ class BaseLoadTest(TaskSet):
         token = resp.json()["access_token"]
         self.client.headers = {"token": token}
 
-    def get_many_credit_cards(self):
-        return [
-            "4539578763621486",
-            "4111111111111111",
-            "5186001700009726",
-            "5186001700008785",
-            "5186001700008876",
-            "5186001700009908",
-            "5186001700001434",
-        ]
+    def new_credit_card(self):
+        return {
+            "number": self.cards.number(),
+            "holder": self.fake.name(),
+            "exp_date": self.fake.credit_card_expire(date_format="%m/%Y"),
+            "cvv": self.fake.random_int(100, 999),
+        }
@@ -1,11 +1,15 @@
+import json
 from unittest.mock import patch
 
 import pytest
 
-from app.db.repository import credit_card_repository
+from app.db.model import CreditCard
+from app.db.repository import CartRepository, get_record_cache
 from app.exceptions.crud_error import CRUDCreateError
 from tests.mocks.auth import INVALID_TOKEN
 from tests.mocks.credit_card import (
+    VALID_MASTER_CREDIT_CARD_NUMBER,
+    VALID_VISA_CREDIT_CARD_NUMBER,
     invalid_credit_card_json,
     valid_master_credit_card,
     valid_master_credit_card_json,
@@ -18,6 +22,8 @@ from tests.mocks.credit_card import (
     valid_visa_credit_card_json,
 )
 
+credit_card_repository = CartRepository(CreditCard, cache=get_record_cache())
+
 
 def test_create_credit(client, url_v1, header):
     holder = valid_visa_credit_card_json["holder"]
@@ -121,6 +127,80 @@ def test_list_all_credit_card(client, url_v1, header, session):
     assert len(response.json()) == 2
 
 
+def test_list_all_credit_card_with_fields(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+
+    response = client.get(
+        f"{url_v1}/credit-card/",
+        params={"fields": "id, holder,brand,id"},
+        headers=header,
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {
+            "id": 1,
+            "holder": valid_visa_credit_card.holder,
+            "brand": valid_visa_credit_card.brand,
+        }
+    ]
+
+
+def test_list_all_credit_card_with_unknown_fields(client, url_v1, header):
+    response = client.get(
+        f"{url_v1}/credit-card/", params={"fields": "holder,password"}, headers=header
+    )
+    assert response.status_code == 400
+
+
+def test_list_all_credit_card_with_filters_and_sort(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    credit_card_repository.create(session, obj_in=valid_master_credit_card)
+
+    response = client.get(
+        f"{url_v1}/credit-card/",
+        params={"brand": "master", "fields": "holder"},
+        headers=header,
+    )
+    assert response.json() == [{"holder": valid_master_credit_card.holder}]
+
+    response = client.get(
+        f"{url_v1}/credit-card/",
+        params={"holder_prefix": "Test User", "sort": "-holder", "fields": "holder"},
+        headers=header,
+    )
+    assert [row["holder"] for row in response.json()] == ["Test User 2", "Test User 1"]
+
+
+def test_list_all_credit_card_with_invalid_sort(client, url_v1, header):
+    response = client.get(
+        f"{url_v1}/credit-card/", params={"sort": "cvv"}, headers=header
+    )
+    assert response.status_code == 422
+
+
+def test_search_credit_card_by_holder(client, url_v1, header):
+    client.post(
+        f"{url_v1}/credit-card/", json=valid_visa_credit_card_json, headers=header
+    )
+    client.post(
+        f"{url_v1}/credit-card/",
+        json={**valid_master_credit_card_json, "holder": "Maria Silva"},
+        headers=header,
+    )
+
+    response = client.get(
+        f"{url_v1}/credit-card/search", params={"q": "SILV"}, headers=header
+    )
+    assert response.status_code == 200
+    assert [card["holder"] for card in response.json()] == ["Maria Silva"]
+    assert response.headers["X-Search-Truncated"] == "false"
+
+    response = client.get(
+        f"{url_v1}/credit-card/search", params={"q": "us"}, headers=header
+    )
+    assert response.status_code == 422
+
+
 def test_get_credit_card_for_key(client, url_v1, header, session):
     holder = valid_visa_credit_card.holder
     card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
@@ -130,6 +210,83 @@ def test_get_credit_card_for_key(client, url_v1, header, session):
     assert response.json()["holder"] == holder
 
 
+def test_get_credit_card_conditional_requests(client, url_v1, header, session):
+    card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    url = f"{url_v1}/credit-card/{card.id}"
+
+    response = client.get(url, headers={**header, "Origin": "https://example.com"})
+    etag, last_modified = response.headers["ETag"], response.headers["Last-Modified"]
+    assert "ETag" in response.headers["Access-Control-Expose-Headers"].split(", ")
+
+    response = client.get(url, headers={**header, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    response = client.get(url, headers={**header, "If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    client.put(url, json={"holder": "Novo Titular"}, headers=header)
+    response = client.get(url, headers={**header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["holder"] == "Novo Titular"
+
+
+def test_list_credit_card_conditional_requests(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    url = f"{url_v1}/credit-card/"
+
+    etag = client.get(url, headers=header).headers["ETag"]
+    response = client.get(url, headers={**header, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    response = client.get(
+        url, params={"fields": "id"}, headers={**header, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    credit_card_repository.create(session, obj_in=valid_master_credit_card)
+    response = client.get(url, headers={**header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+
+
+def test_list_credit_card_conditional_requests_after_delete(
+    client, url_v1, header, session
+):
+    first = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    credit_card_repository.create(session, obj_in=valid_master_credit_card)
+    url = f"{url_v1}/credit-card/"
+
+    response = client.get(url, params={"fields": "holder"}, headers=header)
+    etag = response.headers["ETag"]
+    assert "Last-Modified" not in response.headers
+    assert response.json() == [
+        {"holder": valid_visa_credit_card.holder},
+        {"holder": valid_master_credit_card.holder},
+    ]
+
+    client.delete(f"{url}{first.id}", headers=header)
+    response = client.get(
+        url,
+        params={"fields": "holder"},
+        headers={
+            **header,
+            "If-None-Match": etag,
+            "If-Modified-Since": "Tue, 01 Jan 2030 12:00:00 GMT",
+        },
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"holder": valid_master_credit_card.holder}]
+
+    response = client.get(
+        url, headers={**header, "If-Modified-Since": "Tue, 01 Jan 2030 12:00:00 GMT"}
+    )
+    assert response.status_code == 200
+
+
 def test_get_credit_card_for_key_with_invalid_token(client, url_v1, session):
     card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
 
@@ -173,7 +330,7 @@ def test_delete_credit_card(client, url_v1, header, session):
 
 def test_create_credit_with_payload_empty(client, url_v1, header):
     with patch(
-        "app.db.repository.credit_card_repository.create",
+        "app.db.repository.CartRepository.create",
         side_effect=Exception("mocked error"),
     ):
         with pytest.raises(Exception):
@@ -182,3 +339,203 @@ def test_create_credit_with_payload_empty(client, url_v1, header):
                 json=valid_master_credit_card_json,
                 headers=header,
             )
+
+
+def test_list_credit_card_page_walks_with_cursor(client, url_v1, header, session):
+    first_card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    second_card = credit_card_repository.create(
+        session, obj_in=valid_master_credit_card
+    )
+
+    response = client.get(f"{url_v1}/credit-card/page?limit=1", headers=header)
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [item["id"] for item in first_page["items"]] == [first_card.id]
+    assert first_page["next_cursor"]
+
+    response = client.get(
+        f"{url_v1}/credit-card/page",
+        params={"limit": 1, "cursor": first_page["next_cursor"]},
+        headers=header,
+    )
+    assert response.status_code == 200
+    second_page = response.json()
+    assert [item["id"] for item in second_page["items"]] == [second_card.id]
+    assert second_page["next_cursor"] is None
+
+
+def test_list_credit_card_with_total(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    credit_card_repository.create(session, obj_in=valid_master_credit_card)
+
+    response = client.get(
+        f"{url_v1}/credit-card/",
+        params={"with_total": True, "limit": 1, "skip": 1},
+        headers=header,
+    )
+    assert response.headers["X-Total-Count"] == "2"
+    assert response.headers["X-Total-Pages"] == "2"
+    assert response.headers["X-Page"] == "2"
+
+    response = client.get(
+        f"{url_v1}/credit-card/",
+        params={"with_total": True, "brand": "visa"},
+        headers=header,
+    )
+    assert response.headers["X-Total-Count"] == "1"
+
+    response = client.get(f"{url_v1}/credit-card/", headers=header)
+    assert "X-Total-Count" not in response.headers
+
+    response = client.get(
+        f"{url_v1}/credit-card/page",
+        params={"with_total": True, "limit": 1},
+        headers=header,
+    )
+    assert response.json()["total"] == 2
+    assert response.json()["total_pages"] == 2
+
+
+def test_list_credit_card_page_with_invalid_cursor(client, url_v1, header):
+    response = client.get(
+        f"{url_v1}/credit-card/page", params={"cursor": "invalid"}, headers=header
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Invalid pagination cursor")
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_export_credit_cards_as_ndjson(client, url_v1, header, session, compress):
+    first_card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    second_card = credit_card_repository.create(
+        session, obj_in=valid_master_credit_card
+    )
+
+    response = client.get(
+        f"{url_v1}/credit-card/export", params={"gzip": compress}, headers=header
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert (response.headers.get("content-encoding") == "gzip") is compress
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["id"] for line in lines] == [first_card.id, second_card.id]
+    assert lines[0]["holder"] == valid_visa_credit_card.holder
+
+
+def test_create_credit_bulk_reports_each_item(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_master_credit_card)
+    payload = [
+        valid_visa_credit_card_json,
+        valid_visa_credit_card_json,
+        valid_master_credit_card_json,
+        invalid_credit_card_json,
+    ]
+
+    response = client.post(f"{url_v1}/credit-card/bulk", json=payload, headers=header)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["conflicts"], body["invalid"]) == (1, 2, 1)
+    assert [item["status"] for item in body["items"]] == [
+        "created",
+        "conflict",
+        "conflict",
+        "invalid",
+    ]
+    assert body["items"][0]["id"]
+
+
+def test_create_credit_bulk_with_ndjson(client, url_v1, header):
+    lines = [
+        json.dumps(valid_visa_credit_card_json),
+        "{not json",
+        "",
+        json.dumps(valid_master_credit_card_json),
+    ]
+    response = client.post(
+        f"{url_v1}/credit-card/bulk",
+        content="\n".join(lines),
+        headers={**header, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["status"] for item in body["items"]] == [
+        "created",
+        "invalid",
+        "created",
+    ]
+
+    response = client.get(f"{url_v1}/credit-card/", headers=header)
+    assert len(response.json()) == 2
+
+
+def test_create_credit_bulk_with_invalid_body(client, url_v1, header):
+    response = client.post(
+        f"{url_v1}/credit-card/bulk", json=valid_visa_credit_card_json, headers=header
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"].startswith("Invalid request body")
+
+
+def test_get_credit_card_after_update_is_not_stale(client, url_v1, header, session):
+    card = credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+    client.get(f"{url_v1}/credit-card/{card.id}", headers=header)
+
+    client.put(
+        f"{url_v1}/credit-card/{card.id}", json={"holder": "modified"}, headers=header
+    )
+    response = client.get(f"{url_v1}/credit-card/{card.id}", headers=header)
+
+    assert response.status_code == 200
+    assert response.json()["holder"] == "modified"
+
+
+def test_credit_card_number_exists(client, url_v1, header, session):
+    credit_card_repository.create(session, obj_in=valid_visa_credit_card)
+
+    url = f"{url_v1}/credit-card/by-number"
+    found = client.head(
+        url, headers={**header, "X-Card-Number": VALID_VISA_CREDIT_CARD_NUMBER}
+    )
+    missing = client.head(
+        url, headers={**header, "X-Card-Number": VALID_MASTER_CREDIT_CARD_NUMBER}
+    )
+    in_query = client.head(
+        url, params={"number": VALID_VISA_CREDIT_CARD_NUMBER}, headers=header
+    )
+
+    assert found.status_code == 200
+    assert missing.status_code == 404
+    assert found.content == b""
+    assert in_query.status_code == 422
+
+
+def test_registering_same_card_twice_returns_conflict(client, url_v1, header):
+    url = f"{url_v1}/credit-card/"
+    client.post(url, json=valid_visa_credit_card_json, headers=header)
+    response = client.post(url, json=valid_visa_credit_card_json, headers=header)
+
+    assert response.status_code == 409
+    assert response.json()["detail"].startswith("Conflict")
+
+
+def test_get_brand_for_bin(client, url_v1, header):
+    response = client.get(f"{url_v1}/credit-card/brand/453957", headers=header)
+
+    assert response.status_code == 200
+    assert response.json() == {"bin": "453957", "brand": "visa"}
+
+
+@pytest.mark.parametrize("bin, status_code", [("999999", 404), ("45a957", 422)])
+def test_get_brand_for_unknown_bin(client, url_v1, header, bin, status_code):
+    response = client.get(f"{url_v1}/credit-card/brand/{bin}", headers=header)
+
+    assert response.status_code == status_code
+
+
+def test_list_credit_card_keeps_openapi_response_model(app):
+    schema = app.openapi()["paths"]["/api/v1/credit-card/"]["get"]
+    response = schema["responses"]["200"]["content"]["application/json"]["schema"]
+
+    assert response["type"] == "array"
+    assert response["items"] == {"$ref": "#/components/schemas/CreditCard"}
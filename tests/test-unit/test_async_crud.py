@@ -0,0 +1,126 @@
+import asyncio
+from typing import Any
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlmodel.pool import StaticPool
+
+from app.db.crud import AsyncCRUDBase
+from app.db.model import Base, to_async_url
+from app.exceptions.crud_error import (
+    CRUDCreateError,
+    CRUDDeleteError,
+    CRUDSelectError,
+    CRUDUpdateError,
+)
+
+
+class AsyncUnitTestModel(Base, table=True):
+    holder: str
+
+
+async_crud_base = AsyncCRUDBase(AsyncUnitTestModel)
+
+
+def run_with_session(func) -> Any:
+    async def runner():
+        engine = create_async_engine(
+            "sqlite+aiosqlite://",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            result = await func(session)
+        await engine.dispose()
+        return result
+
+    return asyncio.run(runner())
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///db.db") == "sqlite+aiosqlite:///db.db"
+    assert to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert to_async_url("postgresql+psycopg2://h/db") == "postgresql+asyncpg://h/db"
+    assert to_async_url("mysql://h/db") == "mysql://h/db"
+
+
+def test_async_get_valid_id_with_db_fill():
+    async def scenario(session):
+        expected = await async_crud_base.create(session, obj_in={"holder": "Teste"})
+        result = await async_crud_base.get(session, expected.id)
+        return expected, result
+
+    expected, result = run_with_session(scenario)
+    assert result.id == expected.id
+    assert result.holder == "Teste"
+
+
+def test_async_get_invalid_id():
+    async def scenario(session):
+        await async_crud_base.get(session, 132)
+
+    with pytest.raises(CRUDSelectError):
+        run_with_session(scenario)
+
+
+def test_async_get_multi_valid_skip_limit():
+    async def scenario(session):
+        for holder in ("Teste1", "Teste2", "Teste3"):
+            await async_crud_base.create(session, obj_in={"holder": holder})
+        return await async_crud_base.get_multi(session, skip=1, limit=2)
+
+    result = run_with_session(scenario)
+    assert [item.holder for item in result] == ["Teste2", "Teste3"]
+
+
+def test_async_update_valid_id_input():
+    async def scenario(session):
+        created = await async_crud_base.create(session, obj_in={"holder": "Teste1"})
+        return await async_crud_base.update(
+            session, id=created.id, obj_in={"holder": "TESTE2"}
+        )
+
+    assert run_with_session(scenario).holder == "TESTE2"
+
+
+def test_async_update_not_exists_item():
+    async def scenario(session):
+        await async_crud_base.update(session, id=15, obj_in={"holder": "Any"})
+
+    with pytest.raises(CRUDUpdateError):
+        run_with_session(scenario)
+
+
+def test_async_remove_valid_id():
+    async def scenario(session):
+        created = await async_crud_base.create(session, obj_in={"holder": "Teste1"})
+        removed = await async_crud_base.remove(session, id=created.id)
+        remaining = await async_crud_base.get_multi(session)
+        return removed, remaining
+
+    removed, remaining = run_with_session(scenario)
+    assert removed.holder == "Teste1"
+    assert remaining == []
+
+
+def test_async_remove_not_exists_item():
+    async def scenario(session):
+        await async_crud_base.remove(session, id=1)
+
+    with pytest.raises(CRUDDeleteError):
+        run_with_session(scenario)
+
+
+def test_async_create_duplicated_primary_key():
+    async def scenario(session):
+        await async_crud_base.create(session, obj_in={"id": 1, "holder": "Teste1"})
+        await async_crud_base.create(session, obj_in={"id": 1, "holder": "Teste2"})
+
+    with pytest.raises(CRUDCreateError):
+        run_with_session(scenario)
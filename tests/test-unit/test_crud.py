@@ -1,10 +1,21 @@
+import asyncio
 from typing import Any
+from unittest.mock import patch
 
 import pytest
+from sqlmodel import Field
 
+from app.cache import LRUCache
 from app.db.crud import CRUDBase
 from app.db.model import Base
-from app.exceptions.crud_error import CRUDDeleteError, CRUDSelectError, CRUDUpdateError
+from app.db.repository import get_credit_card_repository
+from app.exceptions.crud_error import (
+    CRUDCreateError,
+    CRUDDeleteError,
+    CRUDSelectError,
+    CRUDUpdateError,
+)
+from app.exceptions.query_error import InvalidFieldsError
 
 
 class BaseUnitTestModel(Base, table=True):
@@ -37,6 +48,21 @@ def test_get_multi_valid_skip_limit(session):
     assert len(result) == expected
 
 
+def test_get_multi_with_fields_returns_only_those_columns(session):
+    crud_base.create(session, obj_in={"holder": "Teste1"})
+    crud_base.create(session, obj_in={"holder": "Teste2"})
+    result = crud_base.get_multi(session, fields=["holder", "id"])
+
+    assert result == [{"holder": "Teste1", "id": 1}, {"holder": "Teste2", "id": 2}]
+
+
+def test_get_multi_with_unknown_fields(session):
+    with pytest.raises(InvalidFieldsError) as error:
+        crud_base.get_multi(session, fields=["holder", "cpf"])
+    assert error.value.status_code == 400
+    assert "cpf" in error.value.detail
+
+
 def test_update_valid_id_input(session):
     expected = "TESTE2"
     crud_base.create(session, obj_in={"holder": "Teste1"})
@@ -73,3 +99,201 @@ def test_update_valid_id_input_in_empty_value(session):
     expect_id = 15
     with pytest.raises(CRUDUpdateError):
         crud_base.update(session, id=expect_id, obj_in={"holder": "Any"})
+
+
+def test_get_page_walks_all_rows_with_cursor(session):
+    for holder in ("Teste1", "Teste2", "Teste3"):
+        crud_base.create(session, obj_in={"holder": holder})
+
+    first, next_id = crud_base.get_page(session, limit=2)
+    second, last_id = crud_base.get_page(session, after_id=next_id, limit=2)
+
+    assert [item.holder for item in first] == ["Teste1", "Teste2"]
+    assert next_id == first[-1].id
+    assert [item.holder for item in second] == ["Teste3"]
+    assert last_id is None
+
+
+def test_get_page_with_invalid_limit(session):
+    crud_base.create(session, obj_in={"holder": "Teste1"})
+    result, next_id = crud_base.get_page(session, limit=0)
+
+    assert result == []
+    assert next_id is None
+
+
+def test_iter_chunks_yields_every_row_in_batches(session):
+    for holder in ("Teste1", "Teste2", "Teste3"):
+        crud_base.create(session, obj_in={"holder": holder})
+
+    chunks = list(crud_base.iter_chunks(session, chunk_size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert [item.holder for chunk in chunks for item in chunk] == [
+        "Teste1",
+        "Teste2",
+        "Teste3",
+    ]
+
+
+class BulkUnitTestModel(Base, table=True):
+    code: str = Field(unique=True)
+
+
+bulk_crud_base = CRUDBase(BulkUnitTestModel)
+
+
+def test_create_many_without_unique_column(session):
+    ids = crud_base.create_many(
+        session, objs_in=[{"holder": "Teste1"}, {"holder": "Teste2"}]
+    )
+
+    assert ids == [1, 2]
+    assert [item.holder for item in crud_base.get_multi(session)] == [
+        "Teste1",
+        "Teste2",
+    ]
+
+
+def test_create_many_skips_conflicts_without_aborting(session):
+    bulk_crud_base.create(session, obj_in={"code": "A"})
+    ids = bulk_crud_base.create_many(
+        session,
+        objs_in=[{"code": "B"}, {"code": "A"}, {"code": "C"}, {"code": "B"}],
+    )
+
+    assert ids[0] is not None and ids[2] is not None
+    assert ids[1] is None and ids[3] is None
+    assert bulk_crud_base.get(session, ids[2]).code == "C"
+    assert len(bulk_crud_base.get_multi(session)) == 3
+
+
+def test_exists_by_unique_column(session):
+    bulk_crud_base.create(session, obj_in={"code": "A"})
+
+    assert bulk_crud_base.exists(session, code="A")
+    assert not bulk_crud_base.exists(session, code="B")
+
+
+def test_create_duplicate_is_rejected_before_insert(session):
+    bulk_crud_base.create(session, obj_in={"code": "A"})
+
+    with patch.object(session, "add") as add:
+        with pytest.raises(CRUDCreateError):
+            bulk_crud_base.create(session, obj_in={"code": "A"})
+    add.assert_not_called()
+
+
+def test_get_is_served_from_cache(session):
+    cache = LRUCache(maxsize=10)
+    cached_crud_base = CRUDBase(BaseUnitTestModel, cache=cache)
+    created = cached_crud_base.create(session, obj_in={"holder": "Teste"})
+
+    first = cached_crud_base.get(session, created.id)
+    second = cached_crud_base.get(session, created.id)
+
+    assert first.holder == second.holder == "Teste"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_update_and_remove_invalidate_cache(session):
+    cache = LRUCache(maxsize=10)
+    cached_crud_base = CRUDBase(BaseUnitTestModel, cache=cache)
+    created = cached_crud_base.create(session, obj_in={"holder": "Teste"})
+    cached_crud_base.get(session, created.id)
+
+    cached_crud_base.update(session, id=created.id, obj_in={"holder": "Novo"})
+    assert cached_crud_base.get(session, created.id).holder == "Novo"
+
+    cached_crud_base.remove(session, id=created.id)
+    with pytest.raises(CRUDSelectError):
+        cached_crud_base.get(session, created.id)
+
+
+def test_read_before_a_write_is_not_cached_after_it(session):
+    cache = LRUCache(maxsize=10)
+    cached_crud_base = CRUDBase(BaseUnitTestModel, cache=cache)
+    created = cached_crud_base.create(session, obj_in={"holder": "Teste"})
+    stale = BaseUnitTestModel.validate(created.dict())
+
+    cached_crud_base.update(session, id=created.id, obj_in={"holder": "Novo"})
+    cached_crud_base._cache_set(stale)
+    assert cached_crud_base.get(session, created.id).holder == "Novo"
+
+    cached_crud_base.remove(session, id=created.id)
+    cached_crud_base._cache_set(stale)
+    with pytest.raises(CRUDSelectError):
+        cached_crud_base.get(session, created.id)
+
+
+def test_get_version_and_update_bumps_updated_at(session):
+    created = crud_base.create(session, obj_in={"holder": "Teste"})
+    version = crud_base.get_version(session, created.id)
+    assert version == created.updated_at
+
+    updated = crud_base.update(session, id=created.id, obj_in={"holder": "Novo"})
+    assert updated.updated_at > version
+    assert updated.created_at == created.created_at
+    assert crud_base.get_version(session, created.id) == updated.updated_at
+
+    with pytest.raises(CRUDSelectError):
+        crud_base.get_version(session, 999)
+
+
+@pytest.mark.parametrize("field", ["created_at", "updated_at"])
+def test_timestamps_are_set_per_instance(field):
+    assert BaseUnitTestModel.__fields__[field].default_factory is not None
+    assert BaseUnitTestModel.__fields__[field].default is None
+
+
+def test_count_is_cached_and_invalidated_by_writes(session):
+    count_cache = LRUCache(maxsize=10)
+    counted_crud_base = CRUDBase(BaseUnitTestModel, count_cache=count_cache)
+    assert counted_crud_base.count(session) == 0
+
+    created = counted_crud_base.create(session, obj_in={"holder": "Teste"})
+    assert counted_crud_base.count(session) == 1
+    with patch.object(session, "exec") as exec_:
+        assert counted_crud_base.count(session) == 1
+    exec_.assert_not_called()
+
+    counted_crud_base.remove(session, id=created.id)
+    assert counted_crud_base.count(session) == 0
+
+
+class HolderFilter:
+    def __init__(self, holder):
+        self.holder = holder
+
+    def where(self, statement):
+        return statement.where(BaseUnitTestModel.holder == self.holder)
+
+    def cache_key(self):
+        return f"holder={self.holder}"
+
+
+def test_filtered_counts_are_invalidated_by_writes(session):
+    count_cache = LRUCache(maxsize=10)
+    counted_crud_base = CRUDBase(BaseUnitTestModel, count_cache=count_cache)
+    created = counted_crud_base.create(session, obj_in={"holder": "Teste"})
+    assert counted_crud_base.count(session, filters=HolderFilter("Novo")) == 0
+
+    counted_crud_base.update(session, id=created.id, obj_in={"holder": "Novo"})
+    assert counted_crud_base.count(session, filters=HolderFilter("Novo")) == 1
+    assert counted_crud_base.count(session, filters=HolderFilter("Teste")) == 0
+
+    counted_crud_base.create(session, obj_in={"holder": "Teste"})
+    assert counted_crud_base.count(session, filters=HolderFilter("Teste")) == 1
+
+    counted_crud_base.remove(session, id=created.id)
+    assert counted_crud_base.count(session, filters=HolderFilter("Novo")) == 0
+
+
+def test_request_scoped_repository_does_not_share_username():
+    first = asyncio.run(get_credit_card_repository(username="alice"))
+    second = asyncio.run(get_credit_card_repository(username="bob"))
+
+    assert first is not second
+    assert first.username == "alice"
+    assert second.username == "bob"
@@ -1,7 +1,7 @@
 import pytest
 from fastapi import HTTPException
 
-from app.auth import check_token, create_access_token
+from app.auth import check_token, create_access_token, token_cache, token_expires_at
 from tests.mocks.auth import generate_expire_token
 
 
@@ -57,3 +57,25 @@ def test_check_token_with_expired_token():
     token = generate_expire_token()
     with pytest.raises(HTTPException):
         check_token(token=token)
+
+
+def test_check_token_is_served_from_cache():
+    token = create_access_token(data={"sub": "cacheduser"})
+    token_cache.delete(token)
+    hits = token_cache.hits
+
+    assert check_token(token=token) == "cacheduser"
+    assert check_token(token=token) == "cacheduser"
+    assert token_cache.hits == hits + 1
+
+
+def test_check_token_does_not_cache_invalid_token():
+    token = create_access_token(data={})
+    with pytest.raises(HTTPException):
+        check_token(token=token)
+    assert token_cache.get(token) is None
+
+
+def test_token_expires_at_follows_exp_claim():
+    assert token_expires_at({"exp": 1700000000}) == 1700000001
+    assert token_expires_at({"sub": "testuser"}) is None
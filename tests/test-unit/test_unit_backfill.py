@@ -0,0 +1,60 @@
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.db.backfill import backfill_fingerprints, classify_number
+from app.db.model import CreditCard
+from app.fingerprint import card_fingerprint
+from app.utils import hashable
+
+from tests.mocks.credit_card import (  # isort:skip
+    VALID_MASTER_CREDIT_CARD_NUMBER,  # isort:skip
+    VALID_VISA_CREDIT_CARD_NUMBER,  # isort:skip
+)  # isort:skip
+
+NOW = "2024-01-01 00:00:00"
+
+INSERT = text(
+    "INSERT INTO creditcard (holder, number, exp_date, brand, created_at, updated_at) "
+    f"VALUES (:holder, :number, '2029-01-31', 'visa', '{NOW}', '{NOW}')"
+)
+
+
+def test_classify_number():
+    digest = card_fingerprint(VALID_VISA_CREDIT_CARD_NUMBER)
+
+    assert classify_number(VALID_VISA_CREDIT_CARD_NUMBER) == (
+        "hashed",
+        bytes.fromhex(digest),
+    )
+    assert classify_number(digest) == ("converted", bytes.fromhex(digest))
+    assert classify_number(digest.encode()) == ("converted", bytes.fromhex(digest))
+    assert classify_number(bytes.fromhex(digest)) == (
+        "unchanged",
+        bytes.fromhex(digest),
+    )
+    assert classify_number("not a card") == ("invalid", None)
+
+
+def test_backfill_converts_text_numbers(session):
+    values = [
+        VALID_VISA_CREDIT_CARD_NUMBER,
+        hashable(VALID_MASTER_CREDIT_CARD_NUMBER),
+        bytes.fromhex(card_fingerprint("4111111111111111")),
+        "not a card",
+    ]
+    for index, value in enumerate(values):
+        session.execute(INSERT, {"holder": f"Holder {index}", "number": value})
+    session.commit()
+    engine = session.get_bind()
+
+    counts = backfill_fingerprints(engine, chunk_size=2)
+    session.execute(text("DELETE FROM creditcard WHERE holder = 'Holder 3'"))
+    session.commit()
+
+    assert counts == {"hashed": 1, "converted": 1, "unchanged": 1, "invalid": 1}
+    assert [card.number for card in session.exec(select(CreditCard))] == [
+        card_fingerprint(VALID_VISA_CREDIT_CARD_NUMBER),
+        card_fingerprint(VALID_MASTER_CREDIT_CARD_NUMBER),
+        card_fingerprint("4111111111111111"),
+    ]
+    assert backfill_fingerprints(engine)["unchanged"] == 3
@@ -0,0 +1,105 @@
+import json
+import os
+
+import pytest
+from creditcard import CreditCard
+
+from app.brand import DEFAULT_BRAND_TABLE, BrandClassifier, expand_prefix
+
+from tests.mocks.credit_card import (  # isort:skip
+    VALID_MASTER_CREDIT_CARD_NUMBER,  # isort:skip
+    VALID_VISA_CREDIT_CARD_NUMBER,  # isort:skip
+)  # isort:skip
+
+
+@pytest.fixture
+def classifier():
+    return BrandClassifier(DEFAULT_BRAND_TABLE)
+
+
+@pytest.mark.parametrize(
+    "number, brand",
+    [
+        (VALID_VISA_CREDIT_CARD_NUMBER, "visa"),
+        (VALID_MASTER_CREDIT_CARD_NUMBER, "master"),
+        ("2221000000000009", "master"),
+        ("378282246310005", "amex"),
+        ("401178", "elo"),
+        ("6062 8288 8866 6688", "hipercard"),
+        ("3530111333300000", "jcb"),
+        ("999999", None),
+        ("", None),
+    ],
+)
+def test_classify_uses_longest_prefix(classifier, number, brand):
+    assert classifier.classify(number) == brand
+
+
+@pytest.mark.parametrize(
+    "number",
+    [
+        VALID_VISA_CREDIT_CARD_NUMBER,
+        "4111111111111111",
+        "4011000000000000",
+        "4576000000000000",
+        VALID_MASTER_CREDIT_CARD_NUMBER,
+        "5555555555554444",
+        "5067000000000000",
+        "6011111111111117",
+        "6500000000000000",
+        "6550200000000000",
+        "4011780000000000",
+        "4312740000000000",
+        "4573930000000000",
+        "4576310000000000",
+        "5066991111111118",
+        "5090000000000000",
+        "6277800000000000",
+        "6362970000457013",
+        "6500310000000000",
+        "6504100000000000",
+        "6516520000000000",
+        "6550580000000000",
+    ],
+)
+def test_classify_agrees_with_creditcard_library(classifier, number):
+    assert classifier.classify(number) == CreditCard(number).get_brand()
+
+
+def test_expand_prefix():
+    assert expand_prefix("4") == ["4"]
+    assert expand_prefix("51-55") == ["51", "52", "53", "54", "55"]
+    assert expand_prefix("08-10") == ["08", "09", "10"]
+
+
+@pytest.mark.parametrize("prefix", ["5-55", "55-51", "4a", ""])
+def test_expand_invalid_prefix(prefix):
+    with pytest.raises(ValueError):
+        expand_prefix(prefix)
+
+
+def test_classifier_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "brands.json"
+    path.write_text(json.dumps({"brands": [{"brand": "visa", "prefixes": ["4"]}]}))
+    now = [0.0]
+    classifier = BrandClassifier(str(path), reload_interval=5, clock=lambda: now[0])
+    assert classifier.classify("999999") is None
+
+    path.write_text(json.dumps({"brands": [{"brand": "acme", "prefixes": ["99"]}]}))
+    os.utime(path, (1, 1))
+    assert classifier.classify("999999") is None
+
+    now[0] = 5.0
+    assert classifier.classify("999999") == "acme"
+    assert classifier.classify("4111") is None
+
+
+def test_classifier_keeps_table_when_new_file_is_invalid(tmp_path):
+    path = tmp_path / "brands.json"
+    path.write_text(json.dumps({"brands": [{"brand": "visa", "prefixes": ["4"]}]}))
+    classifier = BrandClassifier(str(path), reload_interval=0)
+
+    path.write_text("{not json")
+    os.utime(path, (1, 1))
+
+    assert classifier.classify("4111") == "visa"
@@ -0,0 +1,183 @@
+import sys
+import types
+
+import pytest
+
+from app.cache import LRUCache, RedisCache, build_cache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_lru_cache_get_and_set():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_respects_item_expiration():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 10)
+
+    clock.now += 9.999
+    assert cache.get("a") == 1
+
+    clock.now += 0.001
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_ttl_caps_item_expiration():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, ttl=5, clock=clock)
+    cache.set("a", 1, expires_at=clock.now + 60)
+    cache.set("b", 2)
+
+    clock.now += 5
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+
+
+def test_lru_cache_set_if_checks_current_value():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, ttl=5, clock=clock)
+    newer = lambda current: current is None or current <= 2  # noqa: E731
+
+    assert cache.set_if("a", 1, newer) is True
+    assert cache.set_if("a", 3, newer) is True
+    assert cache.set_if("a", 2, newer) is False
+    assert cache.get("a") == 3
+
+    clock.now += 5
+    assert cache.set_if("a", 2, newer) is True
+    assert cache.get("a") == 2
+
+
+def test_lru_cache_disabled_with_zero_maxsize():
+    cache = LRUCache(maxsize=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_delete_and_clear():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.stats() == {
+        "size": 0,
+        "maxsize": 2,
+        "hits": 0,
+        "misses": 0,
+        "hit_ratio": 0.0,
+    }
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expirations = {}
+
+    @classmethod
+    def from_url(cls, url):
+        return cls()
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None):
+        self.data[key] = value.encode()
+        self.expirations[key] = px
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [key for key in self.data if key.startswith(match.rstrip("*"))]
+
+    def transaction(self, func, *watches, value_from_callable=False):
+        result = func(FakePipeline(self))
+        return result if value_from_callable else None
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def multi(self):
+        pass
+
+    def set(self, key, value, px=None):
+        self.client.set(key, value, px=px)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    module = types.ModuleType("redis")
+    module.Redis = FakeRedis
+    monkeypatch.setitem(sys.modules, "redis", module)
+
+
+def test_redis_cache_round_trip(fake_redis):
+    cache = build_cache("redis", maxsize=0, ttl=30, url="redis://localhost")
+
+    assert isinstance(cache, RedisCache)
+    cache.set("creditcard:1", {"id": 1, "holder": "John"})
+    assert cache.get("creditcard:1") == {"id": 1, "holder": "John"}
+    assert cache.client.expirations["maistodos:creditcard:1"] == 30000
+
+    cache.delete("creditcard:1")
+    assert cache.get("creditcard:1") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_redis_cache_set_if(fake_redis):
+    cache = build_cache("redis", maxsize=0, ttl=30, url="redis://localhost")
+    newer = lambda current: current is None or current["version"] <= 2  # noqa: E731
+
+    assert cache.set_if("creditcard:1", {"version": 1}, newer) is True
+    assert cache.set_if("creditcard:1", {"version": 3}, newer) is True
+    assert cache.set_if("creditcard:1", {"version": 2}, newer) is False
+    assert cache.get("creditcard:1") == {"version": 3}
+    assert cache.client.expirations["maistodos:creditcard:1"] == 30000
+
+
+def test_build_cache_backends():
+    assert isinstance(build_cache("memory", maxsize=10, ttl=None), LRUCache)
+    assert build_cache("memory", maxsize=0, ttl=None) is None
+    assert build_cache("none", maxsize=10, ttl=None) is None
+    with pytest.raises(ValueError):
+        build_cache("unknown", maxsize=10, ttl=None)
@@ -0,0 +1,96 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlmodel import select
+
+from app.db.crud import CRUDBase
+from app.db.filters import CreditCardFilter, prefix_upper_bound
+from app.db.model import CreditCard
+
+
+def explain_query_plan(session, statement) -> str:
+    compiled = statement.compile()
+    rows = session.execute(
+        text(f"EXPLAIN QUERY PLAN {compiled}"), compiled.params
+    ).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def add_card(session, holder, number, brand, created_at):
+    session.add(
+        CreditCard(
+            holder=holder,
+            number=number,
+            exp_date="2030-01-31",
+            brand=brand,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+    )
+    session.commit()
+
+
+def test_prefix_upper_bound():
+    assert prefix_upper_bound("Ana") == "Anb"
+    assert prefix_upper_bound("a" + chr(0x10FFFF)) == "b"
+    assert prefix_upper_bound(chr(0x10FFFF)) is None
+
+
+@pytest.mark.parametrize(
+    "filters, index",
+    [
+        (CreditCardFilter(brand="VISA"), "ix_creditcard_brand"),
+        (CreditCardFilter(holder_prefix="Ana"), "ix_creditcard_holder"),
+        (
+            CreditCardFilter(
+                created_after=datetime(2024, 1, 1), created_before=datetime(2024, 2, 1)
+            ),
+            "ix_creditcard_created_at",
+        ),
+        (
+            CreditCardFilter(updated_before=datetime(2024, 1, 1), sort="-updated_at"),
+            "ix_creditcard_updated_at",
+        ),
+        (CreditCardFilter(sort="-created_at"), "ix_creditcard_created_at"),
+    ],
+)
+def test_filters_use_indexes(session, filters, index):
+    plan = explain_query_plan(session, filters.apply(select(CreditCard)))
+
+    assert f"INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan or filters.sort == "id"
+
+
+def test_filters_select_and_sort(session):
+    add_card(session, "Ana Maria", "a1", "visa", datetime(2024, 1, 1))
+    add_card(session, "Anb", "a2", "visa", datetime(2024, 2, 1))
+    add_card(session, "Ana Clara", "a3", "master", datetime(2024, 3, 1))
+    add_card(session, "Bruno", "a4", "visa", datetime(2024, 4, 1))
+    crud = CRUDBase(CreditCard)
+
+    def holders(**kwargs):
+        rows = crud.get_multi(
+            session, fields=["holder"], filters=CreditCardFilter(**kwargs)
+        )
+        return [row["holder"] for row in rows]
+
+    assert holders(holder_prefix="Ana") == ["Ana Maria", "Ana Clara"]
+    assert holders(brand="Visa", sort="-created_at") == ["Bruno", "Anb", "Ana Maria"]
+    assert holders(
+        created_after=datetime(2024, 2, 1), created_before=datetime(2024, 4, 1)
+    ) == [
+        "Anb",
+        "Ana Clara",
+    ]
+    assert holders(sort="holder") == ["Ana Clara", "Ana Maria", "Anb", "Bruno"]
+    assert crud.count(session, filters=CreditCardFilter(brand="visa")) == 3
+    assert crud.count(session, filters=CreditCardFilter(holder_prefix="Ana")) == 2
+
+
+def test_cache_key_ignores_sort_and_empty_filters():
+    assert (
+        CreditCardFilter(brand="visa", sort="-id").cache_key()
+        == CreditCardFilter(brand="visa").cache_key()
+    )
+    assert CreditCardFilter().cache_key() != CreditCardFilter(brand="visa").cache_key()
@@ -0,0 +1,115 @@
+import hashlib
+import hmac
+
+import pytest
+from sqlmodel import select
+
+from app import fingerprint
+from app.db import validation
+from app.db.model import CreditCard
+from app.db.repository import CartRepository
+from app.db.schema import CreditCardSchema
+from app.exceptions.crud_error import CRUDCreateError
+from app.fingerprint import Fingerprinter, card_fingerprint, parse_keys
+from app.utils import hashable
+
+from tests.mocks.credit_card import (  # isort:skip
+    VALID_VISA_CREDIT_CARD_NUMBER,  # isort:skip
+    valid_visa_credit_card,  # isort:skip
+    valid_visa_credit_card_json,  # isort:skip
+)  # isort:skip
+
+KEY = bytes.fromhex("11" * 32)
+OLD_KEY = bytes.fromhex("22" * 32)
+
+
+def test_default_fingerprint_is_compatible_with_hashable():
+    assert card_fingerprint(VALID_VISA_CREDIT_CARD_NUMBER) == hashable(
+        VALID_VISA_CREDIT_CARD_NUMBER
+    )
+
+
+def test_hmac_fingerprint():
+    fingerprinter = Fingerprinter("hmac-sha256", [KEY])
+    expected = hmac.new(
+        KEY, VALID_VISA_CREDIT_CARD_NUMBER.encode(), "sha256"
+    ).hexdigest()
+    assert fingerprinter.fingerprint(VALID_VISA_CREDIT_CARD_NUMBER) == expected
+
+
+def test_blake2b_fingerprint_has_32_bytes():
+    fingerprinter = Fingerprinter("blake2b", [KEY])
+    expected = hashlib.blake2b(
+        VALID_VISA_CREDIT_CARD_NUMBER.encode(), key=KEY, digest_size=32
+    ).hexdigest()
+    digest = fingerprinter.fingerprint(VALID_VISA_CREDIT_CARD_NUMBER)
+    assert digest == expected
+    assert len(bytes.fromhex(digest)) == 32
+
+
+@pytest.mark.parametrize("algorithm", ["sha256", "hmac-sha256", "blake2b"])
+def test_batch_fingerprints_match_single(algorithm):
+    fingerprinter = Fingerprinter(algorithm, [KEY])
+    numbers = [str(4000000000000000 + i) for i in range(100)]
+    assert fingerprinter.fingerprints(numbers) == [
+        fingerprinter.fingerprint(number) for number in numbers
+    ]
+
+
+def test_candidates_keep_previous_keys_after_rotation():
+    before = Fingerprinter("hmac-sha256", [OLD_KEY])
+    after = Fingerprinter("hmac-sha256", [KEY, OLD_KEY])
+    candidates = after.candidates(VALID_VISA_CREDIT_CARD_NUMBER)
+
+    assert candidates[0] == after.fingerprint(VALID_VISA_CREDIT_CARD_NUMBER)
+    assert before.fingerprint(VALID_VISA_CREDIT_CARD_NUMBER) in candidates
+
+
+def test_create_rejects_cards_stored_with_a_previous_key(session, monkeypatch):
+    repository = CartRepository(CreditCard)
+    monkeypatch.setattr(
+        fingerprint, "fingerprinter", Fingerprinter("blake2b", [OLD_KEY])
+    )
+    stored = repository.create(
+        session, obj_in=CreditCardSchema(**valid_visa_credit_card_json)
+    )
+
+    rotated = Fingerprinter("blake2b", [KEY, OLD_KEY])
+    monkeypatch.setattr(fingerprint, "fingerprinter", rotated)
+    monkeypatch.setattr(validation, "fingerprinter", rotated)
+    card = CreditCardSchema(**valid_visa_credit_card_json)
+    [(_, batch_card)] = validation.validate_credit_cards_batch(
+        [valid_visa_credit_card_json]
+    )[0]
+
+    assert card.number != stored.number
+    assert batch_card._previous_numbers == [stored.number]
+    with pytest.raises(CRUDCreateError):
+        repository.create(session, obj_in=card)
+    assert repository.create_many(session, objs_in=[card, batch_card]) == [None, None]
+
+
+def test_keyed_algorithm_without_key():
+    with pytest.raises(ValueError):
+        Fingerprinter("blake2b")
+
+
+def test_unknown_algorithm():
+    with pytest.raises(ValueError):
+        Fingerprinter("md5", [KEY])
+
+
+def test_parse_keys():
+    assert parse_keys(" 1111 ,2222,") == [b"\x11\x11", b'""']
+
+
+def test_fingerprint_is_stored_as_binary(session):
+    card = CreditCard.parse_obj(valid_visa_credit_card)
+    session.add(card)
+    session.commit()
+
+    raw = session.connection().exec_driver_sql("SELECT number FROM creditcard").scalar()
+    stored = session.exec(select(CreditCard)).one()
+
+    assert raw == bytes.fromhex(valid_visa_credit_card.number)
+    assert stored.number == valid_visa_credit_card.number
@@ -0,0 +1,102 @@
+import pytest
+
+from app.brand import brand_classifier
+from app.db.schema import CreditCardSchema
+from app.db.validation import luhn_valid
+from tests.performance import shapes
+from tests.performance.cards import BRANDS, CardNumberGenerator, luhn_check_digit
+from tests.performance.slo import DEFAULT_BUDGETS, check
+
+
+def test_luhn_check_digit():
+    assert luhn_check_digit("453957876362148") == "6"
+    assert luhn_check_digit("518600170000972") == "6"
+
+
+@pytest.mark.parametrize("brand", list(BRANDS))
+def test_generated_numbers_are_valid_cards_of_the_brand(brand):
+    generator = CardNumberGenerator(seed=1)
+    for _ in range(20):
+        number = generator.number(brand)
+        card = CreditCardSchema(holder="Fulano", number=number, exp_date="01/2099")
+
+        assert len(number) == BRANDS[brand][1]
+        assert brand_classifier.classify(number) == brand
+        assert card.brand == brand
+
+
+def test_generated_numbers_do_not_repeat():
+    generator = CardNumberGenerator(seed=7)
+    numbers = [generator.number() for _ in range(5000)]
+
+    assert len(set(numbers)) == len(numbers)
+    assert all(luhn_valid(numbers))
+    assert {brand_classifier.classify(number) for number in numbers} == set(BRANDS)
+
+
+def test_generator_with_seed_is_reproducible():
+    assert [CardNumberGenerator(seed=3).number() for _ in range(3)] == [
+        CardNumberGenerator(seed=3).number() for _ in range(3)
+    ]
+
+
+@pytest.mark.parametrize("name", list(shapes.SHAPES))
+def test_shapes_reach_the_users_and_end_at_the_duration(name):
+    stage_list = shapes.stages(name, 1000, 600)
+
+    assert max(stage["users"] for stage in stage_list) == 1000
+    assert stage_list[-1]["duration"] == 600
+    assert shapes.tick(stage_list, 0) is not None
+    assert shapes.tick(stage_list, 600) is None
+
+
+def test_spike_shape_returns_to_base_load():
+    stage_list = shapes.stages("spike", 1000, 600)
+
+    assert [shapes.tick(stage_list, t)[0] for t in (10, 300, 590)] == [100, 1000, 100]
+
+
+def test_unknown_shape():
+    with pytest.raises(ValueError):
+        shapes.stages("wave", 10, 60)
+
+
+def stats_row(name, requests=100, failures=0, p50="50", p95="200", p99="400"):
+    return {
+        "Name": name,
+        "Request Count": str(requests),
+        "Failure Count": str(failures),
+        "50%": p50,
+        "95%": p95,
+        "99%": p99,
+    }
+
+
+def test_slo_passes_within_budgets():
+    rows = [stats_row("Create credit card"), stats_row("Aggregated")]
+
+    assert check(rows, DEFAULT_BUDGETS) == []
+
+
+def test_slo_reports_latency_and_error_rate():
+    rows = [
+        stats_row("Create credit card", failures=10, p99="5000"),
+        stats_row("Aggregated", requests=1000, failures=20, p95="900"),
+    ]
+
+    assert check(rows, DEFAULT_BUDGETS) == [
+        "Aggregated: p95 900 ms > 500 ms",
+        "Aggregated: error rate 2.00% > 1.00%",
+    ]
+    assert len(check(rows, DEFAULT_BUDGETS, per_endpoint=True)) == 4
+
+
+def test_slo_ignores_rows_without_requests():
+    rows = [stats_row("Aggregated", requests=0, p50="N/A", p95="N/A", p99="N/A")]
+
+    assert check(rows, DEFAULT_BUDGETS) == []
+
+
+def test_slo_requires_aggregated_row():
+    with pytest.raises(ValueError):
+        check([stats_row("Health")], DEFAULT_BUDGETS)
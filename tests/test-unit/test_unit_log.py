@@ -0,0 +1,155 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from app import log
+from app.config import settings
+from app.log import DebugSampler, JsonFormatter, LogQueueHandler, configure_logging
+
+FILE_CONFIG = """
+[loggers]
+keys=root
+
+[handlers]
+keys=fileHandler
+
+[formatters]
+keys=plain
+
+[logger_root]
+level=DEBUG
+handlers=fileHandler
+
+[handler_fileHandler]
+class=FileHandler
+level=DEBUG
+formatter=plain
+args=({path!r}, "w")
+
+[formatter_plain]
+format=%(levelname)s %(message)s
+"""
+
+
+def make_record(msg="card %s", args=("42",), level=logging.DEBUG, lineno=10, **extra):
+    record = logging.LogRecord(
+        "app.test", level, "app/test.py", lineno, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    config = tmp_path / "logging.conf"
+    output = tmp_path / "app.log"
+    config.write_text(FILE_CONFIG.format(path=str(output)))
+    yield str(config), output
+    configure_logging()
+
+
+def test_json_formatter_includes_request_id_and_extra():
+    record = make_record(request_id="abc", timings={"db_queries": 3})
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "card 42"
+    assert payload["request_id"] == "abc"
+    assert payload["timings"] == {"db_queries": 3}
+    assert payload["level"] == "DEBUG"
+    assert "msg" not in payload and "args" not in payload
+
+
+def test_json_formatter_outside_request_and_with_exception():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(request_id=log.NO_REQUEST_ID)
+        record.exc_info = sys.exc_info()
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["request_id"] is None
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+def test_debug_sampler_keeps_one_in_every_per_call_site():
+    sampler = DebugSampler(0.25)
+
+    kept = [sampler.filter(make_record()) for _ in range(8)]
+    other_site = sampler.filter(make_record(lineno=20))
+
+    assert kept == [True, False, False, False] * 2
+    assert other_site is True
+    assert sampler.filter(make_record(level=logging.INFO)) is True
+    assert DebugSampler(0).filter(make_record()) is False
+
+
+def test_queue_handler_prepares_message_and_keeps_extra():
+    try:
+        raise KeyError("number")
+    except KeyError:
+        record = make_record(timings={"db_queries": 1})
+        record.exc_info = sys.exc_info()
+
+    prepared = LogQueueHandler(None).prepare(record)
+
+    assert prepared.msg == "card 42" and prepared.args is None
+    assert prepared.exc_info is None and "KeyError" in prepared.exc_text
+    assert prepared.timings == {"db_queries": 1}
+    assert record.args == ("42",)
+
+
+def test_configure_logging_with_queue_and_json(log_file, monkeypatch):
+    config, output = log_file
+    monkeypatch.setattr(settings, "log_queue", True)
+    monkeypatch.setattr(settings, "log_format", "json")
+    monkeypatch.setattr(settings, "log_level", "DEBUG")
+
+    configure_logging(config)
+    logging.getLogger("app.test").info("brand table loaded from %s", "brands.json")
+    log.stop_logging()
+
+    root_handlers = logging.getLogger().handlers
+    assert any(isinstance(handler, LogQueueHandler) for handler in root_handlers)
+    payload = json.loads(output.read_text().splitlines()[-1])
+    assert payload["message"] == "brand table loaded from brands.json"
+    assert payload["logger"] == "app.test"
+
+
+def test_configure_logging_without_queue_samples_debug(log_file, monkeypatch):
+    config, output = log_file
+    monkeypatch.setattr(settings, "log_queue", False)
+    monkeypatch.setattr(settings, "log_debug_sample_rate", 0.5)
+    monkeypatch.setattr(settings, "log_level", "DEBUG")
+
+    configure_logging(config)
+    for index in range(4):
+        logging.getLogger("app.test").debug("row %d", index)
+
+    assert output.read_text().splitlines() == ["DEBUG row 0", "DEBUG row 2"]
+
+
+def test_request_id_header(client, url_v1, header, caplog):
+    with caplog.at_level(logging.DEBUG, logger="app.timing"):
+        response = client.get(f"{url_v1}/credit-card/", headers=header)
+
+    request_id = response.headers["X-Request-ID"]
+    [record] = [item for item in caplog.records if item.name == "app.timing"]
+    assert len(request_id) == 32
+    assert record.request_id == request_id
+    assert log.current_request_id() is None
+
+
+def test_request_id_header_reuses_valid_incoming_id(client, url_v1, header):
+    valid = client.get(
+        f"{url_v1}/credit-card/", headers={**header, "X-Request-ID": "trace-123"}
+    )
+    invalid = client.get(
+        f"{url_v1}/credit-card/", headers={**header, "X-Request-ID": "bad id\n"}
+    )
+
+    assert valid.headers["X-Request-ID"] == "trace-123"
+    assert invalid.headers["X-Request-ID"] != "bad id\n"
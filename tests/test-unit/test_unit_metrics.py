@@ -0,0 +1,91 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.cache import LRUCache
+from app.metrics import TimedQueuePool, get_metrics
+
+REGISTRY = pytest.importorskip("prometheus_client").REGISTRY
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def metrics():
+    return get_metrics()
+
+
+def test_requests_are_recorded_by_route_template_and_status(client, url_v1, header):
+    labels = {
+        "method": "GET",
+        "route": "/api/v1/credit-card/{id}",
+        "status": "404",
+    }
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    client.get(f"{url_v1}/credit-card/123", headers=header)
+    client.get(f"{url_v1}/credit-card/456", headers=header)
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 2
+
+
+def test_requests_without_route_are_unmatched(client):
+    labels = {"method": "GET", "route": "<unmatched>", "status": "404"}
+    before = sample("http_request_duration_seconds_count", **labels)
+
+    client.get("/does-not-exist")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 1
+    assert sample("http_requests_in_progress", method="GET") == 0
+
+
+def test_metrics_endpoint(client, url_v1):
+    client.get(f"{url_v1}/health/")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'route="/api/v1/health/"' in response.text
+    assert "db_pool_connections" in response.text
+
+
+def test_cache_counters_are_copied_as_deltas(metrics):
+    cache = LRUCache(maxsize=10)
+    metrics.caches["unit"] = lambda: cache
+    try:
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        metrics.sample(force=True)
+        cache.get("a")
+        metrics.sample(force=True)
+
+        assert sample("app_cache_requests_total", cache="unit", result="hit") == 2
+        assert sample("app_cache_requests_total", cache="unit", result="miss") == 1
+
+        cache.clear()
+        metrics.sample(force=True)
+        cache.get("a")
+        metrics.sample(force=True)
+
+        assert sample("app_cache_requests_total", cache="unit", result="miss") == 2
+    finally:
+        del metrics.caches["unit"]
+
+
+def test_pool_checkout_wait_and_usage(metrics):
+    engine = create_engine("sqlite://", poolclass=TimedQueuePool, pool_size=2)
+    metrics.pools["unit"] = lambda: engine.pool
+    before = sample("db_pool_checkout_seconds_count", engine="sync")
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            metrics.sample(force=True)
+
+            assert (
+                sample("db_pool_connections", engine="unit", state="checked_out") == 1
+            )
+        assert sample("db_pool_checkout_seconds_count", engine="sync") == before + 1
+    finally:
+        del metrics.pools["unit"]
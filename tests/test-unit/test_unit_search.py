@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.db import search
+from app.db.crud import CRUDBase
+from app.db.model import CreditCard
+from app.db.search import fts_phrase, holder_search_index
+
+crud = CRUDBase(CreditCard, search_index=holder_search_index)
+
+
+def card(holder, number):
+    return {
+        "holder": holder,
+        "number": number,
+        "exp_date": "2030-01-31",
+        "brand": "visa",
+    }
+
+
+def indexed(session):
+    rows = session.execute(
+        text(f"SELECT rowid, holder FROM {holder_search_index.name}")
+    )
+    return sorted(rows.all())
+
+
+def holders(cards):
+    return [item.holder for item in cards]
+
+
+def test_fts_phrase_quotes_the_query():
+    assert fts_phrase('ana "maria"') == '"ana ""maria"""'
+
+
+def test_writes_keep_search_index_in_sync(session):
+    first = crud.create(session, obj_in=card("Maria Silva", "a1"))
+    crud.create_many(session, objs_in=[card("Joao Silveira", "a2"), card("Ana", "a1")])
+    assert indexed(session) == [(1, "Maria Silva"), (2, "Joao Silveira")]
+
+    crud.update(session, id=first.id, obj_in={"holder": "Maria Souza"})
+    crud.remove(session, id=2)
+    assert indexed(session) == [(1, "Maria Souza")]
+
+
+def test_search_matches_infix_ignoring_case(session):
+    crud.create(session, obj_in=card("Maria Silva", "a1"))
+    crud.create(session, obj_in=card("Joao Silveira", "a2"))
+    crud.create(session, obj_in=card("Ana Souza", "a3"))
+
+    assert sorted(holders(crud.search(session, query="SILV"))) == [
+        "Joao Silveira",
+        "Maria Silva",
+    ]
+    assert holders(crud.search(session, query="ouz")) == ["Ana Souza"]
+    assert crud.search(session, query="silv", limit=1)[0].holder in {
+        "Maria Silva",
+        "Joao Silveira",
+    }
+    assert crud.search(session, query='"; DROP') == []
+
+
+def test_search_without_index_is_rejected(session):
+    with pytest.raises(ValueError):
+        CRUDBase(CreditCard).search(session, query="silva")
+
+
+def test_postgres_search_uses_trigram_similarity():
+    statement = holder_search_index.search_statement(
+        CreditCard, "50%_a", 10, "postgresql"
+    )
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "ILIKE" in sql
+    assert "similarity(creditcard.holder" in sql
+    assert (
+        statement.compile(dialect=postgresql.dialect()).params["holder_1"]
+        == "%50\\%\\_a%"
+    )
+
+
+def test_search_ranks_by_match_position_and_length(session):
+    crud.create(session, obj_in=card("Joao Silveira Santos", "a1"))
+    crud.create(session, obj_in=card("Silvia Ramos", "a2"))
+    crud.create(session, obj_in=card("Ana Silva", "a3"))
+
+    assert holders(crud.search(session, query="silv")) == [
+        "Silvia Ramos",
+        "Ana Silva",
+        "Joao Silveira Santos",
+    ]
+
+
+def test_sqlite_search_statement_is_cacheable():
+    first = holder_search_index.search_statement(CreditCard, "silv", 20, "sqlite")
+    second = holder_search_index.search_statement(CreditCard, "ana", 20, "sqlite")
+
+    assert hash(first._generate_cache_key().key) == hash(
+        second._generate_cache_key().key
+    )
+
+
+def test_search_reports_matches_beyond_the_candidates(session, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_CANDIDATES", 2)
+    crud.create(session, obj_in=card("Silvia Ramos", "a1"))
+    crud.create(session, obj_in=card("Ana Silva", "a2"))
+    assert crud.search_truncated(session, query="silv") is False
+
+    crud.create(session, obj_in=card("Joao Silveira", "a3"))
+    assert crud.search_truncated(session, query="silv") is True
+    assert holders(crud.search(session, query="silv")) == [
+        "Ana Silva",
+        "Joao Silveira",
+    ]
+    assert crud.search_truncated(session, query="ramos") is False
+
+
+def test_postgres_search_is_never_truncated():
+    assert holder_search_index.truncated_statement("silva", "postgresql") is None
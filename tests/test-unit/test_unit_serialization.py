@@ -0,0 +1,46 @@
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, parse_obj_as
+
+from app.db.model import CreditCard
+from app.db.schema import row_serializer, serialize_credit_card, serialize_credit_cards
+
+from tests.mocks.credit_card import (  # isort:skip
+    valid_master_credit_card,  # isort:skip
+    valid_visa_credit_card,  # isort:skip
+)  # isort:skip
+
+
+def stored_cards(session):
+    cards = [
+        CreditCard.parse_obj(valid_visa_credit_card),
+        CreditCard.parse_obj(valid_master_credit_card),
+    ]
+    session.add_all(cards)
+    session.commit()
+    for card in cards:
+        session.refresh(card)
+    return cards
+
+
+def test_serializer_matches_response_model(session):
+    cards = stored_cards(session)
+    expected = jsonable_encoder(parse_obj_as(List[CreditCard], cards))
+
+    result = orjson.loads(orjson.dumps(serialize_credit_cards(cards)))
+
+    assert result == expected
+
+
+def test_serializer_reads_fields_in_model_order(session):
+    card = stored_cards(session)[0]
+    assert list(serialize_credit_card(card)) == list(CreditCard.__fields__)
+
+
+def test_row_serializer_with_single_field():
+    class Single(BaseModel):
+        id: int
+
+    assert row_serializer(Single)(Single(id=7)) == {"id": 7}
@@ -0,0 +1,157 @@
+import os
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import inspect
+from sqlmodel import create_engine
+from sqlmodel.pool import StaticPool
+
+import asgi
+from app import create_app, server
+from app.config import settings
+from app.db import repository
+from app.db.model import init_db
+from app.db.repository import get_count_cache, get_record_cache
+from app.metrics import MULTIPROC_ENV
+
+
+def test_worker_count_defaults_to_cpu_count(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 0)
+    assert server.worker_count(cpu_count=8) == 8
+
+
+def test_worker_count_uses_web_concurrency(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 3)
+    assert server.worker_count(cpu_count=8) == 3
+
+
+def test_uvicorn_options_use_settings(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 2)
+    monkeypatch.setattr(settings, "web_port", 9000)
+    options = server.uvicorn_options()
+
+    assert options["workers"] == 2
+    assert options["port"] == 9000
+    assert options["loop"] in ("uvloop", "auto")
+    assert options["http"] in ("httptools", "auto")
+
+
+def test_gunicorn_options_use_uvicorn_worker(monkeypatch):
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    options = server.gunicorn_options()
+
+    assert options["worker_class"] == "uvicorn.workers.UvicornWorker"
+    assert options["workers"] == 4
+    assert options["bind"] == f"{settings.web_host}:{settings.web_port}"
+
+
+def test_init_db_creates_tables():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    init_db(engine)
+    assert "creditcard" in inspect(engine).get_table_names()
+
+
+def test_create_app_skips_schema_creation_when_disabled(monkeypatch):
+    monkeypatch.setattr(settings, "db_create_all", False)
+    with patch("app.init_db") as mocked:
+        create_app()
+    mocked.assert_not_called()
+
+
+def test_main_creates_schema_once_before_workers(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "server_backend", "uvicorn")
+    monkeypatch.setenv(MULTIPROC_ENV, str(tmp_path))
+    monkeypatch.setattr(settings, "db_create_all", True)
+    monkeypatch.setenv("DB_CREATE_ALL", "true")
+    monkeypatch.setattr(settings, "web_concurrency", 1)
+    calls = []
+
+    with patch.object(server, "init_db", lambda: calls.append("init_db")), patch.object(
+        server, "run_uvicorn", lambda: calls.append(os.environ["DB_CREATE_ALL"])
+    ), patch.object(server, "engine") as engine:
+        server.main()
+
+    assert calls == ["init_db", "false"]
+    assert settings.db_create_all is False
+    engine.dispose.assert_called_once_with()
+
+
+def test_forked_workers_do_not_create_schema_again(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "server_backend", "gunicorn")
+    monkeypatch.setenv(MULTIPROC_ENV, str(tmp_path))
+    monkeypatch.setattr(settings, "db_create_all", True)
+    monkeypatch.setenv("DB_CREATE_ALL", "true")
+    monkeypatch.setattr(settings, "web_concurrency", 1)
+    worker_init = []
+
+    with patch.object(server, "init_db"), patch.object(server, "engine"), patch(
+        "app.init_db", lambda: worker_init.append("init_db")
+    ), patch.object(server, "run_gunicorn", create_app):
+        server.main()
+
+    assert worker_init == []
+
+
+@pytest.fixture
+def process_caches(monkeypatch):
+    """Isola os caches do processo, recriados a partir das configurações do teste."""
+    monkeypatch.setattr(repository, "_caches", {})
+
+
+def test_multiple_workers_disable_memory_caches(monkeypatch, process_caches):
+    monkeypatch.setattr(settings, "web_concurrency", 4)
+    monkeypatch.setattr(settings, "record_cache_backend", "memory")
+    monkeypatch.setenv("RECORD_CACHE_BACKEND", "memory")
+    assert asgi.application is not None
+    assert get_record_cache() is not None and get_count_cache() is not None
+
+    server.disable_memory_caches()
+
+    assert settings.record_cache_backend == "none"
+    assert os.environ["RECORD_CACHE_BACKEND"] == "none"
+    assert get_record_cache() is None
+    assert get_count_cache() is None
+
+
+@pytest.mark.parametrize("workers, backend", [(1, "memory"), (4, "redis")])
+def test_single_worker_or_redis_keep_caches(
+    monkeypatch, process_caches, workers, backend
+):
+    monkeypatch.setattr(settings, "web_concurrency", workers)
+    monkeypatch.setattr(settings, "record_cache_backend", backend)
+
+    server.disable_memory_caches()
+
+    assert settings.record_cache_backend == backend
+
+
+def test_main_with_unknown_backend(monkeypatch):
+    monkeypatch.setattr(settings, "server_backend", "waitress")
+    with pytest.raises(ValueError):
+        server.main()
+
+
+def test_prepare_metrics_dir_removes_previous_files(monkeypatch, tmp_path):
+    pytest.importorskip("prometheus_client")
+    (tmp_path / "histogram_123.db").write_bytes(b"old")
+    (tmp_path / "keep.txt").write_text("x")
+    monkeypatch.setenv(MULTIPROC_ENV, str(tmp_path))
+
+    assert server.prepare_metrics_dir() == str(tmp_path)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["keep.txt"]
+
+
+def test_gunicorn_marks_exited_workers_dead():
+    with patch.object(server, "mark_process_dead") as mocked:
+        server.gunicorn_options()["child_exit"](None, type("Worker", (), {"pid": 42}))
+    mocked.assert_called_once_with(42)
+
+
+def test_gunicorn_workers_reconfigure_logging_after_fork(process_caches):
+    inherited = get_record_cache()
+    with patch.object(server, "configure_logging") as mocked:
+        server.gunicorn_options()["post_fork"](None, None)
+    mocked.assert_called_once_with()
+    assert inherited is None or get_record_cache() is not inherited
@@ -0,0 +1,101 @@
+import logging
+
+from sqlalchemy import create_engine, text
+
+from app import timing
+from app.config import settings
+from app.timing import RequestTimings, instrument_engine, timed
+from tests.mocks.credit_card import valid_visa_credit_card_json
+
+
+def run_in_request(func):
+    timings = RequestTimings()
+    token = timing._current.set(timings)
+    try:
+        func()
+    finally:
+        timing._current.reset(token)
+    return timings
+
+
+def test_timed_outside_request_is_a_no_op():
+    with timed("auth"):
+        pass
+
+    assert timing.current_timings() is None
+
+
+def test_nested_phase_is_measured_once():
+    def work():
+        with timed("validation"):
+            with timed("validation"):
+                pass
+        with timed("auth"):
+            pass
+
+    timings = run_in_request(work)
+
+    assert set(timings.durations) == {"validation", "auth"}
+    assert timings.active == set()
+
+
+def test_timed_as_decorator():
+    @timed("serialization")
+    def serialize():
+        return {"id": 1}
+
+    timings = run_in_request(serialize)
+
+    assert "serialization" in timings.durations
+
+
+def test_instrumented_engine_counts_queries():
+    engine = instrument_engine(instrument_engine(create_engine("sqlite://")))
+
+    def work():
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    timings = run_in_request(work)
+
+    assert timings.queries == 2
+    assert timings.durations["db"] > 0
+
+
+def test_header_lists_measured_phases_and_total():
+    timings = RequestTimings()
+    timings.add_query(0.0015)
+    timings.add("auth", 0.0002)
+
+    header = timings.header()
+
+    assert header.startswith('db;dur=1.50;desc="1 queries", auth;dur=0.20, total;dur=')
+    assert timings.as_dict()["db_queries"] == 1
+
+
+def test_server_timing_header(client, url_v1, header):
+    response = client.post(
+        f"{url_v1}/credit-card/", json=valid_visa_credit_card_json, headers=header
+    )
+    server_timing = response.headers["Server-Timing"]
+
+    assert response.status_code == 200
+    for phase in ("db", "auth", "validation", "serialization", "total"):
+        assert f"{phase};dur=" in server_timing
+    assert 'queries"' in server_timing
+
+
+def test_warning_when_request_exceeds_query_limit(
+    client, url_v1, header, caplog, monkeypatch
+):
+    monkeypatch.setattr(settings, "db_query_warning", 1)
+    with caplog.at_level(logging.DEBUG, logger="app.timing"):
+        client.post(
+            f"{url_v1}/credit-card/", json=valid_visa_credit_card_json, headers=header
+        )
+
+    [record] = [item for item in caplog.records if item.name == "app.timing"]
+    assert record.levelno == logging.WARNING
+    assert record.timings["db_queries"] > 1
+    assert "path=/api/v1/credit-card/" in record.getMessage()
@@ -1,8 +1,24 @@
-from datetime import datetime
+import gzip
+import re
+from datetime import date, datetime, timedelta
 
 import pytest
+from pydantic import BaseModel
 
-from app.utils import datetime_validator, hashable
+from app.utils import (
+    _Today,
+    datetime_validator,
+    decode_cursor,
+    encode_cursor,
+    entity_tag,
+    hashable,
+    is_not_modified,
+    ndjson_stream,
+    page_headers,
+    parse_expiry,
+    parse_json_records,
+    validator_headers,
+)
 
 
 def test_hashable():
@@ -46,3 +62,154 @@ def test_datetime_validator_with_numbers_only():
     input_date = "123456"
     with pytest.raises(ValueError):
         datetime_validator(input_date)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "01/2030",
+        "1/2030",
+        "12/2031",
+        "02/2028",
+        "13/2030",
+        "01/20301",
+        "2030-01",
+        "01/20",
+        "",
+    ],
+)
+def test_parse_expiry_matches_strptime(value):
+    try:
+        parsed = datetime.strptime(value, "%m/%Y").date()
+    except ValueError as e:
+        with pytest.raises(ValueError, match=re.escape(str(e))):
+            parse_expiry(value)
+        return
+
+    last_day, formatted = parse_expiry(value)
+    assert last_day.replace(day=1) == parsed
+    assert (last_day + timedelta(days=1)).day == 1
+    assert formatted == last_day.strftime("%Y-%m-%d")
+
+
+def test_parse_expiry_is_cached():
+    parse_expiry.cache_clear()
+    parse_expiry("05/2031")
+    parse_expiry("05/2031")
+    assert parse_expiry.cache_info().hits == 1
+
+
+def test_today_is_refreshed_at_day_boundary():
+    now = [datetime(2030, 1, 31, 23, 59, 59).timestamp()]
+    today = _Today(clock=lambda: now[0])
+
+    assert today() == date(2030, 1, 31)
+    now[0] += 1
+    assert today() == date(2030, 2, 1)
+
+
+def test_encode_and_decode_cursor():
+    cursor = encode_cursor(42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == 42
+
+
+@pytest.mark.parametrize(
+    "total, skip, limit, expected",
+    [
+        (0, 0, 10, ("0", "0", "1")),
+        (21, 0, 10, ("21", "3", "1")),
+        (21, 20, 10, ("21", "3", "3")),
+    ],
+)
+def test_page_headers(total, skip, limit, expected):
+    headers = page_headers(total, skip, limit)
+    assert (
+        headers["X-Total-Count"],
+        headers["X-Total-Pages"],
+        headers["X-Page"],
+    ) == expected
+
+
+@pytest.mark.parametrize("cursor", ["abc", "e30", "W10", "eyJpZCI6ICJ4In0", "!!"])
+def test_decode_invalid_cursor(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+class NDJSONRow(BaseModel):
+    id: int
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_ndjson_stream(compress):
+    chunks = [[NDJSONRow(id=1), NDJSONRow(id=2)], [NDJSONRow(id=3)]]
+    body = b"".join(ndjson_stream(chunks, compress=compress))
+    if compress:
+        body = gzip.decompress(body)
+
+    assert body == b'{"id":1}\n{"id":2}\n{"id":3}\n'
+
+
+def test_parse_json_records_with_array():
+    assert parse_json_records(b'[{"a": 1}, {"a": 2}]') == [{"a": 1}, {"a": 2}]
+
+
+def test_parse_json_records_with_ndjson():
+    body = b'{"a": 1}\n\n{broken\n{"a": 2}\n'
+    records = parse_json_records(body, "application/x-ndjson")
+    assert records == [{"a": 1}, None, {"a": 2}]
+
+
+@pytest.mark.parametrize("body", [b'{"a": 1}', b"[broken"])
+def test_parse_json_records_with_invalid_body(body):
+    with pytest.raises(ValueError):
+        parse_json_records(body)
+
+
+def test_entity_tag_changes_with_versions_and_variant():
+    updated_at = datetime(2030, 1, 1, 12, 0, 0, 123456)
+    etag = entity_tag([(1, updated_at)])
+
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == entity_tag([(1, updated_at)])
+    assert etag != entity_tag([(1, updated_at + timedelta(microseconds=1))])
+    assert etag != entity_tag([(1, updated_at)], variant="id,holder")
+    assert entity_tag([(1, updated_at), (2, updated_at)]) != entity_tag(
+        [(2, updated_at), (1, updated_at)]
+    )
+
+
+def test_validator_headers():
+    headers = validator_headers('"abc"', datetime(2030, 1, 1, 12, 0, 0, 500))
+    assert headers == {
+        "ETag": '"abc"',
+        "Last-Modified": "Tue, 01 Jan 2030 12:00:00 GMT",
+    }
+    assert validator_headers('"abc"', None) == {"ETag": '"abc"'}
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, False),
+        ({"if-none-match": '"abc"'}, True),
+        ({"if-none-match": 'W/"abc"'}, True),
+        ({"if-none-match": '"xyz", "abc"'}, True),
+        ({"if-none-match": "*"}, True),
+        ({"if-none-match": '"xyz"'}, False),
+        (
+            {
+                "if-none-match": '"xyz"',
+                "if-modified-since": "Tue, 01 Jan 2030 12:00:00 GMT",
+            },
+            False,
+        ),
+        ({"if-modified-since": "Tue, 01 Jan 2030 12:00:00 GMT"}, True),
+        ({"if-modified-since": "Tue, 01 Jan 2030 11:59:59 GMT"}, False),
+        ({"if-modified-since": "invalid"}, False),
+    ],
+)
+def test_is_not_modified(headers, expected):
+    last_modified = datetime(2030, 1, 1, 12, 0, 0, 999999)
+    assert is_not_modified(headers, '"abc"', last_modified) is expected
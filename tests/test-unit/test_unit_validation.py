@@ -0,0 +1,114 @@
+import random
+from unittest.mock import patch
+
+import pytest
+from pydantic import ValidationError
+
+from app.db import validation
+from app.db.schema import BulkItemResult, CreditCardSchema
+from app.db.validation import luhn_valid, validate_credit_cards_batch
+
+from tests.mocks.credit_card import (  # isort:skip
+    INVALID_CREDIT_CARD_NUMBER,  # isort:skip
+    VALID_MASTER_CREDIT_CARD_NUMBER,  # isort:skip
+    VALID_VISA_CREDIT_CARD_NUMBER,  # isort:skip
+)  # isort:skip
+
+NUMBERS = [
+    VALID_VISA_CREDIT_CARD_NUMBER,
+    VALID_MASTER_CREDIT_CARD_NUMBER,
+    INVALID_CREDIT_CARD_NUMBER,
+    "4539 5787 6362 1486",
+    "4539578763621487",
+    "",
+    "abc",
+    4539578763621486,
+    None,
+]
+
+HOLDERS = ["John Doe", "Jo", "", 123, None]
+EXP_DATES = ["01/2030", "12/2031", "01/2020", "13/2030", "2030-01", None]
+CVVS = [123, 1234, 12, 12345, 0, None, True, "123", -12]
+
+
+def validate_credit_cards(records):
+    """Valida registro a registro com o `CreditCardSchema`, o resultado esperado do lote."""
+    valid, invalid = [], []
+    for index, record in enumerate(records):
+        try:
+            valid.append((index, CreditCardSchema.parse_obj(record)))
+        except ValidationError as e:
+            invalid.append(
+                BulkItemResult(index=index, status="invalid", detail=e.errors())
+            )
+    return valid, invalid
+
+
+def random_records(size):
+    rng = random.Random(42)
+    records = []
+    for _ in range(size):
+        record = {
+            "holder": rng.choice(HOLDERS),
+            "number": rng.choice(NUMBERS),
+            "exp_date": rng.choice(EXP_DATES),
+            "cvv": rng.choice(CVVS),
+        }
+        for key in list(record):
+            if rng.random() < 0.05:
+                del record[key]
+        records.append(record)
+    records.append("not a record")
+    return records
+
+
+def as_comparable(result):
+    valid, invalid = result
+    return (
+        [(index, schema.dict(), schema.__fields_set__) for index, schema in valid],
+        [item.dict() for item in invalid],
+    )
+
+
+@pytest.mark.parametrize("numpy_enabled", [True, False])
+def test_batch_validation_matches_schema(numpy_enabled):
+    records = random_records(500)
+    expected = as_comparable(
+        validate_credit_cards([dict(r) if isinstance(r, dict) else r for r in records])
+    )
+
+    if numpy_enabled:
+        result = validate_credit_cards_batch(records)
+    else:
+        with patch.object(validation, "np", None):
+            result = validate_credit_cards_batch(records)
+
+    assert as_comparable(result) == expected
+
+
+def test_luhn_valid_with_and_without_numpy():
+    numbers = [VALID_VISA_CREDIT_CARD_NUMBER, "4539578763621487", "0", "18"] * 20
+    expected = [True, False, True, True] * 20
+
+    assert luhn_valid(numbers) == expected
+    with patch.object(validation, "np", None):
+        assert luhn_valid(numbers) == expected
+
+
+def test_batch_validation_checks_each_distinct_expiry_once():
+    records = [
+        {
+            "holder": "John Doe",
+            "number": VALID_VISA_CREDIT_CARD_NUMBER,
+            "exp_date": "01/2030",
+        }
+    ] * 50
+
+    with patch.object(
+        validation, "datetime_validator", wraps=validation.datetime_validator
+    ) as validator:
+        valid, invalid = validate_credit_cards_batch(records)
+
+    assert len(valid) == 50
+    assert invalid == []
+    validator.assert_called_once_with("01/2030")